@@ -14,6 +14,17 @@ if config.config_file_name is not None:
 
 target_metadata = Base.metadata
 
+def include_object(object, name, type_, reflected, compare_to):
+    # The SQLite FTS5 search tables (and their shadow tables) are created by
+    # DDL events in app.db.search, not declared as models.
+    if type_ == "table" and reflected and compare_to is None and "_search" in name:
+        return False
+    # The trigram GIN indexes only exist on PostgreSQL (see app.db.search), but
+    # autogenerate ignores their ddl_if and would add them everywhere else.
+    if type_ == "index" and name.endswith("_trgm") and context.get_context().dialect.name != "postgresql":
+        return False
+    return True
+
 def get_url():
     return settings.DATABASE_URL
 
@@ -24,6 +35,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -40,7 +52,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,61 @@
+"""Search indexes for contacts and organizations
+
+Revision ID: 3f8a1c2d9b47
+Revises: ea16c9a10415
+Create Date: 2026-10-18 09:12:31.504118
+
+"""
+from alembic import op
+
+from app.db.search import fts_table_name, fts_ddl
+
+
+# revision identifiers, used by Alembic.
+revision = '3f8a1c2d9b47'
+down_revision = 'ea16c9a10415'
+branch_labels = None
+depends_on = None
+
+SEARCH_COLUMNS = {
+    'contacts': ('first_name', 'last_name', 'email', 'phone'),
+    'organizations': ('name', 'email', 'phone'),
+}
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        # Build the indexes without locking writes on large tables.
+        with op.get_context().autocommit_block():
+            for table, columns in SEARCH_COLUMNS.items():
+                for column in columns:
+                    op.create_index(
+                        f'ix_{table}_{column}_trgm', table, [column],
+                        postgresql_using='gin',
+                        postgresql_ops={column: 'gin_trgm_ops'},
+                        postgresql_concurrently=True,
+                        if_not_exists=True,
+                    )
+    elif dialect == 'sqlite':
+        for table, columns in SEARCH_COLUMNS.items():
+            for statement in fts_ddl(table, columns):
+                op.execute(statement)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        with op.get_context().autocommit_block():
+            for table, columns in SEARCH_COLUMNS.items():
+                for column in columns:
+                    op.drop_index(
+                        f'ix_{table}_{column}_trgm', table_name=table,
+                        postgresql_concurrently=True, if_exists=True,
+                    )
+    elif dialect == 'sqlite':
+        for table in SEARCH_COLUMNS:
+            fts = fts_table_name(table)
+            for suffix in ('ai', 'ad', 'au'):
+                op.execute(f'DROP TRIGGER IF EXISTS {fts}_{suffix}')
+            op.execute(f'DROP TABLE IF EXISTS {fts}')
@@ -0,0 +1,52 @@
+"""Indexes for the default order of an account's contacts and organizations
+
+Revision ID: 5d7e2b9c4f18
+Revises: 8c41e7b05d2a
+Create Date: 2026-10-18 15:20:44.618305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d7e2b9c4f18'
+down_revision = '8c41e7b05d2a'
+branch_labels = None
+depends_on = None
+
+NOT_DELETED = sa.text('deleted_at IS NULL')
+
+# (name, table, columns); all partial, over the rows that aren't soft-deleted
+INDEXES = [
+    (
+        'ix_contacts_account_id_last_name_first_name_id_not_deleted', 'contacts',
+        ['account_id', 'last_name', 'first_name', 'id'],
+    ),
+    ('ix_organizations_account_id_name_id_not_deleted', 'organizations', ['account_id', 'name', 'id']),
+]
+
+
+def upgrade() -> None:
+    concurrently = op.get_bind().dialect.name == 'postgresql'
+    # On PostgreSQL build outside the migration transaction, without blocking writes.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns,
+                postgresql_where=NOT_DELETED,
+                sqlite_where=NOT_DELETED,
+                postgresql_concurrently=concurrently,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    concurrently = op.get_bind().dialect.name == 'postgresql'
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table,
+                postgresql_concurrently=concurrently,
+                if_exists=True,
+            )
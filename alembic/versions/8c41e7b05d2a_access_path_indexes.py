@@ -0,0 +1,57 @@
+"""Indexes for foreign keys, soft-delete and timestamp access paths
+
+Revision ID: 8c41e7b05d2a
+Revises: 3f8a1c2d9b47
+Create Date: 2026-10-18 11:40:07.281933
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c41e7b05d2a'
+down_revision = '3f8a1c2d9b47'
+branch_labels = None
+depends_on = None
+
+NOT_DELETED = sa.text('deleted_at IS NULL')
+
+# (name, table, columns, partial)
+INDEXES = [
+    ('ix_organizations_account_id_id', 'organizations', ['account_id', 'id'], False),
+    ('ix_organizations_account_id_id_not_deleted', 'organizations', ['account_id', 'id'], True),
+    ('ix_organizations_updated_at_id', 'organizations', ['updated_at', 'id'], False),
+    ('ix_users_account_id_id', 'users', ['account_id', 'id'], False),
+    ('ix_users_account_id_id_not_deleted', 'users', ['account_id', 'id'], True),
+    ('ix_contacts_account_id_id', 'contacts', ['account_id', 'id'], False),
+    ('ix_contacts_account_id_id_not_deleted', 'contacts', ['account_id', 'id'], True),
+    ('ix_contacts_organization_id', 'contacts', ['organization_id'], False),
+    ('ix_contacts_updated_at_id', 'contacts', ['updated_at', 'id'], False),
+]
+
+
+def upgrade() -> None:
+    concurrently = op.get_bind().dialect.name == 'postgresql'
+    # On PostgreSQL build outside the migration transaction, without blocking writes.
+    with op.get_context().autocommit_block():
+        for name, table, columns, partial in INDEXES:
+            where = NOT_DELETED if partial else None
+            op.create_index(
+                name, table, columns,
+                postgresql_where=where,
+                sqlite_where=where,
+                postgresql_concurrently=concurrently,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    concurrently = op.get_bind().dialect.name == 'postgresql'
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table,
+                postgresql_concurrently=concurrently,
+                if_exists=True,
+            )
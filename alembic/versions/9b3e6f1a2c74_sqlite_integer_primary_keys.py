@@ -0,0 +1,48 @@
+"""INTEGER primary keys on SQLite, so ids autoincrement as with create_all
+
+Revision ID: 9b3e6f1a2c74
+Revises: 5d7e2b9c4f18
+Create Date: 2026-10-18 16:05:12.904417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.search import fts_ddl
+
+
+# revision identifiers, used by Alembic.
+revision = '9b3e6f1a2c74'
+down_revision = '5d7e2b9c4f18'
+branch_labels = None
+depends_on = None
+
+# Parents before children, so each copy's foreign keys find their table.
+TABLES = ('accounts', 'organizations', 'users', 'contacts')
+SEARCH_COLUMNS = {
+    'contacts': ('first_name', 'last_name', 'email', 'phone'),
+    'organizations': ('name', 'email', 'phone'),
+}
+
+
+def _retype_ids(type_: sa.types.TypeEngine, existing_type: sa.types.TypeEngine) -> None:
+    # Only SQLite differs (BigIntegerPK is BIGINT everywhere else). A BIGINT
+    # PRIMARY KEY there is not an alias of the rowid and doesn't autoincrement,
+    # and changing it means copying the table (batch mode).
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for table in TABLES:
+        with op.batch_alter_table(table, recreate='always') as batch_op:
+            batch_op.alter_column('id', existing_type=existing_type, type_=type_, existing_nullable=False)
+    # Dropping the old tables dropped the triggers keeping the FTS5 tables in sync.
+    for table, columns in SEARCH_COLUMNS.items():
+        for statement in fts_ddl(table, columns):
+            op.execute(statement)
+
+
+def upgrade() -> None:
+    _retype_ids(sa.Integer(), sa.BigInteger())
+
+
+def downgrade() -> None:
+    _retype_ids(sa.BigInteger(), sa.Integer())
@@ -0,0 +1,254 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+from pydantic import BaseModel, ValidationError, create_model
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import MANYTOONE, Session
+
+from app.core.exceptions import BatchValidationException
+from app.crud.base import CRUDBase
+from app.schemas.jsonapi import JsonApiBulkRequest
+from app.serializers.base import ModelSerializer
+
+MAX_BULK_SIZE = 1000
+
+
+def parse_bulk_create(
+    request: JsonApiBulkRequest,
+    serializer: ModelSerializer,
+    schema: Type[BaseModel],
+    account_id: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Validate every resource object of a bulk create and return their column values
+
+    When `account_id` is given the rows belong to that account, so the
+    account relationship may be left out of the resource objects.
+    """
+    return _parse(request, serializer, schema, with_id=False, account_id=account_id)
+
+
+def parse_bulk_update(
+    request: JsonApiBulkRequest, serializer: ModelSerializer, schema: Type[BaseModel]
+) -> List[Dict[str, Any]]:
+    """Validate a bulk update; each item needs an `id` and may carry any subset of attributes"""
+    return _parse(request, serializer, partial_schema(schema), with_id=True)
+
+
+def parse_update(attributes: BaseModel, schema: Type[BaseModel]) -> Dict[str, Any]:
+    """Validate the attributes a single-resource PUT sets; members it leaves out are not written"""
+    try:
+        validated = partial_schema(schema).model_validate(attributes.model_dump(exclude_unset=True))
+    except ValidationError as exc:
+        raise BatchValidationException([
+            _error(error["msg"], "/".join(["/data/attributes", *[str(part) for part in error["loc"]]]), error["type"])
+            for error in exc.errors()
+        ])
+    return validated.model_dump(exclude_unset=True)
+
+
+def parse_bulk_identifiers(request: JsonApiBulkRequest, serializer: ModelSerializer) -> List[int]:
+    """Validate the resource identifiers of a bulk delete"""
+    _check_size(request)
+    ids, errors = [], []
+    for index, item in enumerate(request.data):
+        if _check_type(item, serializer, f"/data/{index}", errors):
+            item_id = _parse_id(item.get("id"), f"/data/{index}/id", errors)
+            if item_id is not None:
+                ids.append(item_id)
+    if errors:
+        raise BatchValidationException(errors)
+    return ids
+
+
+def ensure_ids_exist(
+    db: Session,
+    crud_obj: CRUDBase,
+    ids: Sequence[int],
+    references: Sequence[Dict[str, Any]] = (),
+    account_id: Optional[int] = None,
+) -> None:
+    """Reject the batch, pointing at each item whose id, or a foreign key among `references`, does not exist.
+
+    With an `account_id`, rows of other accounts count as missing.
+    """
+    existing = set(crud_obj.existing_ids(db, ids, account_id)) if ids else set()
+    errors = [
+        _error(f"{crud_obj.model.__name__} {item_id} not found", f"/data/{index}/id", "not_found")
+        for index, item_id in enumerate(ids)
+        if item_id not in existing
+    ]
+    errors.extend(_missing_references(db, crud_obj, references, account_id))
+    if errors:
+        raise BatchValidationException(errors)
+
+
+def ensure_references_exist(
+    db: Session, crud_obj: CRUDBase, values: Sequence[Dict[str, Any]], account_id: Optional[int] = None
+) -> None:
+    """Reject a batch of new rows, pointing at each foreign key that does not exist"""
+    ensure_ids_exist(db, crud_obj, [], values, account_id)
+
+
+@lru_cache()
+def partial_schema(schema: Type[BaseModel]) -> Type[BaseModel]:
+    """Copy of `schema` where every field may be left out, for partial updates.
+
+    Annotations are kept, so a field that can't be null still rejects an
+    explicit null; only the unset default is None, and pydantic doesn't
+    validate defaults.
+    """
+    fields = {
+        name: (field.annotation, None)
+        for name, field in schema.model_fields.items()
+    }
+    return create_model(f"Partial{schema.__name__}", **fields)
+
+
+def _missing_references(
+    db: Session, crud_obj: CRUDBase, values: Sequence[Dict[str, Any]], account_id: Optional[int]
+) -> List[Dict[str, Any]]:
+    """Errors for the many-to-one foreign keys in `values` whose target row does not exist"""
+    errors = []
+    for rel in inspect(crud_obj.model).relationships:
+        if rel.direction is not MANYTOONE or len(rel.local_columns) != 1:
+            continue
+        key = next(iter(rel.local_columns)).key
+        if account_id is not None and key == crud_obj.account_key:
+            # Scoped batch writes set the account themselves.
+            continue
+        wanted = {item[key] for item in values if item.get(key) is not None}
+        if not wanted:
+            continue
+        target = rel.mapper.class_
+        # An ORM select, so soft-deleted targets count as missing too.
+        stmt = select(target.id).where(target.id.in_(wanted))
+        target_account = getattr(target, crud_obj.account_key, None)
+        if account_id is not None and target_account is not None:
+            stmt = stmt.where(target_account == account_id)
+        found = set(db.scalars(stmt))
+        for index, item in enumerate(values):
+            if item.get(key) is not None and item[key] not in found:
+                errors.append(_error(
+                    f"{target.__name__} {item[key]} not found", f"/data/{index}/relationships/{rel.key}", "not_found"
+                ))
+    return errors
+
+
+def _parse(
+    request: JsonApiBulkRequest,
+    serializer: ModelSerializer,
+    schema: Type[BaseModel],
+    with_id: bool,
+    account_id: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    _check_size(request)
+    foreign_keys = serializer.foreign_keys(serializer.model)
+    relationship_of = {key: rel_name for rel_name, key in foreign_keys.items()}
+    columns = serializer.model.__table__.c
+    required = [rel_name for rel_name, key in foreign_keys.items() if not columns[key].nullable]
+    scoped = account_id is not None and CRUDBase.account_key in relationship_of
+    if scoped:
+        required.remove(relationship_of[CRUDBase.account_key])
+
+    items, errors = [], []
+    for index, item in enumerate(request.data):
+        pointer = f"/data/{index}"
+        if not _check_type(item, serializer, pointer, errors):
+            continue
+        values: Dict[str, Any] = {}
+        if with_id:
+            item_id = _parse_id(item.get("id"), f"{pointer}/id", errors)
+            if item_id is None:
+                continue
+            values["id"] = item_id
+
+        linkage = _parse_linkage(item, foreign_keys, pointer, errors)
+        if linkage is None:
+            continue
+        if scoped:
+            # create_many() pins the rows to the caller's account anyway.
+            linkage[CRUDBase.account_key] = account_id
+        data = {**(item.get("attributes") or {}), **linkage}
+        try:
+            validated = schema.model_validate(data)
+        except ValidationError as exc:
+            for error in exc.errors():
+                field = str(error["loc"][0]) if error["loc"] else ""
+                if field in relationship_of:
+                    where = f"{pointer}/relationships/{relationship_of[field]}"
+                else:
+                    where = "/".join([f"{pointer}/attributes", *[str(part) for part in error["loc"]]])
+                errors.append(_error(error["msg"], where, error["type"]))
+            continue
+
+        values.update(validated.model_dump(exclude_unset=with_id))
+        # Foreign keys may not be fields of the schema, so add them back explicitly.
+        values.update(linkage)
+        if not with_id:
+            missing = [rel_name for rel_name in required if values.get(foreign_keys[rel_name]) is None]
+            for rel_name in missing:
+                errors.append(_error(
+                    f"Relationship '{rel_name}' is required", f"{pointer}/relationships/{rel_name}", "required"
+                ))
+            if missing:
+                continue
+        items.append(values)
+
+    if errors:
+        raise BatchValidationException(errors)
+    return items
+
+
+def _parse_linkage(
+    item: Dict[str, Any], foreign_keys: Dict[str, str], pointer: str, errors: List[Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """Map `relationships.<name>.data.id` onto foreign-key columns; None if any linkage is invalid"""
+    linkage = {}
+    valid = True
+    for rel_name, relationship in (item.get("relationships") or {}).items():
+        where = f"{pointer}/relationships/{rel_name}"
+        if rel_name not in foreign_keys:
+            errors.append(_error(f"Unknown relationship '{rel_name}'", where, "invalid_relationship"))
+            valid = False
+            continue
+        data = relationship.get("data") if isinstance(relationship, dict) else None
+        if data is None:
+            linkage[foreign_keys[rel_name]] = None
+            continue
+        related_id = _parse_id(data.get("id") if isinstance(data, dict) else None, f"{where}/data/id", errors)
+        if related_id is None:
+            valid = False
+            continue
+        linkage[foreign_keys[rel_name]] = related_id
+    return linkage if valid else None
+
+
+def _check_size(request: JsonApiBulkRequest) -> None:
+    if not request.data:
+        raise BatchValidationException([_error("Batch is empty", "/data", "empty")])
+    if len(request.data) > MAX_BULK_SIZE:
+        raise BatchValidationException([
+            _error(f"Batch exceeds {MAX_BULK_SIZE} items", "/data", "too_large")
+        ])
+
+
+def _check_type(item: Any, serializer: ModelSerializer, pointer: str, errors: List[Dict[str, Any]]) -> bool:
+    if not isinstance(item, dict):
+        errors.append(_error("Resource object must be an object", pointer, "invalid"))
+        return False
+    if item.get("type") != serializer.type_name:
+        errors.append(_error(f"Expected type '{serializer.type_name}'", f"{pointer}/type", "invalid_type"))
+        return False
+    return True
+
+
+def _parse_id(value: Any, pointer: str, errors: List[Dict[str, Any]]) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        errors.append(_error("A numeric id is required", pointer, "invalid_id"))
+        return None
+
+
+def _error(title: str, pointer: str, code: Optional[str] = None) -> Dict[str, Any]:
+    return {"title": title, "pointer": pointer, "code": code}
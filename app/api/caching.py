@@ -0,0 +1,57 @@
+import hashlib
+from typing import Any, Sequence
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from app.crud.pagination import Page
+from app.serializers.base import ModelSerializer
+
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag over `parts`; weak because equal tags promise equal content, not equal bytes"""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def resource_etag(request: Request, serializer: ModelSerializer, obj: Any, include: Sequence[str]) -> str:
+    """ETag of a single-resource document: the resource's and each included resource's (id, updated_at).
+
+    The query string is part of it so different fieldsets/includes never share a tag.
+    """
+    parts = [request.url.query, serializer.type_name, obj.id, obj.updated_at]
+    for related, item in serializer.included_objects([obj], include):
+        parts += [related.type_name, item.id, item.updated_at]
+    return make_etag(*parts)
+
+
+def list_etag(request: Request, serializer: ModelSerializer, page: Page, include: Sequence[str]) -> str:
+    """ETag of a list page, from the (id, updated_at) of the fetched page, its includes and its cursors.
+
+    Derived from the page itself, so it costs no query beyond the keyset page.
+    """
+    parts = [request.url.query, page.next_cursor, page.prev_cursor]
+    for item in page.items:
+        parts += [item.id, item.updated_at]
+    for related, item in serializer.included_objects(page.items, include):
+        parts += [related.type_name, item.id, item.updated_at]
+    return make_etag(*parts)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether `If-None-Match` names `etag`, using the weak comparison GET requires"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = _opaque(etag)
+    return any(_opaque(tag.strip()) == opaque for tag in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+def _opaque(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
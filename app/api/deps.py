@@ -1,10 +1,34 @@
-from typing import Generator
+from typing import AsyncGenerator, Generator, Optional
+from fastapi import Depends, Request
+from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.session import SessionLocal
+from app.api.replicas import reads_from_replica
+from app.core.exceptions import UnauthorizedException
+from app.core.security import Principal, decode_access_token
+from app.db import session
 
-def get_db() -> Generator:
-    db = SessionLocal()
+# auto_error off so a missing token gets the same JSON:API error as a bad one.
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
+
+def get_db(request: Request) -> Generator:
+    db = session.SessionLocal(replica=session.replica() if reads_from_replica(request) else None)
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    replica = session.replica(is_async=True) if reads_from_replica(request) else None
+    async with session.AsyncSessionLocal(replica=replica) as db:
+        yield db
+
+async def get_current_user(token: Optional[str] = Depends(oauth2_scheme)) -> Principal:
+    """The user the bearer token was issued to; no database query, repeat tokens skip verification too"""
+    if not token:
+        raise UnauthorizedException("Not authenticated", code="not_authenticated")
+    return decode_access_token(token)
+
+async def get_account_id(token: Optional[str] = Depends(oauth2_scheme)) -> Optional[int]:
+    """Account that scopes reads: the bearer token's, or None (unscoped) for anonymous requests"""
+    return decode_access_token(token).account_id if token else None
@@ -0,0 +1,97 @@
+import csv
+import io
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Iterator, List, Optional, Sequence
+
+from fastapi.responses import StreamingResponse
+
+from app.api.responses import dumps
+from app.crud.base import CRUDBase
+from app.db import session
+
+# Rows fetched from the server-side cursor, and written to the client, per chunk.
+EXPORT_BATCH_SIZE = 1000
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+
+def encode_rows(rows: Sequence[Any], columns: List[str], fmt: ExportFormat) -> bytes:
+    """Encode one batch of result rows as NDJSON lines or CSV records"""
+    if fmt is ExportFormat.ndjson:
+        return b"".join(dumps(dict(zip(columns, row))) + b"\n" for row in rows)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_csv_value(value) for value in row] for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def encode_header(columns: List[str], fmt: ExportFormat) -> bytes:
+    if fmt is ExportFormat.ndjson:
+        return b""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(columns)
+    return buffer.getvalue().encode("utf-8")
+
+
+def stream_export(
+    crud_obj: CRUDBase,
+    columns: List[str],
+    fmt: ExportFormat,
+    from_replica: bool = False,
+    account_id: Optional[int] = None,
+) -> Iterator[bytes]:
+    """Yield the encoded export one batch at a time, read from a replica if `from_replica`.
+
+    With an `account_id`, only that account's rows are exported.
+
+    The generator owns its session: it keeps reading after the endpoint has
+    returned, so it can't borrow the request-scoped one.
+    """
+    db = session.SessionLocal(replica=session.replica() if from_replica else None)
+    try:
+        yield encode_header(columns, fmt)
+        for rows in crud_obj.stream(db, columns=columns, batch_size=EXPORT_BATCH_SIZE, account_id=account_id):
+            yield encode_rows(rows, columns, fmt)
+    finally:
+        db.close()
+
+
+async def astream_export(
+    crud_obj: CRUDBase,
+    columns: List[str],
+    fmt: ExportFormat,
+    from_replica: bool = False,
+    account_id: Optional[int] = None,
+) -> AsyncIterator[bytes]:
+    """Async counterpart of `stream_export`, reading through `AsyncSession.stream`"""
+    replica = session.replica(is_async=True) if from_replica else None
+    async with session.AsyncSessionLocal(replica=replica) as db:
+        yield encode_header(columns, fmt)
+        async for rows in crud_obj.astream(
+            db, columns=columns, batch_size=EXPORT_BATCH_SIZE, account_id=account_id
+        ):
+            yield encode_rows(rows, columns, fmt)
+
+
+def export_response(chunks: Any, fmt: ExportFormat, name: str) -> StreamingResponse:
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt.value}"'},
+    )
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
@@ -0,0 +1,79 @@
+from typing import Dict, List, Optional
+from urllib.parse import urlencode
+
+from fastapi import Query, Request
+
+from app.crud.pagination import Page
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class PageParams:
+    """JSON:API cursor pagination query parameters (`page[size]`, `page[after]`, `page[before]`)"""
+
+    def __init__(
+        self,
+        size: int = Query(DEFAULT_PAGE_SIZE, alias="page[size]", ge=1, le=MAX_PAGE_SIZE),
+        after: Optional[str] = Query(None, alias="page[after]"),
+        before: Optional[str] = Query(None, alias="page[before]"),
+        sort: Optional[str] = Query(None),
+    ):
+        self.size = size
+        self.after = after
+        self.before = before
+        self.sort = sort
+
+
+def include_param(
+    include: Optional[str] = Query(None, description="Comma-separated relationships to sideload"),
+) -> List[str]:
+    """Parse the JSON:API `include` query parameter"""
+    if not include:
+        return []
+    return list(dict.fromkeys(name.strip() for name in include.split(",") if name.strip()))
+
+
+def fieldsets_param(request: Request) -> Dict[str, List[str]]:
+    """Parse JSON:API sparse fieldsets (`fields[TYPE]=a,b`) into a dict keyed by type"""
+    fieldsets = {}
+    for key, value in request.query_params.items():
+        if key.startswith("fields[") and key.endswith("]"):
+            fieldsets[key[7:-1]] = [name.strip() for name in value.split(",") if name.strip()]
+    return fieldsets
+
+
+def filters_param(request: Request) -> Dict[str, str]:
+    """Parse JSON:API filters (`filter[NAME]=value`) into a dict keyed by name"""
+    return {
+        key[7:-1]: value
+        for key, value in request.query_params.items()
+        if key.startswith("filter[") and key.endswith("]")
+    }
+
+
+def page_links(request: Request, page: Page, params: PageParams) -> Dict[str, str]:
+    """Build `self`/`first`/`next`/`prev` links, keeping every non-page query parameter"""
+    base = [
+        (key, value)
+        for key, value in request.query_params.multi_items()
+        if not key.startswith("page[")
+    ]
+
+    def link(**cursor: str) -> str:
+        query = base + [("page[size]", str(params.size))]
+        query += [(f"page[{key}]", value) for key, value in cursor.items()]
+        return f"{request.url.path}?{urlencode(query)}"
+
+    current = {}
+    if params.after:
+        current["after"] = params.after
+    if params.before:
+        current["before"] = params.before
+
+    links = {"self": link(**current), "first": link()}
+    if page.next_cursor:
+        links["next"] = link(after=page.next_cursor)
+    if page.prev_cursor:
+        links["prev"] = link(before=page.prev_cursor)
+    return links
@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.metrics import registry
+
+router = APIRouter()
+
+# Version 0.0.4 is the Prometheus text exposition format.
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+@router.get("/metrics", include_in_schema=False)
+def read_metrics() -> PlainTextResponse:
+    """Request, connection pool and cache metrics of every worker, in Prometheus text format"""
+    return PlainTextResponse(registry().render(), media_type=CONTENT_TYPE)
@@ -1,28 +1,200 @@
-from fastapi import Request
+import logging
+import math
+import time
+from typing import List
+
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
-from app.core.exceptions import AppException
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.api.replicas import PRIMARY_COOKIE, PRIMARY_HEADER, READ_METHODS
+from app.core.exceptions import AppException, BatchValidationException
+from app.core.metrics import registry, route_template
+from app.core.timing import current, end_request, start_request
 from app.schemas.jsonapi import JsonApiError, JsonApiErrorResponse
 
-async def error_handler(request: Request, call_next):
-    try:
-        return await call_next(request)
-    except AppException as exc:
-        error = JsonApiError(
+logger = logging.getLogger(__name__)
+
+def register_error_handlers(app: FastAPI) -> None:
+    """Answer errors with JSON:API error documents.
+
+    AppExceptions go through FastAPI's exception handlers, inside the app;
+    ErrorMiddleware turns anything else into a 500.
+    """
+    app.add_exception_handler(BatchValidationException, batch_validation_exception_handler)
+    app.add_exception_handler(AppException, app_exception_handler)
+    app.add_middleware(ErrorMiddleware)
+
+async def batch_validation_exception_handler(request: Request, exc: BatchValidationException) -> JSONResponse:
+    errors = [
+        JsonApiError(
             status=str(exc.status_code),
-            code=exc.code,
-            title=exc.detail,
-            meta=exc.meta
-        )
-        return JSONResponse(
-            status_code=exc.status_code,
-            content=JsonApiErrorResponse(errors=[error]).dict(exclude_none=True)
-        )
-    except Exception as exc:
-        error = JsonApiError(
-            status="500",
-            title=str(exc),
-        )
-        return JSONResponse(
-            status_code=500,
-            content=JsonApiErrorResponse(errors=[error]).dict(exclude_none=True)
+            code=error.get("code"),
+            title=error["title"],
+            source={"pointer": error["pointer"]},
         )
+        for error in exc.errors
+    ]
+    return error_response(exc.status_code, errors)
+
+async def app_exception_handler(request: Request, exc: AppException) -> JSONResponse:
+    error = JsonApiError(
+        status=str(exc.status_code),
+        code=exc.code,
+        title=exc.detail,
+        meta=exc.meta
+    )
+    return error_response(exc.status_code, [error])
+
+def error_response(status_code: int, errors: List[JsonApiError]) -> JSONResponse:
+    return JSONResponse(
+        status_code=status_code,
+        content=JsonApiErrorResponse(errors=errors).dict(exclude_none=True)
+    )
+
+class ErrorMiddleware:
+    """Pure ASGI middleware answering unhandled exceptions with a JSON:API 500.
+
+    Unlike an `app.middleware("http")` function it passes `receive` and `send`
+    straight through, so requests do not pay for an extra task and stream
+    wrapping, and streaming responses are left alone.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            # Once the status line is out there is nothing left to replace.
+            if response_started:
+                raise
+            logger.exception("Unhandled error on %s %s", scope["method"], scope["path"])
+            response = error_response(500, [JsonApiError(status="500", title=str(exc))])
+            await response(scope, receive, send)
+
+class ServerTimingMiddleware:
+    """Adds a Server-Timing header and logs one line per request with its query count and phase times.
+
+    Only installed with SERVER_TIMING on. The header is written when the
+    response starts, so anything after that (e.g. a streamed body) only
+    shows up in the log line.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = start_request()
+        timings = current()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message).append("Server-Timing", timings.header())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            end_request(token)
+            values = timings.as_dict()
+            logger.info(
+                "request method=%s path=%s status=%d queries=%d db_ms=%.2f serialize_ms=%.2f "
+                "render_ms=%.2f app_ms=%.2f total_ms=%.2f",
+                scope["method"], scope["path"], status, values["queries"], values["db_ms"],
+                values["serialize_ms"], values["render_ms"], values["app_ms"], values["total_ms"],
+                extra={"timing": values},
+            )
+
+class MetricsMiddleware:
+    """Records per-route request counts, latency, response size and in-flight requests for /metrics.
+
+    Routes are labelled by their template (e.g. /api/v1/contacts/{contact_id}),
+    so ids don't multiply the series. Only installed with METRICS_ENABLED on.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = registry()
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        metrics.request_started()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.request_finished(
+                scope["method"], route_template(scope), status, time.perf_counter() - start, size
+            )
+            if metrics.flush_due():
+                # File I/O and JSON encoding; the response has been sent by now.
+                await run_in_threadpool(metrics.flush)
+
+class ReadYourWritesMiddleware:
+    """Keeps a client that just wrote reading from the primary while replicas catch up.
+
+    Every response to a request that may have written (anything but GET and
+    HEAD) carries the time until which that client's reads skip the replicas,
+    as a cookie and as a header for clients to echo; see app.api.replicas.
+    Only installed when DATABASE_REPLICA_URLS is set.
+    """
+
+    def __init__(self, app: ASGIApp, window_seconds: float) -> None:
+        self.app = app
+        self.window_seconds = window_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in READ_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                until = time.time() + self.window_seconds
+                headers = MutableHeaders(scope=message)
+                headers[PRIMARY_HEADER] = f"{until:.3f}"
+                headers.append(
+                    "Set-Cookie",
+                    f"{PRIMARY_COOKIE}={until:.3f}; Max-Age={math.ceil(self.window_seconds)}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
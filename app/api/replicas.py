@@ -0,0 +1,24 @@
+import time
+
+from fastapi import Request
+
+# Set on responses to writes when replicas are configured (see
+# ReadYourWritesMiddleware); both hold the time until which reads use the
+# primary. Browsers send the cookie back on same-site requests; other clients,
+# and cross-site XHR, echo the header on their next requests.
+PRIMARY_COOKIE = "pingcrm_primary_until"
+PRIMARY_HEADER = "X-Primary-Until"
+READ_METHODS = ("GET", "HEAD")
+
+def reads_from_replica(request: Request) -> bool:
+    """Whether a request may read from a replica: a GET or HEAD whose client hasn't written just before"""
+    if request.method not in READ_METHODS:
+        return False
+    now = time.time()
+    for value in (request.cookies.get(PRIMARY_COOKIE), request.headers.get(PRIMARY_HEADER)):
+        try:
+            if value is not None and float(value) > now:
+                return False
+        except ValueError:
+            continue
+    return True
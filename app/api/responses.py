@@ -0,0 +1,51 @@
+import json
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Union
+
+from fastapi.responses import Response
+
+from app.core.timing import timed
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        text = value.isoformat()
+        # Pydantic (and orjson with OPT_UTC_Z) render UTC as "Z" rather than "+00:00".
+        return text[:-6] + "Z" if value.utcoffset() == timedelta(0) else text
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode `content` byte-for-byte as FastAPI would encode the equivalent Pydantic response"""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class JsonApiJSONResponse(Response):
+    """Response for pre-built JSON:API documents; skips `response_model` validation and re-encoding"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        with timed("render"):
+            return dumps(content)
+
+
+def document(
+    data: Union[Dict[str, Any], List[Dict[str, Any]]],
+    included: Optional[List[Dict[str, Any]]] = None,
+    links: Optional[Dict[str, str]] = None,
+    meta: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Plain-dict counterpart of `JsonApiResponse`, with the same keys in the same order"""
+    return {"data": data, "included": included, "links": links, "meta": meta}
@@ -1,9 +1,22 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import accounts, users, organizations, contacts
+from app.core.config import Settings
 
-api_router = APIRouter()
-api_router.include_router(accounts.router, prefix="/accounts", tags=["accounts"])
-api_router.include_router(users.router, prefix="/users", tags=["users"])
-api_router.include_router(organizations.router, prefix="/organizations", tags=["organizations"])
-api_router.include_router(contacts.router, prefix="/contacts", tags=["contacts"])
+def build_api_router(settings: Settings) -> APIRouter:
+    """The /api/v1 routes; endpoint modules are imported here, when an app is built"""
+    from app.api.v1.endpoints import accounts, auth, users, organizations, contacts, status
+
+    api_router = APIRouter()
+    for module, prefix, tag in [
+        (accounts, "/accounts", "accounts"),
+        (users, "/users", "users"),
+        (organizations, "/organizations", "organizations"),
+        (contacts, "/contacts", "contacts"),
+    ]:
+        # Routes match in registration order, so the async reads shadow the sync ones.
+        if settings.DATABASE_ASYNC:
+            api_router.include_router(module.async_router, prefix=prefix, tags=[tag])
+        api_router.include_router(module.router, prefix=prefix, tags=[tag])
+    api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
+    api_router.include_router(status.router, prefix="/status", tags=["status"])
+    return api_router
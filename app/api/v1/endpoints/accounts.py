@@ -1,32 +1,46 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import crud, models
 from app.api import deps
+from app.api.bulk import parse_update
+from app.api.caching import etag_matches, list_etag, not_modified, resource_etag
+from app.api.jsonapi import PageParams, fieldsets_param, page_links
+from app.api.responses import JsonApiJSONResponse, document
 from app.schemas.schemas import AccountCreate
 from app.schemas.jsonapi import JsonApiResponse, JsonApiResource, JsonApiRequest
 from app.serializers.account import account_serializer
 
 router = APIRouter()
+async_router = APIRouter()
 
 @router.get("/", response_model=JsonApiResponse[List[JsonApiResource]])
 def read_accounts(
+    request: Request,
     db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
+    page_params: PageParams = Depends(),
+    fieldsets: Dict[str, List[str]] = Depends(fieldsets_param),
 ) -> Any:
-    accounts = crud.account.get_multi(db, skip=skip, limit=limit)
-    resources = [account_serializer.serialize(account, db) for account in accounts]
-    
-    return JsonApiResponse(
-        data=resources,
-        meta={"total": len(accounts)},
-        links={
-            "self": f"/api/v1/accounts?skip={skip}&limit={limit}",
-            "first": f"/api/v1/accounts?skip=0&limit={limit}",
-        }
+    page = crud.account.get_page(
+        db,
+        size=page_params.size,
+        after=page_params.after,
+        before=page_params.before,
+        sort=page_params.sort,
+        columns=account_serializer.plan_columns(fieldsets),
+        account_id=current_account_id,
     )
+    etag = list_etag(request, account_serializer, page, ())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return JsonApiJSONResponse(document(
+        data=account_serializer.to_dicts(page.items, fieldsets),
+        meta={"total": len(page.items)},
+        links=page_links(request, page, page_params),
+    ), headers={"ETag": etag})
 
 @router.post("/", response_model=JsonApiResponse[JsonApiResource])
 def create_account(
@@ -46,27 +60,31 @@ def create_account(
 @router.get("/{account_id}", response_model=JsonApiResponse[JsonApiResource])
 def read_account(
     *,
+    request: Request,
     db: Session = Depends(deps.get_db),
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
     account_id: int,
+    fieldsets: Dict[str, List[str]] = Depends(fieldsets_param),
 ) -> Any:
-    account = crud.account.get_or_404(db=db, id=account_id)
-    resource = account_serializer.serialize(account, db)
-    
-    return JsonApiResponse(
-        data=resource,
-        links={"self": f"/api/v1/accounts/{account_id}"}
-    )
+    account = crud.account.get_snapshot_or_404(db, account_id, account_id=current_account_id)
+    etag = resource_etag(request, account_serializer, account, ())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return JsonApiJSONResponse(document(
+        data=account_serializer.to_dict(account, fieldsets),
+        links={"self": f"/api/v1/accounts/{account_id}"},
+    ), headers={"ETag": etag})
 
 @router.put("/{account_id}", response_model=JsonApiResponse[JsonApiResource])
 def update_account(
     *,
     db: Session = Depends(deps.get_db),
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
     account_id: int,
     request: JsonApiRequest,
 ) -> Any:
-    account = crud.account.get_or_404(db=db, id=account_id)
-    account_in = AccountCreate(name=request.data.attributes.name)
-    account = crud.account.update(db=db, db_obj=account, obj_in=account_in)
+    account_in = parse_update(request.data.attributes, AccountCreate)
+    account = crud.account.update(db=db, id=account_id, obj_in=account_in, account_id=current_account_id)
     resource = account_serializer.serialize(account, db)
     
     return JsonApiResponse(
@@ -78,12 +96,60 @@ def update_account(
 def delete_account(
     *,
     db: Session = Depends(deps.get_db),
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
     account_id: int,
 ) -> Any:
-    account = crud.account.remove(db=db, id=account_id)
+    account = crud.account.remove(db=db, id=account_id, account_id=current_account_id)
     resource = account_serializer.serialize(account, db)
     
     return JsonApiResponse(
         data=resource,
         links={"self": f"/api/v1/accounts/{account_id}"}
     )
+
+# Read endpoints served on the asyncio engine when settings.DATABASE_ASYNC is on.
+# api.py mounts async_router ahead of router so these take over the GET routes.
+
+@async_router.get("/", response_model=JsonApiResponse[List[JsonApiResource]])
+async def read_accounts_async(
+    request: Request,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
+    page_params: PageParams = Depends(),
+    fieldsets: Dict[str, List[str]] = Depends(fieldsets_param),
+) -> Any:
+    page = await crud.account.aget_page(
+        db,
+        size=page_params.size,
+        after=page_params.after,
+        before=page_params.before,
+        sort=page_params.sort,
+        columns=account_serializer.plan_columns(fieldsets),
+        account_id=current_account_id,
+    )
+    etag = list_etag(request, account_serializer, page, ())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return JsonApiJSONResponse(document(
+        data=account_serializer.to_dicts(page.items, fieldsets),
+        meta={"total": len(page.items)},
+        links=page_links(request, page, page_params),
+    ), headers={"ETag": etag})
+
+@async_router.get("/{account_id}", response_model=JsonApiResponse[JsonApiResource])
+async def read_account_async(
+    *,
+    request: Request,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
+    account_id: int,
+    fieldsets: Dict[str, List[str]] = Depends(fieldsets_param),
+) -> Any:
+    account = await crud.account.aget_snapshot_or_404(db, account_id, account_id=current_account_id)
+    etag = resource_etag(request, account_serializer, account, ())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return JsonApiJSONResponse(document(
+        data=account_serializer.to_dict(account, fieldsets),
+        links={"self": f"/api/v1/accounts/{account_id}"},
+    ), headers={"ETag": etag})
@@ -0,0 +1,45 @@
+from typing import Any, Dict
+from fastapi import APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.api import deps
+from app.core.config import settings
+from app.core.exceptions import UnauthorizedException
+from app.core.security import Principal, averify_and_update, create_access_token
+
+router = APIRouter()
+
+@router.post("/login")
+async def login(
+    form: OAuth2PasswordRequestForm = Depends(),
+    db: Session = Depends(deps.get_db),
+) -> Dict[str, Any]:
+    """Exchange an email (the form's username) and password for a bearer token"""
+    user = await run_in_threadpool(crud.user.get_by_email, db, email=form.username)
+    valid, new_hash = await averify_and_update(
+        form.password, user.encrypted_password if user else None
+    )
+    if not valid:
+        raise UnauthorizedException("Incorrect email or password", code="invalid_credentials")
+    if new_hash:
+        await run_in_threadpool(
+            crud.user.update, db, id=user.id, obj_in={"encrypted_password": new_hash}
+        )
+    return {
+        "access_token": create_access_token(user),
+        "token_type": "bearer",
+        "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    }
+
+@router.get("/me")
+def read_current_user(current_user: Principal = Depends(deps.get_current_user)) -> Dict[str, Any]:
+    """The authenticated user, straight from the token"""
+    return {"data": {
+        "type": "users",
+        "id": str(current_user.id),
+        "attributes": {"email": current_user.email, "owner": current_user.owner},
+        "relationships": {"account": {"data": {"type": "accounts", "id": str(current_user.account_id)}}},
+    }}
@@ -1,33 +1,75 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import crud, models
 from app.api import deps
+from app.api.bulk import (
+    ensure_ids_exist, ensure_references_exist, parse_bulk_create, parse_bulk_identifiers, parse_bulk_update,
+    parse_update,
+)
+from app.api.caching import etag_matches, list_etag, not_modified, resource_etag
+from app.api.export import ExportFormat, astream_export, export_response, stream_export
+from app.api.jsonapi import PageParams, fieldsets_param, filters_param, include_param, page_links
+from app.api.replicas import reads_from_replica
+from app.api.responses import JsonApiJSONResponse, document
 from app.schemas.schemas import ContactCreate, ContactUpdate
-from app.schemas.jsonapi import JsonApiResponse, JsonApiResource, JsonApiRequest
+from app.schemas.jsonapi import JsonApiBulkRequest, JsonApiResponse, JsonApiResource, JsonApiRequest
 from app.serializers.contact import contact_serializer
 from app.core.exceptions import NotFoundException, ValidationException
 
 router = APIRouter()
+async_router = APIRouter()
 
 @router.get("/", response_model=JsonApiResponse[List[JsonApiResource]])
 def read_contacts(
+    request: Request,
     db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
+    page_params: PageParams = Depends(),
+    include: List[str] = Depends(include_param),
+    fieldsets: Dict[str, List[str]] = Depends(fieldsets_param),
+    filters: Dict[str, str] = Depends(filters_param),
 ) -> Any:
-    contacts = crud.contact.get_multi(db, skip=skip, limit=limit)
-    resources = [contact_serializer.serialize(contact, db) for contact in contacts]
-    
-    return JsonApiResponse(
-        data=resources,
-        meta={"total": len(contacts)},
-        links={
-            "self": f"/api/v1/contacts?skip={skip}&limit={limit}",
-            "first": f"/api/v1/contacts?skip=0&limit={limit}",
-        }
+    options = contact_serializer.plan_loads(include, fieldsets)
+    page = crud.contact.get_page(
+        db,
+        size=page_params.size,
+        after=page_params.after,
+        before=page_params.before,
+        sort=page_params.sort,
+        filters=filters,
+        options=options,
+        columns=contact_serializer.plan_columns(fieldsets),
+        account_id=current_account_id,
+    )
+    etag = list_etag(request, contact_serializer, page, include)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return JsonApiJSONResponse(document(
+        data=contact_serializer.to_dicts(page.items, fieldsets),
+        included=contact_serializer.included_dicts(page.items, include, fieldsets),
+        meta={"total": len(page.items)},
+        links=page_links(request, page, page_params),
+    ), headers={"ETag": etag})
+
+@router.get("/export", response_class=StreamingResponse)
+def export_contacts(
+    request: Request,
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
+    export_format: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+) -> Any:
+    """Stream every contact as NDJSON or CSV; memory stays flat regardless of table size"""
+    chunks = stream_export(
+        crud.contact,
+        contact_serializer.export_columns(),
+        export_format,
+        from_replica=reads_from_replica(request),
+        account_id=current_account_id,
     )
+    return export_response(chunks, export_format, "contacts")
 
 @router.post("/", response_model=JsonApiResponse[JsonApiResource])
 def create_contact(
@@ -57,44 +99,94 @@ def create_contact(
         links={"self": f"/api/v1/contacts/{contact.id}"}
     )
 
+@router.post("/bulk", response_model=JsonApiResponse[List[JsonApiResource]])
+def create_contacts_bulk(
+    *,
+    db: Session = Depends(deps.get_db),
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
+    request: JsonApiBulkRequest,
+) -> Any:
+    """Create a batch of contacts in one INSERT and one transaction"""
+    values = parse_bulk_create(request, contact_serializer, ContactCreate, current_account_id)
+    ensure_references_exist(db, crud.contact, values, current_account_id)
+    contacts = crud.contact.create_many(db, values=values, account_id=current_account_id)
+    return JsonApiJSONResponse(document(
+        data=contact_serializer.to_dicts(contacts),
+        meta={"total": len(contacts)},
+    ))
+
+@router.put("/bulk", response_model=JsonApiResponse[List[JsonApiResource]])
+def update_contacts_bulk(
+    *,
+    db: Session = Depends(deps.get_db),
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
+    request: JsonApiBulkRequest,
+) -> Any:
+    """Update a batch of contacts by id in one transaction; attributes may be partial"""
+    values = parse_bulk_update(request, contact_serializer, ContactUpdate)
+    ensure_ids_exist(db, crud.contact, [item["id"] for item in values], values, current_account_id)
+    contacts = crud.contact.update_many(db, values=values, account_id=current_account_id)
+    return JsonApiJSONResponse(document(
+        data=contact_serializer.to_dicts(contacts),
+        meta={"total": len(contacts)},
+    ))
+
+@router.delete("/bulk", response_model=JsonApiResponse[List[JsonApiResource]])
+def delete_contacts_bulk(
+    *,
+    db: Session = Depends(deps.get_db),
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
+    request: JsonApiBulkRequest,
+) -> Any:
+    """Trash a batch of contacts by resource identifier in one UPDATE"""
+    ids = parse_bulk_identifiers(request, contact_serializer)
+    ensure_ids_exist(db, crud.contact, ids, account_id=current_account_id)
+    deleted = crud.contact.remove_many(db, ids=ids, account_id=current_account_id)
+    return JsonApiJSONResponse(document(
+        data=[{"type": contact_serializer.type_name, "id": str(item_id)} for item_id in ids],
+        meta={"total": deleted},
+    ))
+
 @router.get("/{contact_id}", response_model=JsonApiResponse[JsonApiResource])
 def read_contact(
     *,
+    request: Request,
     db: Session = Depends(deps.get_db),
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
     contact_id: int,
+    include: List[str] = Depends(include_param),
+    fieldsets: Dict[str, List[str]] = Depends(fieldsets_param),
 ) -> Any:
-    contact = crud.contact.get_or_404(db=db, id=contact_id)
-    resource = contact_serializer.serialize(contact, db)
-    
-    return JsonApiResponse(
-        data=resource,
-        links={"self": f"/api/v1/contacts/{contact_id}"}
-    )
+    if include:
+        contact = crud.contact.get_or_404(
+            db=db,
+            id=contact_id,
+            options=contact_serializer.plan_loads(include, fieldsets),
+            columns=contact_serializer.plan_columns(fieldsets),
+            account_id=current_account_id,
+        )
+    else:
+        # Without sideloads the (cached) snapshot has everything the document needs.
+        contact = crud.contact.get_snapshot_or_404(db, contact_id, account_id=current_account_id)
+    etag = resource_etag(request, contact_serializer, contact, include)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return JsonApiJSONResponse(document(
+        data=contact_serializer.to_dict(contact, fieldsets),
+        included=contact_serializer.included_dicts([contact], include, fieldsets),
+        links={"self": f"/api/v1/contacts/{contact_id}"},
+    ), headers={"ETag": etag})
 
 @router.put("/{contact_id}", response_model=JsonApiResponse[JsonApiResource])
 def update_contact(
     *,
     db: Session = Depends(deps.get_db),
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
     contact_id: int,
     request: JsonApiRequest,
 ) -> Any:
-    contact = crud.contact.get_or_404(db=db, id=contact_id)
-
-    attrs = request.data.attributes
-    contact_in = ContactUpdate(
-        first_name=attrs.get("first_name", contact.first_name),
-        last_name=attrs.get("last_name", contact.last_name),
-        organization_id=attrs.get("organization_id", contact.organization_id),
-        email=attrs.get("email", contact.email),
-        phone=attrs.get("phone", contact.phone),
-        address=attrs.get("address", contact.address),
-        city=attrs.get("city", contact.city),
-        region=attrs.get("region", contact.region),
-        country=attrs.get("country", contact.country),
-        postal_code=attrs.get("postal_code", contact.postal_code),
-    )
-    
-    contact = crud.contact.update(db=db, db_obj=contact, obj_in=contact_in)
+    contact_in = parse_update(request.data.attributes, ContactUpdate)
+    contact = crud.contact.update(db=db, id=contact_id, obj_in=contact_in, account_id=current_account_id)
     resource = contact_serializer.serialize(contact, db)
     
     return JsonApiResponse(
@@ -106,13 +198,107 @@ def update_contact(
 def delete_contact(
     *,
     db: Session = Depends(deps.get_db),
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
     contact_id: int,
 ) -> Any:
-    contact = crud.contact.get_or_404(db=db, id=contact_id)
-    contact = crud.contact.remove(db=db, id=contact_id)
+    contact = crud.contact.remove(db=db, id=contact_id, account_id=current_account_id)
     resource = contact_serializer.serialize(contact, db)
     
     return JsonApiResponse(
         data=resource,
         links={"self": f"/api/v1/contacts/{contact_id}"}
     )
+
+@router.put("/{contact_id}/restore", response_model=JsonApiResponse[JsonApiResource])
+def restore_contact(
+    *,
+    db: Session = Depends(deps.get_db),
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
+    contact_id: int,
+) -> Any:
+    """Bring back a trashed contact"""
+    contact = crud.contact.restore(db=db, id=contact_id, account_id=current_account_id)
+    return JsonApiJSONResponse(document(
+        data=contact_serializer.to_dict(contact),
+        links={"self": f"/api/v1/contacts/{contact_id}"},
+    ))
+
+# Read endpoints served on the asyncio engine when settings.DATABASE_ASYNC is on.
+# api.py mounts async_router ahead of router so these take over the GET routes.
+
+@async_router.get("/", response_model=JsonApiResponse[List[JsonApiResource]])
+async def read_contacts_async(
+    request: Request,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
+    page_params: PageParams = Depends(),
+    include: List[str] = Depends(include_param),
+    fieldsets: Dict[str, List[str]] = Depends(fieldsets_param),
+    filters: Dict[str, str] = Depends(filters_param),
+) -> Any:
+    options = contact_serializer.plan_loads(include, fieldsets)
+    page = await crud.contact.aget_page(
+        db,
+        size=page_params.size,
+        after=page_params.after,
+        before=page_params.before,
+        sort=page_params.sort,
+        filters=filters,
+        options=options,
+        columns=contact_serializer.plan_columns(fieldsets),
+        account_id=current_account_id,
+    )
+    etag = list_etag(request, contact_serializer, page, include)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return JsonApiJSONResponse(document(
+        data=contact_serializer.to_dicts(page.items, fieldsets),
+        included=contact_serializer.included_dicts(page.items, include, fieldsets),
+        meta={"total": len(page.items)},
+        links=page_links(request, page, page_params),
+    ), headers={"ETag": etag})
+
+@async_router.get("/export", response_class=StreamingResponse)
+async def export_contacts_async(
+    request: Request,
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
+    export_format: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+) -> Any:
+    chunks = astream_export(
+        crud.contact,
+        contact_serializer.export_columns(),
+        export_format,
+        from_replica=reads_from_replica(request),
+        account_id=current_account_id,
+    )
+    return export_response(chunks, export_format, "contacts")
+
+@async_router.get("/{contact_id}", response_model=JsonApiResponse[JsonApiResource])
+async def read_contact_async(
+    *,
+    request: Request,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
+    contact_id: int,
+    include: List[str] = Depends(include_param),
+    fieldsets: Dict[str, List[str]] = Depends(fieldsets_param),
+) -> Any:
+    if include:
+        contact = await crud.contact.aget_or_404(
+            db=db,
+            id=contact_id,
+            options=contact_serializer.plan_loads(include, fieldsets),
+            columns=contact_serializer.plan_columns(fieldsets),
+            account_id=current_account_id,
+        )
+    else:
+        # Without sideloads the (cached) snapshot has everything the document needs.
+        contact = await crud.contact.aget_snapshot_or_404(db, contact_id, account_id=current_account_id)
+    etag = resource_etag(request, contact_serializer, contact, include)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return JsonApiJSONResponse(document(
+        data=contact_serializer.to_dict(contact, fieldsets),
+        included=contact_serializer.included_dicts([contact], include, fieldsets),
+        links={"self": f"/api/v1/contacts/{contact_id}"},
+    ), headers={"ETag": etag})
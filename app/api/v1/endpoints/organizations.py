@@ -1,32 +1,74 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import crud, models
 from app.api import deps
+from app.api.bulk import (
+    ensure_ids_exist, ensure_references_exist, parse_bulk_create, parse_bulk_identifiers, parse_bulk_update,
+    parse_update,
+)
+from app.api.caching import etag_matches, list_etag, not_modified, resource_etag
+from app.api.export import ExportFormat, astream_export, export_response, stream_export
+from app.api.jsonapi import PageParams, fieldsets_param, filters_param, include_param, page_links
+from app.api.replicas import reads_from_replica
+from app.api.responses import JsonApiJSONResponse, document
 from app.schemas.schemas import OrganizationCreate
-from app.schemas.jsonapi import JsonApiResponse, JsonApiResource, JsonApiRequest
+from app.schemas.jsonapi import JsonApiBulkRequest, JsonApiResponse, JsonApiResource, JsonApiRequest
 from app.serializers.organization import organization_serializer
 
 router = APIRouter()
+async_router = APIRouter()
 
 @router.get("/", response_model=JsonApiResponse[List[JsonApiResource]])
 def read_organizations(
+    request: Request,
     db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
+    page_params: PageParams = Depends(),
+    include: List[str] = Depends(include_param),
+    fieldsets: Dict[str, List[str]] = Depends(fieldsets_param),
+    filters: Dict[str, str] = Depends(filters_param),
 ) -> Any:
-    organizations = crud.organization.get_multi(db, skip=skip, limit=limit)
-    resources = [organization_serializer.serialize(org, db) for org in organizations]
-    
-    return JsonApiResponse(
-        data=resources,
-        meta={"total": len(organizations)},
-        links={
-            "self": f"/api/v1/organizations?skip={skip}&limit={limit}",
-            "first": f"/api/v1/organizations?skip=0&limit={limit}",
-        }
+    options = organization_serializer.plan_loads(include, fieldsets)
+    page = crud.organization.get_page(
+        db,
+        size=page_params.size,
+        after=page_params.after,
+        before=page_params.before,
+        sort=page_params.sort,
+        filters=filters,
+        options=options,
+        columns=organization_serializer.plan_columns(fieldsets),
+        account_id=current_account_id,
     )
+    etag = list_etag(request, organization_serializer, page, include)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return JsonApiJSONResponse(document(
+        data=organization_serializer.to_dicts(page.items, fieldsets),
+        included=organization_serializer.included_dicts(page.items, include, fieldsets),
+        meta={"total": len(page.items)},
+        links=page_links(request, page, page_params),
+    ), headers={"ETag": etag})
+
+@router.get("/export", response_class=StreamingResponse)
+def export_organizations(
+    request: Request,
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
+    export_format: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+) -> Any:
+    """Stream every organization as NDJSON or CSV; memory stays flat regardless of table size"""
+    chunks = stream_export(
+        crud.organization,
+        organization_serializer.export_columns(),
+        export_format,
+        from_replica=reads_from_replica(request),
+        account_id=current_account_id,
+    )
+    return export_response(chunks, export_format, "organizations")
 
 @router.post("/", response_model=JsonApiResponse[JsonApiResource])
 def create_organization(
@@ -54,42 +96,98 @@ def create_organization(
         links={"self": f"/api/v1/organizations/{organization.id}"}
     )
 
+@router.post("/bulk", response_model=JsonApiResponse[List[JsonApiResource]])
+def create_organizations_bulk(
+    *,
+    db: Session = Depends(deps.get_db),
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
+    request: JsonApiBulkRequest,
+) -> Any:
+    """Create a batch of organizations in one INSERT and one transaction"""
+    values = parse_bulk_create(request, organization_serializer, OrganizationCreate, current_account_id)
+    ensure_references_exist(db, crud.organization, values, current_account_id)
+    organizations = crud.organization.create_many(db, values=values, account_id=current_account_id)
+    return JsonApiJSONResponse(document(
+        data=organization_serializer.to_dicts(organizations),
+        meta={"total": len(organizations)},
+    ))
+
+@router.put("/bulk", response_model=JsonApiResponse[List[JsonApiResource]])
+def update_organizations_bulk(
+    *,
+    db: Session = Depends(deps.get_db),
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
+    request: JsonApiBulkRequest,
+) -> Any:
+    """Update a batch of organizations by id in one transaction; attributes may be partial"""
+    values = parse_bulk_update(request, organization_serializer, OrganizationCreate)
+    ensure_ids_exist(db, crud.organization, [item["id"] for item in values], values, current_account_id)
+    organizations = crud.organization.update_many(db, values=values, account_id=current_account_id)
+    return JsonApiJSONResponse(document(
+        data=organization_serializer.to_dicts(organizations),
+        meta={"total": len(organizations)},
+    ))
+
+@router.delete("/bulk", response_model=JsonApiResponse[List[JsonApiResource]])
+def delete_organizations_bulk(
+    *,
+    db: Session = Depends(deps.get_db),
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
+    request: JsonApiBulkRequest,
+) -> Any:
+    """Trash a batch of organizations by resource identifier in one UPDATE"""
+    ids = parse_bulk_identifiers(request, organization_serializer)
+    ensure_ids_exist(db, crud.organization, ids, account_id=current_account_id)
+    deleted = crud.organization.remove_many(db, ids=ids, account_id=current_account_id)
+    return JsonApiJSONResponse(document(
+        data=[{"type": organization_serializer.type_name, "id": str(item_id)} for item_id in ids],
+        meta={"total": deleted},
+    ))
+
 @router.get("/{organization_id}", response_model=JsonApiResponse[JsonApiResource])
 def read_organization(
     *,
+    request: Request,
     db: Session = Depends(deps.get_db),
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
     organization_id: int,
+    include: List[str] = Depends(include_param),
+    fieldsets: Dict[str, List[str]] = Depends(fieldsets_param),
 ) -> Any:
-    organization = crud.organization.get_or_404(db=db, id=organization_id)
-    resource = organization_serializer.serialize(organization, db)
-    
-    return JsonApiResponse(
-        data=resource,
-        links={"self": f"/api/v1/organizations/{organization_id}"}
-    )
+    if include:
+        organization = crud.organization.get_or_404(
+            db=db,
+            id=organization_id,
+            options=organization_serializer.plan_loads(include, fieldsets),
+            columns=organization_serializer.plan_columns(fieldsets),
+            account_id=current_account_id,
+        )
+    else:
+        # Without sideloads the (cached) snapshot has everything the document needs.
+        organization = crud.organization.get_snapshot_or_404(
+            db, organization_id, account_id=current_account_id
+        )
+    etag = resource_etag(request, organization_serializer, organization, include)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return JsonApiJSONResponse(document(
+        data=organization_serializer.to_dict(organization, fieldsets),
+        included=organization_serializer.included_dicts([organization], include, fieldsets),
+        links={"self": f"/api/v1/organizations/{organization_id}"},
+    ), headers={"ETag": etag})
 
 @router.put("/{organization_id}", response_model=JsonApiResponse[JsonApiResource])
 def update_organization(
     *,
     db: Session = Depends(deps.get_db),
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
     organization_id: int,
     request: JsonApiRequest,
 ) -> Any:
-    organization = crud.organization.get_or_404(db=db, id=organization_id)
-
-    attrs = request.data.attributes
-    org_in = OrganizationCreate(
-        name=attrs.name,
-        email=attrs.email,
-        phone=attrs.phone,
-        address=attrs.address,
-        city=attrs.city,
-        region=attrs.region,
-        country=attrs.country,
-        postal_code=attrs.postal_code,
+    org_in = parse_update(request.data.attributes, OrganizationCreate)
+    organization = crud.organization.update(
+        db=db, id=organization_id, obj_in=org_in, account_id=current_account_id
     )
-    
-    organization = crud.organization.update(db=db, db_obj=organization, obj_in=org_in)
     resource = organization_serializer.serialize(organization, db)
     
     return JsonApiResponse(
@@ -101,12 +199,109 @@ def update_organization(
 def delete_organization(
     *,
     db: Session = Depends(deps.get_db),
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
     organization_id: int,
 ) -> Any:
-    organization = crud.organization.remove(db=db, id=organization_id)
+    organization = crud.organization.remove(db=db, id=organization_id, account_id=current_account_id)
     resource = organization_serializer.serialize(organization, db)
     
     return JsonApiResponse(
         data=resource,
         links={"self": f"/api/v1/organizations/{organization_id}"}
     )
+
+@router.put("/{organization_id}/restore", response_model=JsonApiResponse[JsonApiResource])
+def restore_organization(
+    *,
+    db: Session = Depends(deps.get_db),
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
+    organization_id: int,
+) -> Any:
+    """Bring back a trashed organization"""
+    organization = crud.organization.restore(db=db, id=organization_id, account_id=current_account_id)
+    return JsonApiJSONResponse(document(
+        data=organization_serializer.to_dict(organization),
+        links={"self": f"/api/v1/organizations/{organization_id}"},
+    ))
+
+# Read endpoints served on the asyncio engine when settings.DATABASE_ASYNC is on.
+# api.py mounts async_router ahead of router so these take over the GET routes.
+
+@async_router.get("/", response_model=JsonApiResponse[List[JsonApiResource]])
+async def read_organizations_async(
+    request: Request,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
+    page_params: PageParams = Depends(),
+    include: List[str] = Depends(include_param),
+    fieldsets: Dict[str, List[str]] = Depends(fieldsets_param),
+    filters: Dict[str, str] = Depends(filters_param),
+) -> Any:
+    options = organization_serializer.plan_loads(include, fieldsets)
+    page = await crud.organization.aget_page(
+        db,
+        size=page_params.size,
+        after=page_params.after,
+        before=page_params.before,
+        sort=page_params.sort,
+        filters=filters,
+        options=options,
+        columns=organization_serializer.plan_columns(fieldsets),
+        account_id=current_account_id,
+    )
+    etag = list_etag(request, organization_serializer, page, include)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return JsonApiJSONResponse(document(
+        data=organization_serializer.to_dicts(page.items, fieldsets),
+        included=organization_serializer.included_dicts(page.items, include, fieldsets),
+        meta={"total": len(page.items)},
+        links=page_links(request, page, page_params),
+    ), headers={"ETag": etag})
+
+@async_router.get("/export", response_class=StreamingResponse)
+async def export_organizations_async(
+    request: Request,
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
+    export_format: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+) -> Any:
+    chunks = astream_export(
+        crud.organization,
+        organization_serializer.export_columns(),
+        export_format,
+        from_replica=reads_from_replica(request),
+        account_id=current_account_id,
+    )
+    return export_response(chunks, export_format, "organizations")
+
+@async_router.get("/{organization_id}", response_model=JsonApiResponse[JsonApiResource])
+async def read_organization_async(
+    *,
+    request: Request,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
+    organization_id: int,
+    include: List[str] = Depends(include_param),
+    fieldsets: Dict[str, List[str]] = Depends(fieldsets_param),
+) -> Any:
+    if include:
+        organization = await crud.organization.aget_or_404(
+            db=db,
+            id=organization_id,
+            options=organization_serializer.plan_loads(include, fieldsets),
+            columns=organization_serializer.plan_columns(fieldsets),
+            account_id=current_account_id,
+        )
+    else:
+        # Without sideloads the (cached) snapshot has everything the document needs.
+        organization = await crud.organization.aget_snapshot_or_404(
+            db, organization_id, account_id=current_account_id
+        )
+    etag = resource_etag(request, organization_serializer, organization, include)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return JsonApiJSONResponse(document(
+        data=organization_serializer.to_dict(organization, fieldsets),
+        included=organization_serializer.included_dicts([organization], include, fieldsets),
+        links={"self": f"/api/v1/organizations/{organization_id}"},
+    ), headers={"ETag": etag})
@@ -0,0 +1,17 @@
+from typing import Any
+from fastapi import APIRouter
+
+from app.core.cache import cache_stats
+from app.db.pool import pool_stats
+
+router = APIRouter()
+
+@router.get("/db-pool")
+def read_db_pool() -> Any:
+    """Connection pool saturation: connections in use, overflow, checkout waits and timeouts"""
+    return {"meta": {"pools": pool_stats()}}
+
+@router.get("/cache")
+def read_cache() -> Any:
+    """Snapshot cache effectiveness: entries, hits, misses, invalidations and evictions"""
+    return {"meta": {"caches": cache_stats()}}
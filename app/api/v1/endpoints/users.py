@@ -1,40 +1,65 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends
+import asyncio
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import crud, models
 from app.api import deps
+from app.api.bulk import (
+    ensure_ids_exist, ensure_references_exist, parse_bulk_create, parse_bulk_identifiers, parse_bulk_update,
+    parse_update,
+)
+from app.api.caching import etag_matches, list_etag, not_modified, resource_etag
+from app.api.jsonapi import PageParams, fieldsets_param, include_param, page_links
+from app.api.responses import JsonApiJSONResponse, document
 from app.schemas.schemas import UserCreate
-from app.schemas.jsonapi import JsonApiResponse, JsonApiResource, JsonApiRequest
+from app.schemas.jsonapi import JsonApiBulkRequest, JsonApiResponse, JsonApiResource, JsonApiRequest
 from app.serializers.user import user_serializer
 from app.core.exceptions import ValidationException
+from app.core.security import aget_password_hash
 
 router = APIRouter()
+async_router = APIRouter()
 
 @router.get("/", response_model=JsonApiResponse[List[JsonApiResource]])
 def read_users(
+    request: Request,
     db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
+    page_params: PageParams = Depends(),
+    include: List[str] = Depends(include_param),
+    fieldsets: Dict[str, List[str]] = Depends(fieldsets_param),
 ) -> Any:
-    users = crud.user.get_multi(db, skip=skip, limit=limit)
-    resources = [user_serializer.serialize(user, db) for user in users]
-    
-    return JsonApiResponse(
-        data=resources,
-        meta={"total": len(users)},
-        links={
-            "self": f"/api/v1/users?skip={skip}&limit={limit}",
-            "first": f"/api/v1/users?skip=0&limit={limit}",
-        }
+    options = user_serializer.plan_loads(include, fieldsets)
+    page = crud.user.get_page(
+        db,
+        size=page_params.size,
+        after=page_params.after,
+        before=page_params.before,
+        sort=page_params.sort,
+        options=options,
+        columns=user_serializer.plan_columns(fieldsets),
+        account_id=current_account_id,
     )
+    etag = list_etag(request, user_serializer, page, include)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return JsonApiJSONResponse(document(
+        data=user_serializer.to_dicts(page.items, fieldsets),
+        included=user_serializer.included_dicts(page.items, include, fieldsets),
+        meta={"total": len(page.items)},
+        links=page_links(request, page, page_params),
+    ), headers={"ETag": etag})
 
 @router.post("/", response_model=JsonApiResponse[JsonApiResource])
-def create_user(
+async def create_user(
     *,
     db: Session = Depends(deps.get_db),
     request: JsonApiRequest,
 ) -> Any:
+    """Create a user; bcrypt runs on the password pool, the queries on the threadpool"""
     attrs = request.data.attributes
     user_in = UserCreate(
         first_name=attrs.first_name,
@@ -44,13 +69,16 @@ def create_user(
         owner=attrs.owner,
     )
     
-    user = crud.user.get_by_email(db, email=user_in.email)
+    user = await run_in_threadpool(crud.user.get_by_email, db, email=user_in.email)
     if user:
         raise ValidationException(
             detail="The user with this email already exists in the system."
         )
     
-    user = crud.user.create(db=db, obj_in=user_in)
+    encrypted_password = await aget_password_hash(user_in.password)
+    user = await run_in_threadpool(
+        crud.user.create, db, obj_in=user_in, encrypted_password=encrypted_password
+    )
     resource = user_serializer.serialize(user, db)
     
     return JsonApiResponse(
@@ -58,45 +86,101 @@ def create_user(
         links={"self": f"/api/v1/users/{user.id}"}
     )
 
+@router.post("/bulk", response_model=JsonApiResponse[List[JsonApiResource]])
+async def create_users_bulk(
+    *,
+    db: Session = Depends(deps.get_db),
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
+    request: JsonApiBulkRequest,
+) -> Any:
+    """Create a batch of users in one INSERT and one transaction"""
+    values = parse_bulk_create(request, user_serializer, UserCreate, current_account_id)
+    await run_in_threadpool(ensure_references_exist, db, crud.user, values, current_account_id)
+    await _hash_passwords(values)
+    users = await run_in_threadpool(crud.user.create_many, db, values=values, account_id=current_account_id)
+    return JsonApiJSONResponse(document(
+        data=user_serializer.to_dicts(users),
+        meta={"total": len(users)},
+    ))
+
+@router.put("/bulk", response_model=JsonApiResponse[List[JsonApiResource]])
+async def update_users_bulk(
+    *,
+    db: Session = Depends(deps.get_db),
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
+    request: JsonApiBulkRequest,
+) -> Any:
+    """Update a batch of users by id in one transaction; attributes may be partial"""
+    values = parse_bulk_update(request, user_serializer, UserCreate)
+    await run_in_threadpool(
+        ensure_ids_exist, db, crud.user, [item["id"] for item in values], values, current_account_id
+    )
+    await _hash_passwords(values)
+    users = await run_in_threadpool(crud.user.update_many, db, values=values, account_id=current_account_id)
+    return JsonApiJSONResponse(document(
+        data=user_serializer.to_dicts(users),
+        meta={"total": len(users)},
+    ))
+
+@router.delete("/bulk", response_model=JsonApiResponse[List[JsonApiResource]])
+def delete_users_bulk(
+    *,
+    db: Session = Depends(deps.get_db),
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
+    request: JsonApiBulkRequest,
+) -> Any:
+    """Trash a batch of users by resource identifier in one UPDATE"""
+    ids = parse_bulk_identifiers(request, user_serializer)
+    ensure_ids_exist(db, crud.user, ids, account_id=current_account_id)
+    deleted = crud.user.remove_many(db, ids=ids, account_id=current_account_id)
+    return JsonApiJSONResponse(document(
+        data=[{"type": user_serializer.type_name, "id": str(item_id)} for item_id in ids],
+        meta={"total": deleted},
+    ))
+
 @router.get("/{user_id}", response_model=JsonApiResponse[JsonApiResource])
 def read_user(
     *,
+    request: Request,
     db: Session = Depends(deps.get_db),
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
     user_id: int,
+    include: List[str] = Depends(include_param),
+    fieldsets: Dict[str, List[str]] = Depends(fieldsets_param),
 ) -> Any:
-    user = crud.user.get_or_404(db=db, id=user_id)
-    resource = user_serializer.serialize(user, db)
-    
-    return JsonApiResponse(
-        data=resource,
-        links={"self": f"/api/v1/users/{user_id}"}
+    user = crud.user.get_or_404(
+        db=db,
+        id=user_id,
+        options=user_serializer.plan_loads(include, fieldsets),
+        columns=user_serializer.plan_columns(fieldsets),
+        account_id=current_account_id,
     )
+    etag = resource_etag(request, user_serializer, user, include)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return JsonApiJSONResponse(document(
+        data=user_serializer.to_dict(user, fieldsets),
+        included=user_serializer.included_dicts([user], include, fieldsets),
+        links={"self": f"/api/v1/users/{user_id}"},
+    ), headers={"ETag": etag})
 
 @router.put("/{user_id}", response_model=JsonApiResponse[JsonApiResource])
 def update_user(
     *,
     db: Session = Depends(deps.get_db),
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
     user_id: int,
     request: JsonApiRequest,
 ) -> Any:
-    user = crud.user.get_or_404(db=db, id=user_id)
+    user_in = parse_update(request.data.attributes, UserCreate)
+    if "email" in user_in:
+        existing_user = crud.user.get_by_email(db, email=user_in["email"])
+        if existing_user and existing_user.id != user_id:
+            raise ValidationException(
+                detail="The user with this email already exists in the system."
+            )
 
-    attrs = request.data.attributes
-    user_in = UserCreate(
-        first_name=attrs.first_name,
-        last_name=attrs.last_name,
-        email=attrs.email,
-        password=attrs.password,
-        owner=attrs.owner,
-    )
-    
-    existing_user = crud.user.get_by_email(db, email=user_in.email)
-    if existing_user and existing_user.id != user_id:
-        raise ValidationException(
-            detail="The user with this email already exists in the system."
-        )
-    
-    user = crud.user.update(db=db, db_obj=user, obj_in=user_in)
+    user = crud.user.update(db=db, id=user_id, obj_in=user_in, account_id=current_account_id)
     resource = user_serializer.serialize(user, db)
     
     return JsonApiResponse(
@@ -108,12 +192,93 @@ def update_user(
 def delete_user(
     *,
     db: Session = Depends(deps.get_db),
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
     user_id: int,
 ) -> Any:
-    user = crud.user.remove(db=db, id=user_id)
+    user = crud.user.remove(db=db, id=user_id, account_id=current_account_id)
     resource = user_serializer.serialize(user, db)
     
     return JsonApiResponse(
         data=resource,
         links={"self": f"/api/v1/users/{user_id}"}
     )
+
+@router.put("/{user_id}/restore", response_model=JsonApiResponse[JsonApiResource])
+def restore_user(
+    *,
+    db: Session = Depends(deps.get_db),
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
+    user_id: int,
+) -> Any:
+    """Bring back a trashed user"""
+    user = crud.user.restore(db=db, id=user_id, account_id=current_account_id)
+    return JsonApiJSONResponse(document(
+        data=user_serializer.to_dict(user),
+        links={"self": f"/api/v1/users/{user_id}"},
+    ))
+
+async def _hash_passwords(values: List[Dict[str, Any]]) -> None:
+    """Swap plaintext `password`s for bcrypt hashes computed concurrently on the password pool"""
+    items = [item for item in values if "password" in item]
+    hashes = await asyncio.gather(*[aget_password_hash(item.pop("password")) for item in items])
+    for item, encrypted_password in zip(items, hashes):
+        item["encrypted_password"] = encrypted_password
+
+# Read endpoints served on the asyncio engine when settings.DATABASE_ASYNC is on.
+# api.py mounts async_router ahead of router so these take over the GET routes.
+
+@async_router.get("/", response_model=JsonApiResponse[List[JsonApiResource]])
+async def read_users_async(
+    request: Request,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
+    page_params: PageParams = Depends(),
+    include: List[str] = Depends(include_param),
+    fieldsets: Dict[str, List[str]] = Depends(fieldsets_param),
+) -> Any:
+    options = user_serializer.plan_loads(include, fieldsets)
+    page = await crud.user.aget_page(
+        db,
+        size=page_params.size,
+        after=page_params.after,
+        before=page_params.before,
+        sort=page_params.sort,
+        options=options,
+        columns=user_serializer.plan_columns(fieldsets),
+        account_id=current_account_id,
+    )
+    etag = list_etag(request, user_serializer, page, include)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return JsonApiJSONResponse(document(
+        data=user_serializer.to_dicts(page.items, fieldsets),
+        included=user_serializer.included_dicts(page.items, include, fieldsets),
+        meta={"total": len(page.items)},
+        links=page_links(request, page, page_params),
+    ), headers={"ETag": etag})
+
+@async_router.get("/{user_id}", response_model=JsonApiResponse[JsonApiResource])
+async def read_user_async(
+    *,
+    request: Request,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_account_id: Optional[int] = Depends(deps.get_account_id),
+    user_id: int,
+    include: List[str] = Depends(include_param),
+    fieldsets: Dict[str, List[str]] = Depends(fieldsets_param),
+) -> Any:
+    user = await crud.user.aget_or_404(
+        db=db,
+        id=user_id,
+        options=user_serializer.plan_loads(include, fieldsets),
+        columns=user_serializer.plan_columns(fieldsets),
+        account_id=current_account_id,
+    )
+    etag = resource_etag(request, user_serializer, user, include)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return JsonApiJSONResponse(document(
+        data=user_serializer.to_dict(user, fieldsets),
+        included=user_serializer.included_dicts([user], include, fieldsets),
+        links={"self": f"/api/v1/users/{user_id}"},
+    ), headers={"ETag": etag})
@@ -0,0 +1,154 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from app.core.config import settings
+
+# Returned by CacheBackend.get on a miss, so None can be a cached value.
+MISSING = object()
+
+
+class CacheBackend:
+    """Storage behind a ModelCache. Values are plain tuples, so a shared
+    (e.g. Redis-backed) implementation only needs to serialize tuples."""
+
+    def get(self, key: Hashable) -> Any:
+        raise NotImplementedError
+
+    def set(self, key: Hashable, value: Any) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: Hashable) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+class MemoryBackend(CacheBackend):
+    """Per-process LRU with a TTL; the least recently used entry goes first once `max_entries` is reached"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ModelCache:
+    """Read-through cache of one model's rows keyed by primary key, with hit/miss counters"""
+
+    def __init__(self, name: str, backend: CacheBackend):
+        self.name = name
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        # Bumped by every invalidation; see `set`.
+        self.generation = 0
+
+    def get(self, key: Hashable) -> Any:
+        value = self.backend.get(key)
+        if value is MISSING:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, generation: int) -> None:
+        """Store a value read from the database while `generation` was current.
+
+        If a write invalidated anything since, the value may predate that write,
+        so it is dropped rather than cached.
+        """
+        if generation == self.generation:
+            self.backend.set(key, value)
+
+    def invalidate(self, *keys: Hashable) -> None:
+        self.generation += 1
+        for key in keys:
+            self.backend.delete(key)
+        self.invalidations += len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "entries": len(self.backend),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "evictions": getattr(self.backend, "evictions", None),
+        }
+
+
+BackendFactory = Callable[[str], CacheBackend]
+
+_backend_factory: Optional[BackendFactory] = None
+_caches: Dict[str, ModelCache] = {}
+
+
+def set_backend_factory(factory: BackendFactory) -> None:
+    """Swap the storage used by caches created from now on, e.g. for a shared cache"""
+    global _backend_factory
+    _backend_factory = factory
+
+
+def get_cache(name: str) -> ModelCache:
+    """The cache registered under `name`, created on first use"""
+    cache = _caches.get(name)
+    if cache is None:
+        cache = _caches[name] = ModelCache(name, _new_backend(name))
+    return cache
+
+
+def reset() -> None:
+    """Drop every cache; the next use creates them from the current settings"""
+    _caches.clear()
+
+
+def cache_stats() -> List[Dict[str, Any]]:
+    return [cache.stats() for cache in _caches.values()]
+
+
+def _new_backend(name: str) -> CacheBackend:
+    if _backend_factory is not None:
+        return _backend_factory(name)
+    return MemoryBackend(settings.CACHE_MAX_ENTRIES, settings.CACHE_TTL_SECONDS)
@@ -1,23 +1,84 @@
 from pydantic_settings import BaseSettings
-from functools import lru_cache
-from dotenv import load_dotenv
-import os
-
-# Load the environment variables from .env file
-load_dotenv(override=True)
+from typing import Any, List, Optional
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    # Serve reads through SQLAlchemy's asyncio engine (asyncpg / aiosqlite) instead
+    # of sync endpoints on the threadpool. ASYNC_DATABASE_URL defaults to
+    # DATABASE_URL with its driver swapped for the async one.
+    DATABASE_ASYNC: bool = False
+    ASYNC_DATABASE_URL: Optional[str] = None
+    # Read replicas of DATABASE_URL, comma-separated. GET and HEAD requests read
+    # from them in turn; everything else uses the primary. A client that sent a
+    # write reads from the primary for READ_YOUR_WRITES_SECONDS afterwards (a
+    # cookie and an X-Primary-Until header it echoes track it), so replica lag
+    # never hides its own changes.
+    DATABASE_REPLICA_URLS: str = ""
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+    # Connection pool sizing (QueuePool). DB_POOL_RECYCLE=-1 never recycles.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = -1
+    DB_POOL_PRE_PING: bool = False
+    # Log a warning once this share of the pool's connections is checked out.
+    DB_POOL_SATURATION_WARNING: float = 0.8
+    # In-process cache of single-row reads for CRUD classes with cache_snapshots set.
+    # Each process caches separately, so another worker's write is seen after at most
+    # CACHE_TTL_SECONDS.
+    CACHE_ENABLED: bool = False
+    CACHE_MAX_ENTRIES: int = 10000
+    CACHE_TTL_SECONDS: float = 30.0
+    # bcrypt cost factor; stored hashes made with another cost are upgraded on login.
+    BCRYPT_ROUNDS: int = 12
+    # Threads hashing and verifying passwords, apart from the request threadpool.
+    PASSWORD_HASH_WORKERS: int = 2
+    # Access tokens. JWT_KEYS_FILE is a JSON keyring, {"active": kid, "keys": {kid: secret}},
+    # re-read whenever it changes: rotate by adding a key and making it active, and
+    # drop the old one once its tokens have expired. Without it, SECRET_KEY is the only key.
+    SECRET_KEY: Optional[str] = None
+    JWT_KEYS_FILE: Optional[str] = None
+    JWT_ALGORITHM: str = "HS256"
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    # Verified tokens remembered per process, so repeat requests skip verification.
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    # Per-request Server-Timing header and log line: query count, DB, serialize and
+    # render time. Off by default; when off no hooks are installed.
+    SERVER_TIMING: bool = False
+    # Prometheus metrics at /metrics: per-route counts, latency and response sizes,
+    # pool and cache stats. With several worker processes, point METRICS_DIR at a
+    # directory they share (emptied on deploy) so any of them can report for all;
+    # each writes its totals there at most every METRICS_FLUSH_SECONDS.
+    METRICS_ENABLED: bool = False
+    METRICS_DIR: Optional[str] = None
+    METRICS_FLUSH_SECONDS: float = 5.0
 
     class Config:
         env_file = ".env"
         case_sensitive = True
 
-@lru_cache()
-def get_settings():
-    return Settings()
+    @property
+    def replica_urls(self) -> List[str]:
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+
+_settings: Optional[Settings] = None
+
+def get_settings() -> Settings:
+    """The process's settings, read from the environment and .env on first use"""
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
+
+def configure(new_settings: Settings) -> None:
+    """Use `new_settings` from now on, e.g. those passed to create_app"""
+    global _settings
+    _settings = new_settings
+
+class _LazySettings:
+    """Forwards to get_settings(), so importing this module reads no environment"""
 
-settings = get_settings()
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_settings(), name)
 
-# Debug print to verify the database URL
-print(f"Loaded DATABASE_URL: {settings.DATABASE_URL}")
+settings = _LazySettings()
@@ -1,4 +1,4 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 class AppException(Exception):
     """Base exception for application."""
@@ -34,6 +34,22 @@ class ValidationException(AppException):
     ) -> None:
         super().__init__(400, detail, code, meta)
 
+class BatchValidationException(ValidationException):
+    """Validation errors for individual items of a batch request.
+
+    Each error is a dict with a `title`, the JSON `pointer` of the offending
+    member of the request document and an optional `code`.
+    """
+    def __init__(
+        self,
+        errors: List[Dict[str, Any]],
+        detail: str = "Batch validation failed",
+        code: Optional[str] = None,
+        meta: Optional[Dict[str, Any]] = None
+    ) -> None:
+        super().__init__(detail, code, meta)
+        self.errors = errors
+
 class UnauthorizedException(AppException):
     """Unauthorized exception."""
     def __init__(
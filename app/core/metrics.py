@@ -0,0 +1,309 @@
+import glob
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Upper bounds of the histogram buckets; +Inf is implied.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Route label of requests that matched no route, so unknown paths can't blow up cardinality.
+UNMATCHED = "<unmatched>"
+
+RouteKey = Tuple[str, str]
+
+
+def route_template(scope: Dict[str, Any]) -> str:
+    """The matched route's template, e.g. /api/v1/contacts/{contact_id}, for a finished request.
+
+    FastAPI versions that keep included routers nested leave the route as
+    declared on its own router in the scope, with a `path_format` relative to
+    the router's prefix; the effective route they record next to it carries
+    the full one.
+    """
+    route = scope.get("route")
+    if route is None:
+        return UNMATCHED
+    effective = scope.get("fastapi", {}).get("effective_route_context")
+    return getattr(effective, "path_format", None) or route.path_format
+
+
+class Histogram:
+    """Bucket counts (not cumulative), observation count and sum"""
+
+    __slots__ = ("bounds", "buckets", "count", "sum")
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.buckets[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def merge(self, buckets: Sequence[int], count: int, total: float) -> None:
+        for index, value in enumerate(buckets):
+            self.buckets[index] += value
+        self.count += count
+        self.sum += total
+
+    def as_list(self) -> List[Any]:
+        return [list(self.buckets), self.count, self.sum]
+
+
+class MetricsRegistry:
+    """Per-route request metrics of this process.
+
+    Requests are recorded by MetricsMiddleware on the event loop's thread, so
+    recording takes no lock. With a `directory`, each process also writes its
+    totals there (at most every `flush_seconds`, and on every scrape) and a
+    scrape adds up every process's file, so any worker can answer for all.
+    """
+
+    def __init__(self, directory: Optional[str] = None, flush_seconds: float = 5.0) -> None:
+        self.directory = directory
+        self.flush_seconds = flush_seconds
+        self.requests: Dict[Tuple[str, str, int], int] = {}
+        self.latency: Dict[RouteKey, Histogram] = {}
+        self.sizes: Dict[RouteKey, Histogram] = {}
+        self.in_flight = 0
+        self._last_flush = 0.0
+        self._flush_lock = threading.Lock()
+
+    def request_started(self) -> None:
+        self.in_flight += 1
+
+    def request_finished(self, method: str, route: str, status: int, seconds: float, size: int) -> None:
+        self.in_flight -= 1
+        key = (method, route, status)
+        self.requests[key] = self.requests.get(key, 0) + 1
+        route_key = (method, route)
+        latency = self.latency.get(route_key)
+        if latency is None:
+            latency = self.latency[route_key] = Histogram(LATENCY_BUCKETS)
+            self.sizes[route_key] = Histogram(SIZE_BUCKETS)
+        latency.observe(seconds)
+        self.sizes[route_key].observe(size)
+
+    def flush_due(self) -> bool:
+        """Whether this process's totals should be written out now; a True claims the flush"""
+        if not self.directory or time.monotonic() - self._last_flush < self.flush_seconds:
+            return False
+        self._last_flush = time.monotonic()
+        return True
+
+    def snapshot(self) -> Dict[str, Any]:
+        """This process's totals as plain JSON-able data"""
+        from app.core.cache import cache_stats
+        from app.db.pool import pool_stats
+
+        # Scrapes run on a worker thread while the loop keeps recording; list()
+        # copies in one step, so a concurrent insert can't break the iteration.
+        latency: Dict[RouteKey, Histogram] = {}
+        sizes: Dict[RouteKey, Histogram] = {}
+        _merge_histograms(latency, list(self.latency.items()), LATENCY_BUCKETS)
+        _merge_histograms(sizes, list(self.sizes.items()), SIZE_BUCKETS)
+        return {
+            "pid": os.getpid(),
+            "in_flight": self.in_flight,
+            "requests": [[*key, count] for key, count in list(self.requests.items())],
+            "latency": [[*key, *histogram.as_list()] for key, histogram in latency.items()],
+            "sizes": [[*key, *histogram.as_list()] for key, histogram in sizes.items()],
+            "pools": pool_stats(),
+            "caches": cache_stats(),
+        }
+
+    def flush(self) -> None:
+        """Write this process's snapshot to the shared directory; blocking, so keep it off the event loop"""
+        path = os.path.join(self.directory, f"metrics-{os.getpid()}.json")
+        tmp_path = f"{path}.tmp"
+        # A background flush and a scrape may run at once; both write tmp_path.
+        with self._flush_lock:
+            self._last_flush = time.monotonic()
+            with open(tmp_path, "w") as f:
+                json.dump(self.snapshot(), f)
+            os.replace(tmp_path, path)
+
+    def collect(self) -> List[Dict[str, Any]]:
+        """Snapshots of every process sharing the directory, this one included"""
+        if not self.directory:
+            return [self.snapshot()]
+        self.flush()
+        snapshots = []
+        for path in glob.glob(os.path.join(self.directory, "metrics-*.json")):
+            try:
+                with open(path) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                # Removed or half-written by another process; it's back on the next scrape.
+                continue
+        return snapshots
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        return render(self.collect())
+
+
+def render(snapshots: Sequence[Dict[str, Any]]) -> str:
+    """Add up process snapshots into Prometheus text.
+
+    Counters and histograms include processes that have exited, so they never
+    go backwards; gauges only count processes that are still running.
+    """
+    live = [snapshot for snapshot in snapshots if _is_alive(snapshot["pid"])]
+    requests: Dict[Tuple[str, str, int], int] = {}
+    latency: Dict[RouteKey, Histogram] = {}
+    sizes: Dict[RouteKey, Histogram] = {}
+    for snapshot in snapshots:
+        for method, route, status, count in snapshot["requests"]:
+            key = (method, route, status)
+            requests[key] = requests.get(key, 0) + count
+        _merge_lists(latency, snapshot["latency"], LATENCY_BUCKETS)
+        _merge_lists(sizes, snapshot["sizes"], SIZE_BUCKETS)
+
+    lines: List[str] = []
+    _family(lines, "http_requests_total", "counter", "Requests by method, route template and status")
+    for (method, route, status), count in sorted(requests.items()):
+        lines.append(f"http_requests_total{_labels(method=method, route=route, status=status)} {count}")
+    _family(lines, "http_request_duration_seconds", "histogram", "Time to answer a request, body included")
+    _histograms(lines, "http_request_duration_seconds", latency)
+    _family(lines, "http_response_size_bytes", "histogram", "Response body size")
+    _histograms(lines, "http_response_size_bytes", sizes)
+    _family(lines, "http_requests_in_flight", "gauge", "Requests being answered right now")
+    lines.append(f"http_requests_in_flight {sum(snapshot['in_flight'] for snapshot in live)}")
+
+    _pool_metrics(lines, snapshots, live)
+    _cache_metrics(lines, snapshots, live)
+    return "\n".join(lines) + "\n"
+
+
+def _pool_metrics(lines: List[str], snapshots: Sequence[Dict[str, Any]], live: Sequence[Dict[str, Any]]) -> None:
+    gauges = [
+        ("db_pool_connections_in_use", "in_use", "Connections checked out"),
+        ("db_pool_connections_idle", "idle", "Connections in the pool, ready for checkout"),
+        ("db_pool_overflow", "overflow", "Connections open beyond pool_size"),
+        ("db_pool_size", "size", "Connections the pool keeps open"),
+    ]
+    counters = [
+        ("db_pool_checkouts_total", "checkouts", "Connections handed out"),
+        ("db_pool_timeouts_total", "timeouts", "Checkouts that gave up waiting"),
+    ]
+    for name, field, help_text in gauges:
+        _family(lines, name, "gauge", help_text)
+        for pool, value in _sum_by(live, "pools", field).items():
+            lines.append(f"{name}{_labels(pool=pool)} {value}")
+    for name, field, help_text in counters:
+        _family(lines, name, "counter", help_text)
+        for pool, value in _sum_by(snapshots, "pools", field).items():
+            lines.append(f"{name}{_labels(pool=pool)} {value}")
+    _family(lines, "db_pool_wait_seconds_total", "counter", "Time spent waiting for a connection")
+    for pool, value in _sum_by(snapshots, "pools", "wait_ms_total").items():
+        lines.append(f"db_pool_wait_seconds_total{_labels(pool=pool)} {value / 1000}")
+
+
+def _cache_metrics(lines: List[str], snapshots: Sequence[Dict[str, Any]], live: Sequence[Dict[str, Any]]) -> None:
+    hits = _sum_by(snapshots, "caches", "hits")
+    misses = _sum_by(snapshots, "caches", "misses")
+    for name, values, help_text in [
+        ("cache_hits_total", hits, "Lookups answered from the cache"),
+        ("cache_misses_total", misses, "Lookups that went to the database"),
+        ("cache_invalidations_total", _sum_by(snapshots, "caches", "invalidations"), "Entries dropped by writes"),
+    ]:
+        _family(lines, name, "counter", help_text)
+        for cache, value in values.items():
+            lines.append(f"{name}{_labels(cache=cache)} {value}")
+    _family(lines, "cache_entries", "gauge", "Entries currently cached")
+    for cache, value in _sum_by(live, "caches", "entries").items():
+        lines.append(f"cache_entries{_labels(cache=cache)} {value}")
+    _family(lines, "cache_hit_ratio", "gauge", "Share of lookups answered from the cache")
+    for cache, value in hits.items():
+        lookups = value + misses.get(cache, 0)
+        lines.append(f"cache_hit_ratio{_labels(cache=cache)} {round(value / lookups, 4) if lookups else 0.0}")
+
+
+def _histograms(lines: List[str], name: str, histograms: Dict[RouteKey, Histogram]) -> None:
+    for (method, route), histogram in sorted(histograms.items()):
+        cumulative = 0
+        for bound, count in zip((*histogram.bounds, "+Inf"), histogram.buckets):
+            cumulative += count
+            lines.append(f"{name}_bucket{_labels(method=method, route=route, le=bound)} {cumulative}")
+        labels = _labels(method=method, route=route)
+        lines.append(f"{name}_count{labels} {histogram.count}")
+        lines.append(f"{name}_sum{labels} {histogram.sum}")
+
+
+def _merge_histograms(
+    into: Dict[RouteKey, Histogram], items: Iterable[Tuple[RouteKey, Histogram]], bounds: Sequence[float]
+) -> None:
+    for key, histogram in items:
+        if key not in into:
+            into[key] = Histogram(bounds)
+        into[key].merge(histogram.buckets, histogram.count, histogram.sum)
+
+
+def _merge_lists(into: Dict[RouteKey, Histogram], rows: Iterable[List[Any]], bounds: Sequence[float]) -> None:
+    for method, route, buckets, count, total in rows:
+        key = (method, route)
+        if key not in into:
+            into[key] = Histogram(bounds)
+        into[key].merge(buckets, count, total)
+
+
+def _sum_by(snapshots: Iterable[Dict[str, Any]], section: str, field: str) -> Dict[str, float]:
+    totals: Dict[str, float] = {}
+    for snapshot in snapshots:
+        for entry in snapshot[section]:
+            value = entry.get(field) or 0
+            totals[entry["name"]] = totals.get(entry["name"], 0) + value
+    return totals
+
+
+def _family(lines: List[str], name: str, kind: str, help_text: str) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _labels(**labels: Any) -> str:
+    pairs = ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items())
+    return "{" + pairs + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _is_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+_registry: Optional[MetricsRegistry] = None
+
+
+def configure(directory: Optional[str] = None, flush_seconds: float = 5.0) -> MetricsRegistry:
+    global _registry
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    _registry = MetricsRegistry(directory, flush_seconds)
+    return _registry
+
+
+def registry() -> MetricsRegistry:
+    """The process-wide registry, created without a shared directory on first use"""
+    global _registry
+    if _registry is None:
+        _registry = MetricsRegistry()
+    return _registry
@@ -1,12 +1,210 @@
-from datetime import datetime, timedelta
-from typing import Any, Union
-from passlib.context import CryptContext
-from jose import jwt
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, NamedTuple, Optional, Tuple
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.core.cache import MISSING, MemoryBackend
+from app.core.config import settings
+from app.core.exceptions import UnauthorizedException
+
+logger = logging.getLogger(__name__)
+
+# passlib and jose are imported on first use, keeping them out of worker startup.
+
+@lru_cache()
+def pwd_context() -> Any:
+    from passlib.context import CryptContext
+
+    # With a fixed `rounds`, hashes made at any other cost count as outdated, so
+    # verify_and_update re-hashes them on the next successful login.
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return pwd_context().hash(password)
+
+def verify_and_update(plain_password: str, hashed_password: Optional[str]) -> Tuple[bool, Optional[str]]:
+    """Verify a password; on success also return a new hash when the stored one uses an old cost.
+
+    Without a stored hash this still spends one bcrypt verification before
+    failing, so login timing does not tell unknown emails from wrong passwords.
+    """
+    if not hashed_password:
+        pwd_context().verify(plain_password, _placeholder_hash())
+        return False, None
+    return pwd_context().verify_and_update(plain_password, hashed_password)
+
+@lru_cache()
+def _placeholder_hash() -> str:
+    return pwd_context().hash(os.urandom(16).hex())
+
+# Async counterparts, run on the dedicated password pool.
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    return await _run(verify_password, plain_password, hashed_password)
+
+async def aget_password_hash(password: str) -> str:
+    return await _run(get_password_hash, password)
+
+async def averify_and_update(plain_password: str, hashed_password: Optional[str]) -> Tuple[bool, Optional[str]]:
+    return await _run(verify_and_update, plain_password, hashed_password)
+
+async def _run(func: Any, *args: Any) -> Any:
+    return await asyncio.get_running_loop().run_in_executor(_get("hash_executor"), func, *args)
+
+
+# Access tokens
+
+class Principal(NamedTuple):
+    """The authenticated user as recorded in the token's claims; valid until the token expires"""
+    id: int
+    account_id: int
+    email: str
+    owner: bool
+
+
+class Keyring:
+    """JWT signing keys by key id (`kid`).
+
+    Keys are read from the JSON file at `path` and re-read whenever its mtime
+    changes, checked at most every `check_interval` seconds. Without a file,
+    `secret` is the only key, under the kid "default".
+    """
+
+    def __init__(self, path: Optional[str], secret: Optional[str], check_interval: float = 1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._keys: Dict[str, str] = {"default": secret} if secret and not path else {}
+        self._active: Optional[str] = "default" if self._keys else None
+        self._mtime: Optional[int] = None
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def signing_key(self) -> Tuple[str, str]:
+        """The active (kid, secret) to sign new tokens with"""
+        self._refresh()
+        if self._active is None:
+            raise RuntimeError("No JWT signing key configured; set SECRET_KEY or JWT_KEYS_FILE")
+        return self._active, self._keys[self._active]
+
+    def get(self, kid: Any) -> Optional[str]:
+        """The secret for `kid`, or None once the key has been retired"""
+        self._refresh()
+        return self._keys.get(kid)
+
+    def _refresh(self) -> None:
+        if self.path is None or time.monotonic() - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            self._checked_at = time.monotonic()
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+                if mtime == self._mtime:
+                    return
+                with open(self.path) as f:
+                    data = json.load(f)
+                keys, active = dict(data["keys"]), data["active"]
+                if active not in keys:
+                    raise ValueError(f"active key {active!r} is not in the keyring")
+            except (OSError, ValueError, KeyError, TypeError) as exc:
+                # Keep serving with the keys we have, e.g. while the file is being rewritten.
+                logger.warning("Could not load JWT keyring %s: %s", self.path, exc)
+                return
+            self._keys, self._active, self._mtime = keys, active, mtime
+
+
+# Built from the settings on first use by _get below, not when this module is
+# imported; reset() drops them so the next use picks up new settings.
+_state: Dict[str, Any] = {}
+_state_lock = threading.Lock()
+
+def _build() -> Dict[str, Any]:
+    return {
+        "keyring": Keyring(settings.JWT_KEYS_FILE, settings.SECRET_KEY),
+        # Verified tokens by sha256(token): (kid, exp, principal). Entries never outlive
+        # their token, and a hit is only honored while the signing key is in the keyring.
+        "verified_tokens": MemoryBackend(
+            settings.TOKEN_CACHE_MAX_ENTRIES, settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        ),
+        # bcrypt releases the GIL while hashing, so threads run it in parallel. The pool
+        # is separate from the request threadpool and bounded, so a burst of sign-ups or
+        # logins queues here instead of occupying every request worker.
+        "hash_executor": ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+        ),
+    }
+
+def _get(name: str) -> Any:
+    with _state_lock:
+        if not _state:
+            _state.update(_build())
+        return _state[name]
+
+def get_keyring() -> Keyring:
+    return _get("keyring")
+
+def reset() -> None:
+    """Forget the keyring, token cache, hash pool and bcrypt context built from the old settings"""
+    with _state_lock:
+        executor = _state.get("hash_executor")
+        _state.clear()
+    if executor is not None:
+        executor.shutdown(wait=False)
+    pwd_context.cache_clear()
+    _placeholder_hash.cache_clear()
+
+def create_access_token(user: Any, expires_delta: Optional[timedelta] = None) -> str:
+    """Sign a token for `user` with the active key; its claims are all `get_current_user` needs"""
+    kid, secret = get_keyring().signing_key()
+    now = datetime.now(timezone.utc)
+    claims = {
+        "sub": str(user.id),
+        "acc": user.account_id,
+        "email": user.email,
+        "owner": bool(user.owner),
+        "iat": now,
+        "exp": now + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)),
+    }
+    from jose import jwt
+
+    return jwt.encode(claims, secret, algorithm=settings.JWT_ALGORITHM, headers={"kid": kid})
+
+def decode_access_token(token: str) -> Principal:
+    """Verify `token` and return its principal, from the cache when it was verified before"""
+    keyring, verified_tokens = get_keyring(), _get("verified_tokens")
+    cache_key = hashlib.sha256(token.encode()).digest()
+    entry = verified_tokens.get(cache_key)
+    if entry is not MISSING:
+        kid, expires_at, principal = entry
+        if expires_at > time.time() and keyring.get(kid) is not None:
+            return principal
+        verified_tokens.delete(cache_key)
+    from jose import ExpiredSignatureError, JWTError, jwt
+
+    try:
+        kid = jwt.get_unverified_header(token).get("kid")
+        secret = keyring.get(kid)
+        if secret is None:
+            raise UnauthorizedException("Invalid token", code="invalid_token")
+        claims = jwt.decode(token, secret, algorithms=[settings.JWT_ALGORITHM])
+        principal = Principal(
+            id=int(claims["sub"]),
+            account_id=int(claims["acc"]),
+            email=claims["email"],
+            owner=bool(claims["owner"]),
+        )
+    except ExpiredSignatureError:
+        raise UnauthorizedException("Token expired", code="token_expired")
+    except (JWTError, KeyError, TypeError, ValueError):
+        raise UnauthorizedException("Invalid token", code="invalid_token")
+    verified_tokens.set(cache_key, (kid, claims["exp"], principal))
+    return principal
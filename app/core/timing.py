@@ -0,0 +1,120 @@
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar, Token
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Phases timed by `timed`, in the order they appear in the Server-Timing header.
+PHASES = ("serialize", "render")
+
+_NOT_TIMED = nullcontext()
+
+
+class RequestTimings:
+    """Time spent by one request in SQL, serialization and rendering.
+
+    Shared by reference with the threads a request runs in: the threadpool
+    copies the context, so they all see this same object.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self.queries = 0
+        self.db = 0.0
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self._active: set = set()
+
+    def add_query(self, seconds: float) -> None:
+        self.queries += 1
+        self.db += seconds
+
+    def finish(self) -> None:
+        if self.finished is None:
+            self.finished = time.perf_counter()
+
+    @property
+    def total(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Milliseconds per phase; `app` is whatever is left, e.g. routing, ORM hydration and validation"""
+        total = self.total
+        measured = {"db": self.db, **self.phases}
+        return {
+            "queries": self.queries,
+            **{f"{name}_ms": round(seconds * 1000, 3) for name, seconds in measured.items()},
+            "app_ms": round(max(total - sum(measured.values()), 0.0) * 1000, 3),
+            "total_ms": round(total * 1000, 3),
+        }
+
+    def header(self) -> str:
+        """The Server-Timing header value"""
+        values = self.as_dict()
+        metrics = [f'db;dur={values["db_ms"]};desc="queries: {self.queries}"']
+        metrics += [f"{name};dur={values[f'{name}_ms']}" for name in (*PHASES, "app", "total")]
+        return ", ".join(metrics)
+
+
+class _Timer:
+    __slots__ = ("timings", "phase", "start")
+
+    def __init__(self, timings: RequestTimings, phase: str) -> None:
+        self.timings = timings
+        self.phase = phase
+
+    def __enter__(self) -> None:
+        self.timings._active.add(self.phase)
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.timings.phases[self.phase] += time.perf_counter() - self.start
+        self.timings._active.discard(self.phase)
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def start_request() -> Token:
+    return _current.set(RequestTimings())
+
+
+def end_request(token: Token) -> RequestTimings:
+    timings = _current.get()
+    _current.reset(token)
+    timings.finish()
+    return timings
+
+
+def current() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+def timed(phase: str) -> Any:
+    """Context manager adding its duration to `phase` of the current request.
+
+    Outside a timed request (always, unless SERVER_TIMING is on) it is a shared
+    no-op; nested calls for the same phase only count once.
+    """
+    timings = _current.get()
+    if timings is None or phase in timings._active:
+        return _NOT_TIMED
+    return _Timer(timings, phase)
+
+
+def instrument_queries(engine: Engine) -> None:
+    """Count and time statements on `engine`; for async engines pass `async_engine.sync_engine`"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        if _current.get() is not None:
+            context._timing_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        timings = _current.get()
+        start = getattr(context, "_timing_start", None)
+        if timings is not None and start is not None:
+            timings.add_query(time.perf_counter() - start)
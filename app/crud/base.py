@@ -1,62 +1,575 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
-from fastapi.encoders import jsonable_encoder
+from collections import namedtuple
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Dict, Generic, Iterator, List, Optional, Sequence, Tuple, Type, TypeVar, Union
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, Select, delete, insert, inspect, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy.sql.elements import ColumnElement
 from app.db.base import Base
-from app.core.exceptions import NotFoundException
+from app.db.search import search_clause
+from app.db.soft_delete import include_trashed
+from app.models.base import SoftDeleteMixin, utcnow
+from app.core.cache import MISSING, ModelCache, get_cache
+from app.core.config import settings
+from app.core.exceptions import NotFoundException, ValidationException
+from app.crud.pagination import (
+    Page, SortKey, decode_cursor, encode_cursor, keyset_clause, parse_sort
+)
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    # Columns a client may sort on, and the order used when it doesn't ask.
+    sortable: Sequence[str] = ("created_at", "updated_at")
+    default_sort: Sequence[str] = ("id",)
+    # Column holding a row's account, which scopes reads given an `account_id`,
+    # and the order of one account's rows when the client doesn't ask. That
+    # order should match an (account_id, ..., id) index, so a page is a range
+    # scan of the index rather than a sort of every row the account has.
+    account_key: str = "account_id"
+    account_sort: Sequence[str] = ("id",)
+    # Names a client may use in filter[NAME]. "search" matches the model's
+    # search_columns, "trashed" (with|only) reveals soft-deleted rows; any other
+    # name is an equality test on that column.
+    filterable: Sequence[str] = ()
+    # Serve get_snapshot() from the in-process cache when settings.CACHE_ENABLED is on.
+    cache_snapshots: bool = False
+
     def __init__(self, model: Type[ModelType]):
         self.model = model
+        self.soft_delete = issubclass(model, SoftDeleteMixin)
+        # Snapshots are detached, immutable copies of a row; the serializers read
+        # them exactly like model instances.
+        columns = [attr.key for attr in inspect(model).column_attrs]
+        self.snapshot_type = namedtuple(f"{model.__name__}Snapshot", columns)
+        # Attribute names an update may write, from the mapper rather than per call.
+        self.column_keys = frozenset(columns)
+        self.account_column = getattr(model, self.account_key, None)
+
+    @property
+    def cache(self) -> Optional[ModelCache]:
+        """The snapshot cache, looked up per use so it follows the current settings"""
+        if not (self.cache_snapshots and settings.CACHE_ENABLED):
+            return None
+        return get_cache(self.model.__tablename__)
 
-    def get(self, db: Session, id: Any) -> Optional[ModelType]:
-        return db.query(self.model).filter(self.model.id == id).first()
+    def get(
+        self,
+        db: Session,
+        id: Any,
+        *,
+        options: Sequence[Any] = (),
+        columns: Optional[Sequence[str]] = None,
+        account_id: Optional[int] = None,
+    ) -> Optional[ModelType]:
+        return db.scalars(self._get_statement(id, options, columns, account_id)).first()
 
-    def get_or_404(self, db: Session, id: Any, detail: Optional[str] = None) -> ModelType:
-        obj = self.get(db, id)
+    def get_or_404(
+        self,
+        db: Session,
+        id: Any,
+        detail: Optional[str] = None,
+        *,
+        options: Sequence[Any] = (),
+        columns: Optional[Sequence[str]] = None,
+        account_id: Optional[int] = None,
+    ) -> ModelType:
+        obj = self.get(db, id, options=options, columns=columns, account_id=account_id)
         if not obj:
             raise NotFoundException(detail=detail or f"{self.model.__name__} not found")
         return obj
 
+    def get_snapshot(self, db: Session, id: Any, *, account_id: Optional[int] = None) -> Optional[Tuple]:
+        """Read-only copy of a row as a namedtuple, served from the cache when it is enabled.
+
+        Only reads from the primary fill the cache, so a lagging replica can't
+        put back a row a write has just invalidated.
+        """
+        cache = self.cache
+        if cache is None:
+            row = db.execute(self._snapshot_statement(id)).first()
+            return self._scoped_snapshot(row, account_id)
+        values = cache.get(id)
+        if values is not MISSING:
+            return self._scoped_snapshot(values, account_id)
+        generation = cache.generation
+        row = db.execute(self._snapshot_statement(id)).first()
+        if row is None:
+            return None
+        if not self._reads_replica(db):
+            cache.set(id, tuple(row), generation)
+        return self._scoped_snapshot(row, account_id)
+
+    def get_snapshot_or_404(
+        self, db: Session, id: Any, detail: Optional[str] = None, *, account_id: Optional[int] = None
+    ) -> Tuple:
+        snapshot = self.get_snapshot(db, id, account_id=account_id)
+        if snapshot is None:
+            raise NotFoundException(detail=detail or f"{self.model.__name__} not found")
+        return snapshot
+
     def get_multi(
-        self, db: Session, *, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        options: Sequence[Any] = (),
+        columns: Optional[Sequence[str]] = None,
+        account_id: Optional[int] = None,
     ) -> List[ModelType]:
-        return db.query(self.model).offset(skip).limit(limit).all()
+        return list(db.scalars(self._multi_statement(skip, limit, options, columns, account_id)))
+
+    def get_page(
+        self,
+        db: Session,
+        *,
+        size: int = 100,
+        after: Optional[str] = None,
+        before: Optional[str] = None,
+        sort: Optional[str] = None,
+        filters: Optional[Dict[str, str]] = None,
+        options: Sequence[Any] = (),
+        columns: Optional[Sequence[str]] = None,
+        account_id: Optional[int] = None,
+    ) -> Page[ModelType]:
+        """Fetch one keyset page ordered by `sort` (plus `id`), starting after/before a cursor.
+
+        With an `account_id` only that account's rows are listed, by default in
+        `account_sort` order.
+        """
+        stmt, keys = self._page_statement(
+            size, after, before, sort, filters or {}, db.get_bind().dialect.name, options, columns, account_id
+        )
+        rows = list(db.scalars(stmt))
+        return self._build_page(rows, keys, size, after, before)
+
+    def stream(
+        self, db: Session, *, columns: Sequence[str], batch_size: int = 1000, account_id: Optional[int] = None
+    ) -> Iterator[Sequence[Row]]:
+        """Yield batches of `columns` rows for the whole table (or one account's), read through a server-side cursor"""
+        result = db.execute(self._stream_statement(columns, batch_size, account_id))
+        yield from result.partitions()
 
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
-        obj_in_data = jsonable_encoder(obj_in)
-        db_obj = self.model(**obj_in_data)
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
+        """Insert a row with one INSERT ... RETURNING and a commit"""
+        return self._insert(db, obj_in.model_dump())
 
     def update(
         self,
         db: Session,
         *,
-        db_obj: ModelType,
-        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+        id: Any,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]],
+        account_id: Optional[int] = None,
     ) -> ModelType:
-        obj_data = jsonable_encoder(db_obj)
-        if isinstance(obj_in, dict):
-            update_data = obj_in
+        """Write the set fields of `obj_in` with one UPDATE ... RETURNING and a commit.
+
+        The UPDATE is scoped like get_or_404(), so a row of another account or
+        one in the trash is a 404 without being read first.
+        """
+        values = self._update_values(obj_in)
+        if not values or not self._returning(db, "update"):
+            db_obj = self.get_or_404(db, id, account_id=account_id)
+            if not values:
+                return db_obj
+            for key, value in values.items():
+                setattr(db_obj, key, value)
+            db.commit()
+            self._invalidate(db_obj.id)
+            db.refresh(db_obj)
+            return db_obj
+        db_obj = db.scalars(self._update_statement(id, values, account_id)).first()
+        return self._commit_returned(db, db_obj)
+
+    def remove(self, db: Session, *, id: int, account_id: Optional[int] = None) -> ModelType:
+        """Trash the row (an UPDATE of deleted_at) or, for models without soft delete, DELETE it"""
+        if self.soft_delete and self._returning(db, "update"):
+            obj = db.scalars(self._trash_statement(id, account_id)).first()
+            return self._commit_returned(db, obj)
+        obj = self.get_or_404(db, id, account_id=account_id)
+        if self.soft_delete:
+            obj.deleted_at = utcnow()
+            db.commit()
+            self._invalidate(id)
+            db.refresh(obj)
         else:
-            update_data = obj_in.model_dump(exclude_unset=True)
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
-        db.add(db_obj)
+            db.delete(obj)
+            db.commit()
+            self._invalidate(id)
+        return obj
+
+    def restore(self, db: Session, *, id: int, account_id: Optional[int] = None) -> ModelType:
+        """Bring a trashed row back; restoring a live row is a no-op"""
+        obj = db.scalars(self._trashed_statement(id, account_id)).first()
+        if not obj:
+            raise NotFoundException(detail=f"{self.model.__name__} not found")
+        if obj.deleted_at is not None:
+            obj.deleted_at = None
+            db.commit()
+            self._invalidate(id)
+            db.refresh(obj)
+        return obj
+
+    def existing_ids(self, db: Session, ids: Sequence[int], account_id: Optional[int] = None) -> List[int]:
+        stmt = select(self.model.id).where(self.model.id.in_(ids))
+        return list(db.scalars(self._scope(stmt, account_id)))
+
+    def create_many(
+        self, db: Session, *, values: Sequence[Dict[str, Any]], account_id: Optional[int] = None
+    ) -> List[Row]:
+        """Insert a batch with one executemany INSERT ... RETURNING and a single commit.
+
+        With an `account_id`, every row goes to that account whatever the items
+        say. Returns plain rows in input order; they are not tracked by the
+        session, so the commit doesn't expire them.
+        """
+        stmt = insert(self.model).returning(*self.model.__table__.columns, sort_by_parameter_order=True)
+        with self._batch(db):
+            rows = db.execute(stmt, self._batch_values(values, account_id)).all()
+        return rows
+
+    def update_many(
+        self, db: Session, *, values: Sequence[Dict[str, Any]], account_id: Optional[int] = None
+    ) -> List[Row]:
+        """Update a batch by primary key with one executemany UPDATE and a single commit.
+
+        Every item must carry its `id`; rows are returned in input order. With an
+        `account_id`, only that account's rows are written and none can be moved
+        to another account.
+        """
+        ids = [item["id"] for item in values]
+        # The rows are read back below rather than synchronized in the session,
+        # which SQLAlchemy can't do for a bulk UPDATE with extra WHERE criteria.
+        stmt = self._scope(update(self.model), account_id).execution_options(synchronize_session=None)
+        with self._batch(db):
+            db.execute(stmt, self._batch_values(values, account_id))
+            stmt = select(*self.model.__table__.columns).where(self.model.id.in_(ids))
+            rows = {row.id: row for row in db.execute(self._scope(stmt, account_id))}
+        self._invalidate(*ids)
+        return [rows[item_id] for item_id in ids if item_id in rows]
+
+    def remove_many(self, db: Session, *, ids: Sequence[int], account_id: Optional[int] = None) -> int:
+        """Trash (or delete) a batch with a single statement WHERE id IN (...) and commit"""
+        if self.soft_delete:
+            stmt = update(self.model).where(self.model.id.in_(ids)).values(deleted_at=utcnow())
+        else:
+            stmt = delete(self.model).where(self.model.id.in_(ids))
+        stmt = self._scope(stmt, account_id)
+        with self._batch(db):
+            result = db.execute(stmt.execution_options(synchronize_session=False))
+        self._invalidate(*ids)
+        return result.rowcount
+
+    # Async counterparts of the reads, used by the GET routes when
+    # settings.DATABASE_ASYNC is enabled. They run the same statements as the
+    # sync methods above on an AsyncSession; writes stay on the sync endpoints.
+
+    async def aget(
+        self,
+        db: AsyncSession,
+        id: Any,
+        *,
+        options: Sequence[Any] = (),
+        columns: Optional[Sequence[str]] = None,
+        account_id: Optional[int] = None,
+    ) -> Optional[ModelType]:
+        return (await db.scalars(self._get_statement(id, options, columns, account_id))).first()
+
+    async def aget_or_404(
+        self,
+        db: AsyncSession,
+        id: Any,
+        detail: Optional[str] = None,
+        *,
+        options: Sequence[Any] = (),
+        columns: Optional[Sequence[str]] = None,
+        account_id: Optional[int] = None,
+    ) -> ModelType:
+        obj = await self.aget(db, id, options=options, columns=columns, account_id=account_id)
+        if not obj:
+            raise NotFoundException(detail=detail or f"{self.model.__name__} not found")
+        return obj
+
+    async def aget_snapshot(
+        self, db: AsyncSession, id: Any, *, account_id: Optional[int] = None
+    ) -> Optional[Tuple]:
+        cache = self.cache
+        if cache is None:
+            row = (await db.execute(self._snapshot_statement(id))).first()
+            return self._scoped_snapshot(row, account_id)
+        values = cache.get(id)
+        if values is not MISSING:
+            return self._scoped_snapshot(values, account_id)
+        generation = cache.generation
+        row = (await db.execute(self._snapshot_statement(id))).first()
+        if row is None:
+            return None
+        if not self._reads_replica(db):
+            cache.set(id, tuple(row), generation)
+        return self._scoped_snapshot(row, account_id)
+
+    async def aget_snapshot_or_404(
+        self, db: AsyncSession, id: Any, detail: Optional[str] = None, *, account_id: Optional[int] = None
+    ) -> Tuple:
+        snapshot = await self.aget_snapshot(db, id, account_id=account_id)
+        if snapshot is None:
+            raise NotFoundException(detail=detail or f"{self.model.__name__} not found")
+        return snapshot
+
+    async def aget_page(
+        self,
+        db: AsyncSession,
+        *,
+        size: int = 100,
+        after: Optional[str] = None,
+        before: Optional[str] = None,
+        sort: Optional[str] = None,
+        filters: Optional[Dict[str, str]] = None,
+        options: Sequence[Any] = (),
+        columns: Optional[Sequence[str]] = None,
+        account_id: Optional[int] = None,
+    ) -> Page[ModelType]:
+        stmt, keys = self._page_statement(
+            size, after, before, sort, filters or {}, db.get_bind().dialect.name, options, columns, account_id
+        )
+        rows = list(await db.scalars(stmt))
+        return self._build_page(rows, keys, size, after, before)
+
+    async def astream(
+        self, db: AsyncSession, *, columns: Sequence[str], batch_size: int = 1000, account_id: Optional[int] = None
+    ) -> AsyncIterator[Sequence[Row]]:
+        result = await db.stream(self._stream_statement(columns, batch_size, account_id))
+        async for rows in result.partitions():
+            yield rows
+
+    def _insert(self, db: Session, values: Dict[str, Any]) -> ModelType:
+        if not self._returning(db, "insert"):
+            db_obj = self.model(**values)
+            db.add(db_obj)
+            db.commit()
+            self._invalidate(db_obj.id)
+            db.refresh(db_obj)
+            return db_obj
+        db_obj = db.scalars(insert(self.model).values(**values).returning(self.model)).one()
+        return self._commit_returned(db, db_obj)
+
+    def _commit_returned(self, db: Session, db_obj: Optional[ModelType]) -> ModelType:
+        """Commit a row loaded by RETURNING, keeping its loaded state.
+
+        The object is detached first: the commit would otherwise expire it and
+        the next attribute access would SELECT the row again.
+        """
+        if db_obj is None:
+            db.rollback()
+            raise NotFoundException(detail=f"{self.model.__name__} not found")
+        db.expunge(db_obj)
         db.commit()
-        db.refresh(db_obj)
+        self._invalidate(db_obj.id)
         return db_obj
 
-    def remove(self, db: Session, *, id: int) -> ModelType:
-        obj = self.get_or_404(db, id)
-        db.delete(obj)
-        db.commit()
-        return obj
+    @staticmethod
+    def _returning(db: Union[Session, AsyncSession], kind: str) -> bool:
+        """Whether the dialect supports RETURNING on `kind` ("insert" or "update") statements"""
+        return getattr(db.get_bind().dialect, f"{kind}_returning")
+
+    def _update_values(self, obj_in: Union[UpdateSchemaType, Dict[str, Any]]) -> Dict[str, Any]:
+        # Derived columns are filled in first; other keys that aren't columns are ignored.
+        update_data = dict(obj_in) if isinstance(obj_in, dict) else obj_in.model_dump(exclude_unset=True)
+        return {key: value for key, value in self._prepare_values(update_data).items() if key in self.column_keys}
+
+    def _update_statement(self, id: Any, values: Dict[str, Any], account_id: Optional[int]) -> Any:
+        stmt = update(self.model).where(self.model.id == id)
+        if self.soft_delete:
+            stmt = stmt.where(self.model.deleted_at.is_(None))
+        return self._scope(stmt, account_id).values(**values).returning(self.model)
+
+    def _trash_statement(self, id: Any, account_id: Optional[int]) -> Any:
+        # Only a live row is trashed, matching get_or_404's 404 for one already in the trash.
+        stmt = update(self.model).where(self.model.id == id, self.model.deleted_at.is_(None))
+        return self._scope(stmt, account_id).values(deleted_at=utcnow()).returning(self.model)
+
+    def _prepare_values(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        """Turn validated schema values into column values; overridden for derived columns"""
+        return values
+
+    def _batch_values(self, values: Sequence[Dict[str, Any]], account_id: Optional[int]) -> List[Dict[str, Any]]:
+        if account_id is None or self.account_column is None:
+            return [self._prepare_values(dict(item)) for item in values]
+        return [self._prepare_values({**item, self.account_key: account_id}) for item in values]
+
+    def _invalidate(self, *ids: Any) -> None:
+        """Drop cached snapshots of rows that were just written; call after the commit"""
+        cache = self.cache
+        if cache is not None:
+            cache.invalidate(*ids)
+
+    @contextmanager
+    def _batch(self, db: Session) -> Iterator[None]:
+        """Commit a batch write once, turning constraint violations into a 400"""
+        try:
+            yield
+            db.commit()
+        except IntegrityError as exc:
+            db.rollback()
+            raise ValidationException(detail=str(exc.orig), code="constraint_violation")
+
+    @staticmethod
+    def _reads_replica(db: Union[Session, AsyncSession]) -> bool:
+        """Whether `db` reads from a replica, which may lag a write that has already invalidated the cache"""
+        return getattr(getattr(db, "sync_session", db), "replica", None) is not None
+
+    def _scope(self, stmt: Any, account_id: Optional[int]) -> Any:
+        """Restrict `stmt` to the rows of one account; without an `account_id` it is unscoped"""
+        if account_id is None or self.account_column is None:
+            return stmt
+        return stmt.where(self.account_column == account_id)
+
+    def _scoped_snapshot(self, values: Optional[Sequence[Any]], account_id: Optional[int]) -> Optional[Tuple]:
+        # Snapshots are cached by id alone, so the account is checked on the copy.
+        if values is None:
+            return None
+        snapshot = self.snapshot_type._make(values)
+        if account_id is None or self.account_column is None:
+            return snapshot
+        return snapshot if getattr(snapshot, self.account_key) == account_id else None
+
+    def _snapshot_statement(self, id: Any) -> Select:
+        # Selecting mapped attributes (not table columns) keeps the soft-delete criterion.
+        return select(*[getattr(self.model, key) for key in self.snapshot_type._fields]).where(self.model.id == id)
+
+    def _trashed_statement(self, id: Any, account_id: Optional[int]) -> Select:
+        return include_trashed(self._scope(select(self.model).where(self.model.id == id), account_id))
+
+    def _get_statement(
+        self, id: Any, options: Sequence[Any], columns: Optional[Sequence[str]], account_id: Optional[int]
+    ) -> Select:
+        stmt = select(self.model).options(*self._load_options(options, columns)).where(self.model.id == id)
+        return self._scope(stmt, account_id)
+
+    def _multi_statement(
+        self,
+        skip: int,
+        limit: int,
+        options: Sequence[Any],
+        columns: Optional[Sequence[str]],
+        account_id: Optional[int],
+    ) -> Select:
+        stmt = self._scope(select(self.model).options(*self._load_options(options, columns)), account_id)
+        return stmt.order_by(self.model.id).offset(skip).limit(limit)
+
+    def _stream_statement(self, columns: Sequence[str], batch_size: int, account_id: Optional[int]) -> Select:
+        # yield_per turns on stream_results, so rows arrive in batches instead of
+        # being buffered in full by the driver.
+        stmt = self._scope(select(*[getattr(self.model, name) for name in columns]), account_id)
+        return stmt.order_by(self.model.id).execution_options(yield_per=batch_size)
+
+    def _page_statement(
+        self,
+        size: int,
+        after: Optional[str],
+        before: Optional[str],
+        sort: Optional[str],
+        filters: Dict[str, str],
+        dialect_name: str,
+        options: Sequence[Any],
+        columns: Optional[Sequence[str]],
+        account_id: Optional[int],
+    ) -> Tuple[Select, List[SortKey]]:
+        scoped = account_id is not None and self.account_column is not None
+        keys = parse_sort(sort, self.sortable, self.account_sort if scoped else self.default_sort)
+        sort_columns = [getattr(self.model, column) for column, _ in keys]
+        descending = [desc for _, desc in keys]
+        backwards = before is not None
+        cursor = before if backwards else after
+
+        if columns is not None:
+            # The cursor is built from the sort keys, so they must be loaded too.
+            columns = list(columns) + [column for column, _ in keys]
+        stmt = select(self.model).options(*self._load_options(options, columns))
+        stmt = self._apply_filters(self._scope(stmt, account_id), filters, dialect_name)
+        if cursor:
+            values = decode_cursor(cursor, keys, sort_columns)
+            stmt = stmt.where(keyset_clause(sort_columns, values, descending, backwards))
+        stmt = stmt.order_by(*[
+            column.desc() if desc != backwards else column.asc()
+            for column, desc in zip(sort_columns, descending)
+        ])
+        # One extra row tells us whether another page exists without a COUNT(*).
+        return stmt.limit(size + 1), keys
+
+    @staticmethod
+    def _build_page(
+        rows: List[ModelType],
+        keys: List[SortKey],
+        size: int,
+        after: Optional[str],
+        before: Optional[str],
+    ) -> Page[ModelType]:
+        backwards = before is not None
+        has_more = len(rows) > size
+        rows = rows[:size]
+        if backwards:
+            rows.reverse()
+
+        has_next = has_more or backwards
+        has_prev = has_more if backwards else bool(after)
+        page = Page(items=rows)
+        if rows and has_next:
+            page.next_cursor = encode_cursor(rows[-1], keys)
+        if rows and has_prev:
+            page.prev_cursor = encode_cursor(rows[0], keys)
+        return page
+
+    def _apply_filters(self, stmt: Select, filters: Dict[str, str], dialect_name: str) -> Select:
+        stmt = stmt.where(*self._filter_clauses(filters, dialect_name))
+        if filters.get("trashed"):
+            stmt = include_trashed(stmt)
+        return stmt
+
+    def _filter_clauses(self, filters: Dict[str, str], dialect_name: str) -> List[ColumnElement]:
+        """Translate parsed `filter[...]` parameters into WHERE clauses"""
+        unknown = [name for name in filters if name not in self.filterable]
+        if unknown:
+            raise ValidationException(
+                detail=f"Unsupported filter '{unknown[0]}'",
+                code="invalid_filter",
+                meta={"allowed": sorted(self.filterable)},
+            )
+
+        clauses = []
+        # Trashed rows are already excluded by the global criterion in
+        # app.db.soft_delete; "with"/"only" lift it (see _page_statement).
+        trashed = filters.get("trashed")
+        if trashed == "only":
+            clauses.append(self.model.deleted_at.is_not(None))
+        elif trashed not in (None, "with"):
+            raise ValidationException(
+                detail="filter[trashed] must be 'with' or 'only'", code="invalid_filter"
+            )
+        for name, value in filters.items():
+            if name == "search":
+                term = value.strip()
+                if term:
+                    clauses.append(search_clause(self.model, self.model.search_columns, term, dialect_name))
+            elif name != "trashed":
+                clauses.append(getattr(self.model, name) == self._filter_value(name, value))
+        return clauses
+
+    def _filter_value(self, name: str, value: str) -> Any:
+        column = getattr(self.model, name)
+        try:
+            return column.type.python_type(value)
+        except (TypeError, ValueError):
+            raise ValidationException(detail=f"Invalid value for filter[{name}]", code="invalid_filter")
+
+    def _load_options(self, options: Sequence[Any], columns: Optional[Sequence[str]]) -> List[Any]:
+        """Combine loader options with a `load_only` restricting the SELECT list to `columns`"""
+        if columns is None:
+            return list(options)
+        attrs = [getattr(self.model, name) for name in dict.fromkeys(columns)]
+        return [load_only(*attrs), *options]
@@ -3,6 +3,9 @@ from app.models.account import Account
 from app.schemas.schemas import AccountCreate, Account as AccountSchema
 
 class CRUDAccount(CRUDBase[Account, AccountCreate, AccountSchema]):
-    pass
+    sortable = ("name", "created_at", "updated_at")
+    # A user's account is the only one they can read.
+    account_key = "id"
+    cache_snapshots = True
 
 account = CRUDAccount(Account)
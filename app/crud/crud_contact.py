@@ -3,6 +3,10 @@ from app.models.contact import Contact
 from app.schemas.schemas import ContactCreate, Contact as ContactSchema
 
 class CRUDContact(CRUDBase[Contact, ContactCreate, ContactSchema]):
-    pass
+    sortable = ("first_name", "last_name", "created_at", "updated_at")
+    filterable = ("search", "organization_id", "trashed")
+    # Backed by ix_contacts_account_id_last_name_first_name_id_not_deleted.
+    account_sort = ("last_name", "first_name")
+    cache_snapshots = True
 
 contact = CRUDContact(Contact)
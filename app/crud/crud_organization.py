@@ -3,6 +3,10 @@ from app.models.organization import Organization
 from app.schemas.schemas import OrganizationCreate, Organization as OrganizationSchema
 
 class CRUDOrganization(CRUDBase[Organization, OrganizationCreate, OrganizationSchema]):
-    pass
+    sortable = ("name", "created_at", "updated_at")
+    filterable = ("search", "trashed")
+    # Backed by ix_organizations_account_id_name_id_not_deleted.
+    account_sort = ("name",)
+    cache_snapshots = True
 
 organization = CRUDOrganization(Organization)
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Any, Dict, Optional
 from sqlalchemy.orm import Session
 
 from app.crud.base import CRUDBase
@@ -7,21 +7,31 @@ from app.schemas.schemas import UserCreate, User as UserSchema
 from app.core.security import get_password_hash
 
 class CRUDUser(CRUDBase[User, UserCreate, UserSchema]):
+    sortable = ("first_name", "last_name", "email", "created_at", "updated_at")
+
     def get_by_email(self, db: Session, *, email: str) -> Optional[User]:
         return db.query(User).filter(User.email == email).first()
 
-    def create(self, db: Session, *, obj_in: UserCreate) -> User:
-        db_obj = User(
-            email=obj_in.email,
-            encrypted_password=get_password_hash(obj_in.password),
-            first_name=obj_in.first_name,
-            last_name=obj_in.last_name,
-            account_id=obj_in.account_id,
-            owner=obj_in.owner
-        )
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
+    def create(self, db: Session, *, obj_in: UserCreate, encrypted_password: Optional[str] = None) -> User:
+        """Insert a user; pass `encrypted_password` when the hash was computed off-thread already"""
+        return self._insert(db, self._values(obj_in, encrypted_password))
+
+    def _prepare_values(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        # The users endpoints hash on the password pool beforehand;
+        # this is the fallback for callers that pass plaintext.
+        if "password" in values:
+            values["encrypted_password"] = get_password_hash(values.pop("password"))
+        return values
+
+    @staticmethod
+    def _values(obj_in: UserCreate, encrypted_password: Optional[str] = None) -> Dict[str, Any]:
+        return {
+            "email": obj_in.email,
+            "encrypted_password": encrypted_password or get_password_hash(obj_in.password),
+            "first_name": obj_in.first_name,
+            "last_name": obj_in.last_name,
+            "account_id": obj_in.account_id,
+            "owner": obj_in.owner,
+        }
 
 user = CRUDUser(User)
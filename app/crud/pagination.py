@@ -0,0 +1,113 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.exceptions import ValidationException
+
+T = TypeVar("T")
+
+# A sort key is a column name plus a "descending" flag, e.g. ("last_name", False).
+SortKey = Tuple[str, bool]
+
+
+@dataclass
+class Page(Generic[T]):
+    """One keyset page of results plus the cursors around it"""
+    items: List[T] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
+def parse_sort(sort: Optional[str], allowed: Sequence[str], default: Sequence[str]) -> List[SortKey]:
+    """Parse a JSON:API `sort` string (e.g. "last_name,-created_at") into sort keys.
+
+    `id` is always appended as the final tie-breaker so the ordering is total.
+    """
+    fields = [f.strip() for f in sort.split(",") if f.strip()] if sort else list(default)
+    keys: List[SortKey] = []
+    for name in fields:
+        descending = name.startswith("-")
+        column = name[1:] if descending else name
+        if column not in allowed and column != "id":
+            raise ValidationException(
+                detail=f"Unsupported sort field '{column}'",
+                code="invalid_sort",
+                meta={"allowed": sorted(set(allowed) | {"id"})},
+            )
+        keys.append((column, descending))
+    if not any(column == "id" for column, _ in keys):
+        keys.append(("id", keys[-1][1] if keys else False))
+    return keys
+
+
+def encode_cursor(obj: Any, keys: Sequence[SortKey]) -> str:
+    """Build an opaque cursor from the sort-key values of a row"""
+    values = []
+    for column, _ in keys:
+        value = getattr(obj, column)
+        if isinstance(value, (datetime, date)):
+            value = value.isoformat()
+        values.append(value)
+    payload = json.dumps({"k": [column for column, _ in keys], "v": values}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence[SortKey], columns: Sequence[Any]) -> List[Any]:
+    """Decode a cursor produced by `encode_cursor` for the same sort keys"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        names, values = payload["k"], payload["v"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise ValidationException(detail="Invalid page cursor", code="invalid_cursor")
+
+    if names != [column for column, _ in keys] or len(values) != len(columns):
+        raise ValidationException(
+            detail="Page cursor does not match the requested sort order",
+            code="invalid_cursor",
+        )
+
+    decoded = []
+    for column, value in zip(columns, values):
+        python_type = _python_type(column)
+        if value is not None and python_type in (datetime, date):
+            try:
+                value = python_type.fromisoformat(value)
+            except (TypeError, ValueError):
+                raise ValidationException(detail="Invalid page cursor", code="invalid_cursor")
+        decoded.append(value)
+    return decoded
+
+
+def keyset_clause(
+    columns: Sequence[Any], values: Sequence[Any], descending: Sequence[bool], backwards: bool = False
+) -> ColumnElement:
+    """Return the predicate selecting rows strictly after (or before) `values`.
+
+    When every key sorts in the same direction a row-value comparison is used,
+    which databases can answer with a single index range scan.
+    """
+    if len(set(descending)) == 1:
+        ahead = descending[0] != backwards
+        left, right = tuple_(*columns), tuple_(*values)
+        return left < right if ahead else left > right
+
+    clauses = []
+    for i, column in enumerate(columns):
+        ahead = descending[i] != backwards
+        step = column < values[i] if ahead else column > values[i]
+        clauses.append(and_(*[columns[j] == values[j] for j in range(i)], step))
+    return or_(*clauses)
+
+
+def _python_type(column: Any) -> Optional[type]:
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return None
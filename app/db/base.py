@@ -1,3 +1,6 @@
 from sqlalchemy.ext.declarative import declarative_base
 
+from app.db.search import register_trigram_extension
+
 Base = declarative_base()
+register_trigram_extension(Base.metadata)
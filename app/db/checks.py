@@ -0,0 +1,65 @@
+"""Schema checks, run by tests/test_schema.py and by `python -m app.db.checks`, which exits non-zero on failure"""
+import sys
+from typing import List, Sequence
+
+from sqlalchemy import Index, MetaData, Table
+
+from app.db.base import Base
+
+
+def missing_fk_indexes(metadata: MetaData) -> List[str]:
+    """Describe every foreign key whose columns don't lead some full (non-partial) index.
+
+    Without one, loading a relationship or scoping a query by the referencing
+    column scans the whole table, and so does every delete of a parent row.
+    """
+    problems = []
+    for table in metadata.sorted_tables:
+        prefixes = _index_prefixes(table)
+        for fk in table.foreign_key_constraints:
+            columns = [column.name for column in fk.columns]
+            if not any(_covers(prefix, columns) for prefix in prefixes):
+                target = fk.referred_table.name
+                problems.append(f"{table.name}({', '.join(columns)}) -> {target} has no covering index")
+    return problems
+
+
+def _index_prefixes(table: Table) -> List[List[str]]:
+    prefixes = [[column.name for column in table.primary_key.columns]]
+    for constraint in table.constraints:
+        if constraint.__visit_name__ == "unique_constraint":
+            prefixes.append([column.name for column in constraint.columns])
+    for index in table.indexes:
+        if _is_partial(index) or not index.columns:
+            continue
+        prefixes.append([column.name for column in index.columns])
+    for column in table.columns:
+        if column.index or column.unique:
+            prefixes.append([column.name])
+    return prefixes
+
+
+def _is_partial(index: Index) -> bool:
+    return any(
+        value is not None
+        for key, value in index.dialect_kwargs.items()
+        if key.endswith("_where")
+    )
+
+
+def _covers(prefix: Sequence[str], columns: Sequence[str]) -> bool:
+    # The FK columns must be the leading columns of the index, in any order.
+    return sorted(prefix[:len(columns)]) == sorted(columns)
+
+
+def main() -> int:
+    import app.models  # noqa: F401 - register every table on Base.metadata
+
+    problems = missing_fk_indexes(Base.metadata)
+    for problem in problems:
+        print(f"missing index: {problem}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import Settings
+
+logger = logging.getLogger(__name__)
+
+# Saturation warnings are logged at most this often per pool.
+WARNING_INTERVAL_SECONDS = 10.0
+
+
+class PoolStats:
+    """Checkout counters for one connection pool, fed by the instrumented pool classes"""
+
+    def __init__(self, name: str, warn_at: float):
+        self.name = name
+        self.warn_at = warn_at
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self._last_warning = 0.0
+        self._lock = threading.Lock()
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += seconds
+            if seconds > self.wait_seconds_max:
+                self.wait_seconds_max = seconds
+
+    def check_saturation(self, pool: QueuePool) -> None:
+        """Log a warning when the share of connections in use reaches `warn_at`"""
+        saturation = _saturation(pool)
+        if saturation is None or saturation < self.warn_at:
+            return
+        now = time.monotonic()
+        if now - self._last_warning < WARNING_INTERVAL_SECONDS:
+            return
+        self._last_warning = now
+        logger.warning(
+            "db pool %s saturated: in_use=%d capacity=%d overflow=%d timeouts=%d wait_max_ms=%.1f",
+            self.name, pool.checkedout(), _capacity(pool), pool.overflow(),
+            self.timeouts, self.wait_seconds_max * 1000,
+        )
+
+    def snapshot(self, pool: QueuePool) -> Dict[str, Any]:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "name": self.name,
+                "size": pool.size(),
+                "max_overflow": pool._max_overflow,
+                "in_use": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "saturation": _saturation(pool),
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_total": round(self.wait_seconds_total * 1000, 3),
+                "wait_ms_avg": round(self.wait_seconds_total * 1000 / attempts, 3) if attempts else 0.0,
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+            }
+
+
+class InstrumentedPoolMixin:
+    """Times every wait for a connection; `_do_get` blocks while the pool is exhausted"""
+
+    def _do_get(self) -> Any:
+        stats = _stats.get(self._orig_logging_name)
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            if stats is not None:
+                stats.record_wait(time.perf_counter() - start, timed_out=True)
+                stats.check_saturation(self)
+            raise
+        if stats is not None:
+            stats.record_wait(time.perf_counter() - start)
+        return conn
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+_stats: Dict[str, PoolStats] = {}
+_pools: Dict[str, Engine] = {}
+
+
+def engine_options(settings: Settings, url: str, name: str, is_async: bool = False) -> Dict[str, Any]:
+    """create_engine keyword arguments for a sized, instrumented pool named `name`.
+
+    In-memory SQLite keeps SQLAlchemy's default single-connection pool.
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": InstrumentedAsyncAdaptedQueuePool if is_async else InstrumentedQueuePool,
+        "pool_logging_name": name,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def instrument(engine: Engine, name: str, settings: Settings) -> None:
+    """Register `engine` for pool stats; for async engines pass `async_engine.sync_engine`"""
+    if not isinstance(engine.pool, InstrumentedPoolMixin):
+        return
+    stats = _stats[name] = PoolStats(name, settings.DB_POOL_SATURATION_WARNING)
+    _pools[name] = engine
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection: Any, connection_record: Any, connection_proxy: Any) -> None:
+        stats.check_saturation(engine.pool)
+
+
+def pool_stats() -> List[Dict[str, Any]]:
+    """Current snapshot of every instrumented pool"""
+    return [_stats[name].snapshot(engine.pool) for name, engine in _pools.items()]
+
+
+def _capacity(pool: QueuePool) -> int:
+    return pool.size() + max(pool._max_overflow, 0)
+
+
+def _saturation(pool: QueuePool) -> Optional[float]:
+    # A negative max_overflow means the pool can grow without limit.
+    if pool._max_overflow < 0:
+        return None
+    return round(pool.checkedout() / _capacity(pool), 3)
@@ -0,0 +1,47 @@
+import threading
+from itertools import cycle
+from typing import Any, Optional, Sequence
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import CompoundSelect, Select
+from sqlalchemy.sql.dml import UpdateBase
+
+
+class ReplicaPool:
+    """Engines of the read replicas, handed out in turn.
+
+    For async sessions, pool the replicas' `AsyncEngine.sync_engine`s: that is
+    what an AsyncSession's underlying Session binds to.
+    """
+
+    def __init__(self, engines: Sequence[Engine]):
+        self.engines = list(engines)
+        self._cycle = cycle(self.engines)
+        self._lock = threading.Lock()
+
+    def next(self) -> Engine:
+        with self._lock:
+            return next(self._cycle)
+
+
+class RoutingSession(Session):
+    """Session that reads from `replica`, when given, and writes to the primary it is bound to.
+
+    SELECTs go to the replica. Flushes and INSERT/UPDATE/DELETE statements go to
+    the primary, and so does every read after them, so the session always sees
+    its own writes. Anything else (text(), a bare get_bind()) uses the primary
+    without giving up the replica.
+    """
+
+    def __init__(self, *args: Any, replica: Optional[Engine] = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.replica = replica
+
+    def get_bind(self, mapper: Any = None, *, clause: Any = None, **kwargs: Any) -> Any:
+        if self.replica is not None:
+            if self._flushing or isinstance(clause, UpdateBase):
+                self.replica = None
+            elif isinstance(clause, (Select, CompoundSelect)):
+                return self.replica
+        return super().get_bind(mapper, clause=clause, **kwargs)
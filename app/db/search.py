@@ -0,0 +1,87 @@
+from typing import Any, List, Sequence
+
+from sqlalchemy import DDL, Index, MetaData, Table, column, event, literal_column, or_, select, table
+from sqlalchemy.sql.elements import ColumnElement
+
+# FTS5's trigram tokenizer only indexes terms of at least this many characters.
+MIN_TRIGRAM_LENGTH = 3
+
+
+def register_trigram_extension(metadata: MetaData) -> None:
+    """Enable pg_trgm before `metadata.create_all` builds the trigram indexes"""
+    event.listen(
+        metadata,
+        "before_create",
+        DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+    )
+
+
+def trigram_indexes(table_name: str, columns: Sequence[str]) -> List[Index]:
+    """GIN trigram indexes letting PostgreSQL answer `ILIKE '%term%'` without a sequential scan.
+
+    They are only emitted on PostgreSQL; SQLite gets an FTS5 table instead (see `register_fts`).
+    """
+    return [
+        Index(
+            f"ix_{table_name}_{column}_trgm",
+            column,
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql")
+        for column in columns
+    ]
+
+
+def fts_table_name(table_name: str) -> str:
+    return f"{table_name}_search"
+
+
+def fts_ddl(table_name: str, columns: Sequence[str]) -> List[str]:
+    """SQLite statements for an external-content FTS5 trigram table kept in sync by triggers"""
+    fts = fts_table_name(table_name)
+    names = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{names}, content='{table_name}', content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table_name} BEGIN "
+        f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table_name} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table_name} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values}); END",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def register_fts(table: Table, columns: Sequence[str]) -> None:
+    """Create (and drop) the SQLite FTS5 search table alongside `table` in `metadata.create_all`"""
+    for statement in fts_ddl(table.name, columns):
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    event.listen(
+        table,
+        "before_drop",
+        DDL(f"DROP TABLE IF EXISTS {fts_table_name(table.name)}").execute_if(dialect="sqlite"),
+    )
+
+
+def search_clause(model: Any, columns: Sequence[str], term: str, dialect_name: str) -> ColumnElement:
+    """Case-insensitive substring match of `term` against any of `columns`.
+
+    SQLite looks the term up in the FTS5 table; everywhere else (and for terms
+    too short for trigrams) it is an ILIKE, which PostgreSQL serves from the
+    trigram indexes.
+    """
+    if dialect_name == "sqlite" and len(term) >= MIN_TRIGRAM_LENGTH:
+        fts = table(fts_table_name(model.__tablename__), column("rowid"))
+        phrase = '"' + term.replace('"', '""') + '"'
+        match = literal_column(fts.name).op("MATCH")(phrase)
+        return model.id.in_(select(fts.c.rowid).where(match))
+    pattern = "%" + _escape_like(term) + "%"
+    return or_(*[getattr(model, name).ilike(pattern, escape="\\") for name in columns])
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
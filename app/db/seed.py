@@ -0,0 +1,244 @@
+"""Synthetic data at production scale: `python -m app.db.seed --scale 10 --seed 1`
+
+Rows are a pure function of the seed and their id, generated in fixed blocks
+of CHUNK_SIZE rows, so the same seed and scale always give the same data
+however many workers load it. Every user, organization and contact belongs to
+account `(id - 1) % accounts + 1`, and a contact's organization is always one
+of its own account's.
+
+Each block is one multi-row INSERT (COPY on PostgreSQL with psycopg2) in its
+own transaction. Tables are loaded in stages that respect foreign keys, with
+the blocks of every table in a stage spread over --workers connections.
+"""
+import argparse
+import csv
+import io
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import create_engine, func, insert, select, text
+from sqlalchemy.engine import Engine
+
+from app.db.base import Base
+
+# Rows per table at --scale 1; scale 10 is a million contacts.
+SCALE_ROWS = {"accounts": 100, "users": 500, "organizations": 10000, "contacts": 100000}
+CHUNK_SIZE = 10000
+# Each stage only references tables loaded by earlier stages.
+STAGES = (("accounts",), ("users", "organizations"), ("contacts",))
+EPOCH = datetime(2020, 1, 1)
+# Share of contacts without an organization.
+NO_ORGANIZATION = 0.1
+
+FIRST_NAMES = ("Ada", "Alan", "Grace", "Edsger", "Barbara", "Donald", "Frances", "Ken", "Margaret", "Niklaus",
+               "Dennis", "Radia", "John", "Katherine", "Tim", "Sophie", "Linus", "Hedy", "Guido", "Anita")
+LAST_NAMES = ("Lovelace", "Turing", "Hopper", "Dijkstra", "Liskov", "Knuth", "Allen", "Thompson", "Hamilton",
+              "Wirth", "Ritchie", "Perlman", "McCarthy", "Johnson", "Berners-Lee", "Wilson", "Torvalds", "Lamarr")
+CITIES = ("Springfield", "Riverside", "Franklin", "Greenville", "Bristol", "Clinton", "Fairview", "Salem",
+          "Madison", "Georgetown", "Arlington", "Ashland", "Dover", "Oxford", "Jackson", "Burlington")
+REGIONS = ("CA", "NY", "TX", "WA", "IL", "ON", "BC", "QC")
+COUNTRIES = ("US", "CA")
+COMPANY_SUFFIXES = ("Ltd", "Inc", "LLC", "Group", "Partners", "Holdings")
+
+
+def volumes(scale: float, overrides: Optional[Dict[str, Optional[int]]] = None) -> Dict[str, int]:
+    """Rows per table for `scale`, with explicit counts taking precedence"""
+    counts = {table: max(int(rows * scale), 1) for table, rows in SCALE_ROWS.items()}
+    counts.update({table: count for table, count in (overrides or {}).items() if count is not None})
+    return counts
+
+
+def generate(table: str, counts: Dict[str, int], seed: int, start: int) -> List[Dict[str, Any]]:
+    """The block of `table` rows starting at id `start`"""
+    rng = random.Random(f"{seed}-{table}-{start}")
+    make_row = _GENERATORS[table]
+    return [make_row(rng, n, counts) for n in range(start, min(start + CHUNK_SIZE, counts[table] + 1))]
+
+
+def seed(engine: Engine, counts: Dict[str, int], seed_value: int = 1, workers: int = 4) -> Dict[str, float]:
+    """Load every table and return the rows/sec of each; the tables must be empty"""
+    # SQLite has a single writer, so extra connections would only wait on its lock.
+    if engine.dialect.name == "sqlite":
+        workers = 1
+    rates = {}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="seed") as executor:
+        for stage in STAGES:
+            started = time.perf_counter()
+            futures = {
+                table: [
+                    executor.submit(_load_block, engine, table, counts, seed_value, start)
+                    for start in range(1, counts[table] + 1, CHUNK_SIZE)
+                ]
+                for table in stage
+            }
+            for table, table_futures in futures.items():
+                # A table is done when its last block is, even if others in the stage aren't.
+                finished = max(future.result() for future in table_futures)
+                rates[table] = counts[table] / (finished - started)
+    if engine.dialect.name == "postgresql":
+        _advance_sequences(engine, counts)
+    return rates
+
+
+def _load_block(engine: Engine, table: str, counts: Dict[str, int], seed_value: int, start: int) -> float:
+    """Generate and load one block; returns when it finished"""
+    rows = generate(table, counts, seed_value, start)
+    if engine.dialect.name == "postgresql" and engine.dialect.driver == "psycopg2":
+        _copy(engine, table, rows)
+    else:
+        with engine.begin() as conn:
+            conn.execute(insert(Base.metadata.tables[table]), rows)
+    return time.perf_counter()
+
+
+def _copy(engine: Engine, table: str, rows: Sequence[Dict[str, Any]]) -> None:
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    # Quoting every string tells an empty string ("") apart from NULL (nothing).
+    writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC)
+    writer.writerows([row[column] for column in columns] for row in rows)
+    buffer.seek(0)
+    conn = engine.raw_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _advance_sequences(engine: Engine, counts: Dict[str, int]) -> None:
+    # The ids were explicit, so move each sequence past them.
+    with engine.begin() as conn:
+        for table in counts:
+            conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"COALESCE((SELECT MAX(id) FROM {table}), 1))"
+            ))
+
+
+def _account_of(n: int, counts: Dict[str, int]) -> int:
+    return (n - 1) % counts["accounts"] + 1
+
+
+def _timestamps(rng: random.Random) -> Dict[str, datetime]:
+    created_at = EPOCH + timedelta(seconds=rng.randrange(3 * 365 * 86400))
+    return {"created_at": created_at, "updated_at": created_at + timedelta(seconds=rng.randrange(180 * 86400))}
+
+
+def _address(rng: random.Random) -> Dict[str, Any]:
+    return {
+        "address": f"{rng.randint(1, 9999)} {rng.choice(LAST_NAMES)} Street",
+        "city": rng.choice(CITIES),
+        "region": rng.choice(REGIONS),
+        "country": rng.choice(COUNTRIES),
+        "postal_code": f"{rng.randrange(100000):05d}",
+    }
+
+
+def _account(rng: random.Random, n: int, counts: Dict[str, int]) -> Dict[str, Any]:
+    return {"id": n, "name": f"{rng.choice(LAST_NAMES)} {rng.choice(COMPANY_SUFFIXES)} {n}", **_timestamps(rng)}
+
+
+def _user(rng: random.Random, n: int, counts: Dict[str, int]) -> Dict[str, Any]:
+    first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    return {
+        "id": n,
+        "account_id": _account_of(n, counts),
+        "first_name": first_name,
+        "last_name": last_name,
+        "email": f"{first_name.lower()}.{last_name.lower()}.{n}@example.com",
+        # The first user of every account owns it.
+        "owner": n <= counts["accounts"],
+        # Seeded users can't log in until a password is set.
+        "encrypted_password": "",
+        **_timestamps(rng),
+    }
+
+
+def _organization(rng: random.Random, n: int, counts: Dict[str, int]) -> Dict[str, Any]:
+    name = f"{rng.choice(LAST_NAMES)} {rng.choice(COMPANY_SUFFIXES)}"
+    return {
+        "id": n,
+        "account_id": _account_of(n, counts),
+        "name": name,
+        "email": f"info{n}@example.com",
+        "phone": f"555-{rng.randrange(10000000):07d}",
+        **_address(rng),
+        **_timestamps(rng),
+    }
+
+
+def _contact(rng: random.Random, n: int, counts: Dict[str, int]) -> Dict[str, Any]:
+    account_id = _account_of(n, counts)
+    # Organization ids of this account are account_id, account_id + accounts, ...
+    last = (counts["organizations"] - account_id) // counts["accounts"]
+    organization_id = None
+    if last >= 0 and rng.random() >= NO_ORGANIZATION:
+        organization_id = account_id + rng.randint(0, last) * counts["accounts"]
+    first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    return {
+        "id": n,
+        "account_id": account_id,
+        "organization_id": organization_id,
+        "first_name": first_name,
+        "last_name": last_name,
+        "email": f"{first_name.lower()}.{last_name.lower()}.{n}@example.net",
+        "phone": f"555-{rng.randrange(10000000):07d}",
+        **_address(rng),
+        **_timestamps(rng),
+    }
+
+
+_GENERATORS: Dict[str, Callable[[random.Random, int, Dict[str, int]], Dict[str, Any]]] = {
+    "accounts": _account,
+    "users": _user,
+    "organizations": _organization,
+    "contacts": _contact,
+}
+
+
+def parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, default=1.0, help=f"multiple of {SCALE_ROWS}")
+    parser.add_argument("--seed", type=int, default=1, help="same seed and scale, same data")
+    parser.add_argument("--workers", type=int, default=4, help="connections loading blocks in parallel")
+    parser.add_argument("--database-url", help="defaults to DATABASE_URL")
+    parser.add_argument("--create-tables", action="store_true", help="create missing tables instead of migrating")
+    for table in SCALE_ROWS:
+        parser.add_argument(f"--{table}", type=int, help=f"{table} to create, overriding --scale")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    import app.models  # noqa: F401 - register every table on Base.metadata
+
+    args = parse_args(argv)
+    if args.database_url is None:
+        from app.core.config import settings
+        args.database_url = settings.DATABASE_URL
+    engine = create_engine(args.database_url, pool_size=args.workers, max_overflow=0)
+    if args.create_tables:
+        Base.metadata.create_all(engine)
+    with engine.connect() as conn:
+        if conn.execute(select(func.count()).select_from(Base.metadata.tables["accounts"])).scalar():
+            print("accounts is not empty; seed an empty database", file=sys.stderr)
+            return 1
+
+    counts = volumes(args.scale, {table: getattr(args, table) for table in SCALE_ROWS})
+    started = time.perf_counter()
+    rates = seed(engine, counts, args.seed, args.workers)
+    elapsed = time.perf_counter() - started
+    for table, count in counts.items():
+        print(f"{table:<14} {count:>10} rows {rates[table]:>10.0f} rows/s")
+    total = sum(counts.values())
+    print(f"{'total':<14} {total:>10} rows {total / elapsed:>10.0f} rows/s in {elapsed:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
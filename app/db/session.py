@@ -1,13 +1,105 @@
+import threading
+from typing import Any, Dict, Optional
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.core.timing import instrument_queries
+from app.db.pool import engine_options, instrument
+from app.db.routing import ReplicaPool, RoutingSession
+from app.db import soft_delete  # noqa: F401 - registers the trashed-row criterion
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def async_database_url(url: str) -> str:
+    """Swap the driver of a sync database URL for its asyncio counterpart"""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for '{parsed.get_backend_name()}'")
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+# Built on first use by __getattr__ below, then plain module attributes.
+_LAZY = ("engine", "SessionLocal", "replicas", "async_engine", "AsyncSessionLocal", "async_replicas")
+_lock = threading.Lock()
+
+def _engine(url: str, name: str) -> Engine:
+    engine = create_engine(url, **engine_options(settings, url, name))
+    instrument(engine, name, settings)
+    if settings.SERVER_TIMING:
+        instrument_queries(engine)
+    return engine
+
+def _async_engine(url: str, name: str) -> AsyncEngine:
+    engine = create_async_engine(url, **engine_options(settings, url, name, is_async=True))
+    instrument(engine.sync_engine, name, settings)
+    if settings.SERVER_TIMING:
+        instrument_queries(engine.sync_engine)
+    return engine
+
+def _build() -> Dict[str, Any]:
+    engine = _engine(settings.DATABASE_URL, "primary")
+    replica_urls = settings.replica_urls
+    built = {
+        "engine": engine,
+        # Sessions read from the replica they are given, see replica().
+        "SessionLocal": sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine),
+        "replicas": ReplicaPool([
+            _engine(url, f"replica-{n}") for n, url in enumerate(replica_urls, 1)
+        ]) if replica_urls else None,
+        "async_engine": None,
+        "AsyncSessionLocal": None,
+        "async_replicas": None,
+    }
+    if settings.DATABASE_ASYNC:
+        async_url = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+        async_engine = _async_engine(async_url, "primary-async")
+        built["async_engine"] = async_engine
+        # Objects are serialized after commit, so keep them loaded instead of
+        # expiring them (an expired attribute can't be lazily refreshed under asyncio).
+        built["AsyncSessionLocal"] = async_sessionmaker(
+            bind=async_engine, sync_session_class=RoutingSession, autoflush=False, expire_on_commit=False
+        )
+        if replica_urls:
+            built["async_replicas"] = ReplicaPool([
+                _async_engine(async_database_url(url), f"replica-{n}-async").sync_engine
+                for n, url in enumerate(replica_urls, 1)
+            ])
+    return built
+
+def __getattr__(name: str) -> Any:
+    """Create the engines when one of them is first used, not when this module is imported"""
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    with _lock:
+        if name not in globals():
+            globals().update(_build())
+    return globals()[name]
+
+def replica(is_async: bool = False) -> Optional[Engine]:
+    """The next read replica for a session to read from, or None without DATABASE_REPLICA_URLS"""
+    pool = __getattr__("async_replicas" if is_async else "replicas")
+    return pool.next() if pool is not None else None
 
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def reset() -> None:
+    """Dispose of the engines; the next use builds them from the current settings"""
+    with _lock:
+        built = {name: globals().pop(name, None) for name in _LAZY}
+    if built["engine"] is not None:
+        built["engine"].dispose()
+    if built["replicas"] is not None:
+        for engine in built["replicas"].engines:
+            engine.dispose()
+    # An async engine's pool is closed by the event loop it ran on; dropping it is enough here.
 
 def get_db():
-    db = SessionLocal()
+    db = __getattr__("SessionLocal")()
     try:
         yield db
     finally:
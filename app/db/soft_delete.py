@@ -0,0 +1,37 @@
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session, with_loader_criteria
+
+from app.models.base import SoftDeleteMixin
+
+# Execution option that lets a statement see trashed rows, e.g.
+# select(Contact).execution_options(include_trashed=True).
+INCLUDE_TRASHED = "include_trashed"
+
+
+def include_trashed(stmt: Any) -> Any:
+    return stmt.execution_options(**{INCLUDE_TRASHED: True})
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _exclude_trashed(state: ORMExecuteState) -> None:
+    """Add `deleted_at IS NULL` for every soft-deletable entity of every ORM SELECT.
+
+    The criterion follows the statement into relationship and eager loads.
+    Refreshes of already-loaded objects (column loads) are left alone so a row
+    can still be reloaded right after it was trashed.
+    """
+    if (
+        state.is_select
+        and not state.is_column_load
+        and not state.is_relationship_load
+        and not state.execution_options.get(INCLUDE_TRASHED, False)
+    ):
+        state.statement = state.statement.options(
+            with_loader_criteria(
+                SoftDeleteMixin,
+                lambda cls: cls.deleted_at.is_(None),
+                include_aliases=True,
+            )
+        )
@@ -1,13 +1,13 @@
-from sqlalchemy import Column, String, BigInteger
+from sqlalchemy import Column, String
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
-from app.models.base import TimestampMixin
+from app.models.base import BigIntegerPK, TimestampMixin
 
 class Account(Base, TimestampMixin):
     __tablename__ = "accounts"
 
-    id = Column(BigInteger, primary_key=True)
+    id = Column(BigIntegerPK, primary_key=True)
     name = Column(String, nullable=False)
 
     users = relationship("User", back_populates="account")
@@ -1,7 +1,27 @@
-from datetime import datetime
-from sqlalchemy import Column, DateTime
-from sqlalchemy.sql import func
+from datetime import datetime, timezone
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, text
+
+# SQLite only auto-increments INTEGER PRIMARY KEY columns, so local databases use INTEGER ids.
+BigIntegerPK = BigInteger().with_variant(Integer, "sqlite")
+
+def not_deleted_index(name: str, *columns: str) -> Index:
+    """Partial index over the rows that aren't soft-deleted, which is all the list endpoints read"""
+    where = text("deleted_at IS NULL")
+    return Index(name, *columns, postgresql_where=where, sqlite_where=where)
+
+def utcnow() -> datetime:
+    """Naive UTC now, for timestamp columns.
+
+    Set in Python rather than with func.now(): SQLite's CURRENT_TIMESTAMP is stored
+    as 'YYYY-MM-DD HH:MM:SS' while bound datetimes are 'YYYY-MM-DD HH:MM:SS.ffffff',
+    and those compare wrongly as strings, e.g. against a page cursor.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
 
 class TimestampMixin:
-    created_at = Column(DateTime, nullable=False, default=func.now())
-    updated_at = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime, nullable=False, default=utcnow)
+    updated_at = Column(DateTime, nullable=False, default=utcnow, onupdate=utcnow)
+
+class SoftDeleteMixin:
+    """Rows are trashed by setting `deleted_at`; see app.db.soft_delete for how reads skip them"""
+    deleted_at = Column(DateTime)
@@ -1,13 +1,27 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, BigInteger
+from sqlalchemy import Column, String, ForeignKey, BigInteger, Index
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
-from app.models.base import TimestampMixin
+from app.db.search import register_fts, trigram_indexes
+from app.models.base import BigIntegerPK, SoftDeleteMixin, TimestampMixin, not_deleted_index
 
-class Contact(Base, TimestampMixin):
+class Contact(Base, TimestampMixin, SoftDeleteMixin):
     __tablename__ = "contacts"
+    # Columns matched by filter[search].
+    search_columns = ("first_name", "last_name", "email", "phone")
+    __table_args__ = (
+        Index("ix_contacts_account_id_id", "account_id", "id"),
+        not_deleted_index("ix_contacts_account_id_id_not_deleted", "account_id", "id"),
+        not_deleted_index(
+            "ix_contacts_account_id_last_name_first_name_id_not_deleted",
+            "account_id", "last_name", "first_name", "id",
+        ),
+        Index("ix_contacts_organization_id", "organization_id"),
+        Index("ix_contacts_updated_at_id", "updated_at", "id"),
+        *trigram_indexes("contacts", search_columns),
+    )
 
-    id = Column(BigInteger, primary_key=True)
+    id = Column(BigIntegerPK, primary_key=True)
     account_id = Column(BigInteger, ForeignKey("accounts.id"), nullable=False)
     organization_id = Column(BigInteger, ForeignKey("organizations.id"))
     first_name = Column(String, nullable=False)
@@ -19,7 +33,8 @@ class Contact(Base, TimestampMixin):
     region = Column(String)
     country = Column(String)
     postal_code = Column(String)
-    deleted_at = Column(DateTime)
 
     account = relationship("Account", back_populates="contacts")
     organization = relationship("Organization", back_populates="contacts")
+
+register_fts(Contact.__table__, Contact.search_columns)
@@ -1,13 +1,23 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, BigInteger
+from sqlalchemy import Column, String, ForeignKey, BigInteger, Index
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
-from app.models.base import TimestampMixin
+from app.db.search import register_fts, trigram_indexes
+from app.models.base import BigIntegerPK, SoftDeleteMixin, TimestampMixin, not_deleted_index
 
-class Organization(Base, TimestampMixin):
+class Organization(Base, TimestampMixin, SoftDeleteMixin):
     __tablename__ = "organizations"
+    # Columns matched by filter[search].
+    search_columns = ("name", "email", "phone")
+    __table_args__ = (
+        Index("ix_organizations_account_id_id", "account_id", "id"),
+        not_deleted_index("ix_organizations_account_id_id_not_deleted", "account_id", "id"),
+        not_deleted_index("ix_organizations_account_id_name_id_not_deleted", "account_id", "name", "id"),
+        Index("ix_organizations_updated_at_id", "updated_at", "id"),
+        *trigram_indexes("organizations", search_columns),
+    )
 
-    id = Column(BigInteger, primary_key=True)
+    id = Column(BigIntegerPK, primary_key=True)
     account_id = Column(BigInteger, ForeignKey("accounts.id"), nullable=False)
     name = Column(String, nullable=False)
     email = Column(String)
@@ -17,7 +27,8 @@ class Organization(Base, TimestampMixin):
     region = Column(String)
     country = Column(String)
     postal_code = Column(String)
-    deleted_at = Column(DateTime)
 
     account = relationship("Account", back_populates="organizations")
     contacts = relationship("Contact", back_populates="organization")
+
+register_fts(Organization.__table__, Organization.search_columns)
@@ -1,19 +1,22 @@
-from sqlalchemy import Column, String, Boolean, ForeignKey, DateTime, BigInteger
+from sqlalchemy import Column, String, Boolean, ForeignKey, DateTime, BigInteger, Index
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
-from app.models.base import TimestampMixin
+from app.models.base import BigIntegerPK, SoftDeleteMixin, TimestampMixin, not_deleted_index
 
-class User(Base, TimestampMixin):
+class User(Base, TimestampMixin, SoftDeleteMixin):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_account_id_id", "account_id", "id"),
+        not_deleted_index("ix_users_account_id_id_not_deleted", "account_id", "id"),
+    )
 
-    id = Column(BigInteger, primary_key=True)
+    id = Column(BigIntegerPK, primary_key=True)
     account_id = Column(BigInteger, ForeignKey("accounts.id"), nullable=False)
     first_name = Column(String, nullable=False)
     last_name = Column(String, nullable=False)
     email = Column(String, nullable=False, unique=True)
     owner = Column(Boolean, nullable=False, default=False)
-    deleted_at = Column(DateTime)
     encrypted_password = Column(String, nullable=False, default="")
     reset_password_token = Column(String, unique=True)
     reset_password_sent_at = Column(DateTime)
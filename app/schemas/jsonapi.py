@@ -14,6 +14,13 @@ class JsonApiAttributes(BaseModel):
     email: Optional[EmailStr] = None
     password: Optional[str] = None
     owner: Optional[bool] = None
+    phone: Optional[str] = None
+    address: Optional[str] = None
+    city: Optional[str] = None
+    region: Optional[str] = None
+    country: Optional[str] = None
+    postal_code: Optional[str] = None
+    organization_id: Optional[int] = None
 
 class JsonApiData(BaseModel):
     type: str
@@ -23,6 +30,10 @@ class JsonApiData(BaseModel):
 class JsonApiRequest(BaseModel):
     data: JsonApiData
 
+class JsonApiBulkRequest(BaseModel):
+    """Batch of resource objects; items are validated one by one so errors can point at them"""
+    data: List[Dict[str, Any]]
+
 class JsonApiResource(BaseModel):
     id: str
     type: str
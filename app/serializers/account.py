@@ -1,9 +1,11 @@
+from app.models.account import Account
 from app.serializers.base import ModelSerializer
 
 class AccountSerializer(ModelSerializer):
     def __init__(self):
         super().__init__(
             type_name="accounts",
+            model=Account,
             attributes=["name", "created_at", "updated_at"],
         )
 
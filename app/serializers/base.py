@@ -1,47 +1,281 @@
-from typing import Any, Dict, List, Optional, Type, Union
-from sqlalchemy.orm import Session
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Type, Union
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm.interfaces import MANYTOONE
+from app.core.exceptions import ValidationException
+from app.core.timing import timed
 from app.schemas.jsonapi import JsonApiResource, create_resource
 
+# Sparse fieldsets requested with `fields[TYPE]=a,b`, keyed by JSON:API type.
+Fieldsets = Dict[str, List[str]]
+
 class ModelSerializer:
     """Base serializer class for converting SQLAlchemy models to JSON:API format"""
     
-    def __init__(self, type_name: str, attributes: List[str], relationships: Optional[Dict[str, str]] = None):
+    def __init__(
+        self,
+        type_name: str,
+        attributes: List[str],
+        relationships: Optional[Dict[str, Union[str, "ModelSerializer"]]] = None,
+        model: Optional[Type[Any]] = None,
+    ):
+        # A relationship maps to its JSON:API type name, or to the serializer of the
+        # related model when it can also be sideloaded with `include=`.
         self.type_name = type_name
         self.attributes = attributes
         self.relationships = relationships or {}
+        self.model = model
+        self._foreign_keys: Dict[Type[Any], Dict[str, str]] = {}
+        self._compiled: Dict[Optional[Tuple[str, ...]], Callable[[Any], Dict[str, Any]]] = {}
 
-    def get_attributes(self, obj: Any) -> Dict[str, Any]:
-        """Extract attributes from model instance"""
+    def get_attributes(self, obj: Any, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """Extract attributes from model instance, limited to `fields` when given"""
         return {
             attr: getattr(obj, attr)
             for attr in self.attributes
-            if hasattr(obj, attr)
+            if (fields is None or attr in fields) and hasattr(obj, attr)
         }
 
-    def get_relationships(self, obj: Any, db: Session) -> Dict[str, Dict[str, Any]]:
-        """Extract relationships from model instance"""
+    def get_fields(self, fieldsets: Optional[Fieldsets]) -> Optional[List[str]]:
+        """Return the validated sparse fieldset for this type, or None for all fields"""
+        if not fieldsets or self.type_name not in fieldsets:
+            return None
+        fields = fieldsets[self.type_name]
+        unknown = [name for name in fields if name not in self.attributes and name not in self.relationships]
+        if unknown:
+            raise ValidationException(
+                detail=f"Unknown fields for {self.type_name}: {', '.join(unknown)}",
+                code="invalid_fields",
+                meta={"allowed": self.attributes + list(self.relationships)},
+            )
+        return fields
+
+    def plan_columns(self, fieldsets: Optional[Fieldsets] = None) -> Optional[List[str]]:
+        """Columns to SELECT for the requested fieldset, or None to load every column.
+
+        Foreign keys are always kept because relationship linkage is built from them,
+        and so is `updated_at`, which conditional GETs derive the ETag from.
+        """
+        fields = self.get_fields(fieldsets)
+        if fields is None:
+            return None
+        column_keys = inspect(self.model).column_attrs.keys()
+        columns = [name for name in fields if name in column_keys]
+        columns += [key for key in self.foreign_keys(self.model).values() if key not in columns]
+        if "updated_at" in column_keys and "updated_at" not in columns:
+            columns.append("updated_at")
+        return columns
+
+    def foreign_keys(self, model: Type[Any]) -> Dict[str, str]:
+        """Map each many-to-one relationship to the local foreign-key attribute holding its id"""
+        keys = self._foreign_keys.get(model)
+        if keys is None:
+            mapper = inspect(model)
+            keys = {}
+            for rel_name in self.relationships:
+                rel = mapper.relationships.get(rel_name)
+                if rel is None or rel.direction is not MANYTOONE or len(rel.local_columns) != 1:
+                    continue
+                column = next(iter(rel.local_columns))
+                keys[rel_name] = mapper.get_property_by_column(column).key
+            self._foreign_keys[model] = keys
+        return keys
+
+    def export_columns(self) -> List[str]:
+        """Flat column list for bulk exports: id, foreign keys, then the serialized attributes"""
+        foreign_keys = list(self.foreign_keys(self.model).values())
+        column_keys = inspect(self.model).column_attrs.keys()
+        return ["id", *foreign_keys, *[name for name in self.attributes if name in column_keys]]
+
+    def get_relationships(
+        self, obj: Any, db: Session, fields: Optional[Sequence[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Extract relationship linkage from model instance.
+
+        Linkage is read from foreign-key columns, so no related row is loaded.
+        Relationships without a local foreign key are only used if already loaded.
+        """
         relationships = {}
-        for rel_name, rel_type in self.relationships.items():
-            if hasattr(obj, rel_name):
+        foreign_keys = self.foreign_keys(self.model or type(obj))
+        state = inspect(obj, raiseerr=False)
+        for rel_name, related in self.relationships.items():
+            if fields is not None and rel_name not in fields:
+                continue
+            rel_type = related if isinstance(related, str) else related.type_name
+            if rel_name in foreign_keys:
+                related_id = getattr(obj, foreign_keys[rel_name])
+            elif state is not None and rel_name not in state.unloaded:
                 related_obj = getattr(obj, rel_name)
-                if related_obj:
-                    relationships[rel_name] = {
-                        "data": {
-                            "type": rel_type,
-                            "id": str(getattr(related_obj, "id"))
-                        }
-                    }
+                related_id = getattr(related_obj, "id", None)
+            else:
+                continue
+            if related_id is not None:
+                relationships[rel_name] = {"type": rel_type, "id": str(related_id)}
         return relationships
 
-    def serialize(self, obj: Any, db: Session) -> JsonApiResource:
+    def plan_loads(self, include: Sequence[str] = (), fieldsets: Optional[Fieldsets] = None) -> List[Any]:
+        """Loader options batch-loading the requested relationships, one SELECT ... IN per relationship.
+
+        Included resources only load the columns of their own sparse fieldset.
+        """
+        options = []
+        for rel_name in include:
+            serializer = self.relationships.get(rel_name)
+            if not isinstance(serializer, ModelSerializer):
+                raise ValidationException(
+                    detail=f"Relationship '{rel_name}' cannot be included for {self.type_name}",
+                    code="invalid_include",
+                    meta={"allowed": self.includable()},
+                )
+            loader = selectinload(getattr(self.model, rel_name))
+            columns = serializer.plan_columns(fieldsets)
+            if columns is not None:
+                loader = loader.load_only(*[getattr(serializer.model, name) for name in columns])
+            options.append(loader)
+        return options
+
+    def includable(self) -> List[str]:
+        """Relationship names that can be requested with `include=`"""
+        return [
+            rel_name for rel_name, related in self.relationships.items()
+            if isinstance(related, ModelSerializer)
+        ]
+
+    def included_objects(self, objects: List[Any], include: Sequence[str]) -> List[Tuple["ModelSerializer", Any]]:
+        """Distinct (serializer, object) pairs a compound document for `objects` would include"""
+        return list(self._included_items(objects, include))
+
+    def serialize_included(
+        self,
+        objects: List[Any],
+        include: Sequence[str],
+        db: Session,
+        fieldsets: Optional[Fieldsets] = None,
+    ) -> Optional[List[JsonApiResource]]:
+        """Serialize the related resources for a compound document, deduplicated by (type, id).
+
+        Relationships are expected to be loaded already, via `plan_loads`.
+        """
+        if not include:
+            return None
+        with timed("serialize"):
+            return [
+                serializer.serialize(item, db, fieldsets)
+                for serializer, item in self._included_items(objects, include)
+            ]
+
+    def _included_items(self, objects: List[Any], include: Sequence[str]) -> Iterator[Tuple["ModelSerializer", Any]]:
+        """Yield each distinct related (serializer, object) pair reachable through `include`"""
+        seen = set()
+        for obj in objects:
+            for rel_name in include:
+                serializer = self.relationships[rel_name]
+                related = getattr(obj, rel_name)
+                for item in related if isinstance(related, list) else [related]:
+                    if item is None:
+                        continue
+                    key = (serializer.type_name, item.id)
+                    if key not in seen:
+                        seen.add(key)
+                        yield serializer, item
+
+    def serialize(self, obj: Any, db: Session, fieldsets: Optional[Fieldsets] = None) -> JsonApiResource:
         """Convert a single model instance to JSON:API format"""
-        return create_resource(
-            type_name=self.type_name,
-            id=obj.id,
-            attributes=self.get_attributes(obj),
-            relationships=self.get_relationships(obj, db)
-        )
-
-    def serialize_many(self, objects: List[Any], db: Session) -> List[JsonApiResource]:
+        with timed("serialize"):
+            fields = self.get_fields(fieldsets)
+            return create_resource(
+                type_name=self.type_name,
+                id=obj.id,
+                attributes=self.get_attributes(obj, fields),
+                relationships=self.get_relationships(obj, db, fields)
+            )
+
+    def serialize_many(
+        self, objects: List[Any], db: Session, fieldsets: Optional[Fieldsets] = None
+    ) -> List[JsonApiResource]:
         """Convert multiple model instances to JSON:API format"""
-        return [self.serialize(obj, db) for obj in objects]
+        with timed("serialize"):
+            return [self.serialize(obj, db, fieldsets) for obj in objects]
+
+    # Fast path: plain dicts shaped exactly like `JsonApiResource.model_dump()`, built by a
+    # per-fieldset function compiled once, so no Pydantic model is created per row.
+
+    def to_dict(self, obj: Any, fieldsets: Optional[Fieldsets] = None) -> Dict[str, Any]:
+        """Convert a single model instance to a JSON:API resource dict"""
+        with timed("serialize"):
+            return self._compile(self.get_fields(fieldsets))(obj)
+
+    def to_dicts(self, objects: List[Any], fieldsets: Optional[Fieldsets] = None) -> List[Dict[str, Any]]:
+        """Convert multiple model instances to JSON:API resource dicts"""
+        with timed("serialize"):
+            build = self._compile(self.get_fields(fieldsets))
+            return [build(obj) for obj in objects]
+
+    def included_dicts(
+        self, objects: List[Any], include: Sequence[str], fieldsets: Optional[Fieldsets] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Dict counterpart of `serialize_included`"""
+        if not include:
+            return None
+        with timed("serialize"):
+            return [serializer.to_dict(item, fieldsets) for serializer, item in self._included_items(objects, include)]
+
+    def _compile(self, fields: Optional[Sequence[str]]) -> Callable[[Any], Dict[str, Any]]:
+        # Keyed by the fieldset in declaration order without repeats, so reordered or
+        # duplicated names from a client share one builder instead of adding another.
+        if fields is not None:
+            fields = tuple(name for name in (*self.attributes, *self.relationships) if name in fields)
+        build = self._compiled.get(fields)
+        if build is not None:
+            return build
+
+        names = [attr for attr in self.attributes if fields is None or attr in fields]
+        if len(names) == 1:
+            single = attrgetter(names[0])
+            get_attributes = lambda obj: {names[0]: single(obj)}
+        elif names:
+            getter = attrgetter(*names)
+            get_attributes = lambda obj: dict(zip(names, getter(obj)))
+        else:
+            get_attributes = lambda obj: {}
+
+        foreign_keys = self.foreign_keys(self.model)
+        linkage = []
+        for rel_name, related in self.relationships.items():
+            if fields is not None and rel_name not in fields:
+                continue
+            if rel_name not in foreign_keys:
+                # Only foreign-key linkage can be compiled; defer to the general path.
+                get_relationships = lambda obj: {
+                    name: {"data": data, "links": None}
+                    for name, data in self.get_relationships(obj, None, fields).items()
+                }
+                break
+            rel_type = related if isinstance(related, str) else related.type_name
+            linkage.append((rel_name, rel_type, attrgetter(foreign_keys[rel_name])))
+        else:
+            def get_relationships(obj: Any) -> Dict[str, Any]:
+                relationships = {}
+                for rel_name, rel_type, get_id in linkage:
+                    related_id = get_id(obj)
+                    if related_id is not None:
+                        relationships[rel_name] = {
+                            "data": {"type": rel_type, "id": str(related_id)},
+                            "links": None,
+                        }
+                return relationships
+
+        type_name = self.type_name
+
+        def build(obj: Any) -> Dict[str, Any]:
+            return {
+                "id": str(obj.id),
+                "type": type_name,
+                "attributes": get_attributes(obj),
+                "relationships": get_relationships(obj) or None,
+                "links": None,
+            }
+
+        self._compiled[fields] = build
+        return build
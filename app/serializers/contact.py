@@ -1,17 +1,21 @@
+from app.models.contact import Contact
 from app.serializers.base import ModelSerializer
+from app.serializers.account import account_serializer
+from app.serializers.organization import organization_serializer
 
 class ContactSerializer(ModelSerializer):
     def __init__(self):
         super().__init__(
             type_name="contacts",
+            model=Contact,
             attributes=[
                 "first_name", "last_name", "email", "phone",
                 "address", "city", "region", "country",
                 "postal_code", "deleted_at", "created_at", "updated_at"
             ],
             relationships={
-                "account": "accounts",
-                "organization": "organizations"
+                "account": account_serializer,
+                "organization": organization_serializer
             }
         )
 
@@ -1,16 +1,19 @@
+from app.models.organization import Organization
 from app.serializers.base import ModelSerializer
+from app.serializers.account import account_serializer
 
 class OrganizationSerializer(ModelSerializer):
     def __init__(self):
         super().__init__(
             type_name="organizations",
+            model=Organization,
             attributes=[
                 "name", "email", "phone", "address", "city",
                 "region", "country", "postal_code", "deleted_at",
                 "created_at", "updated_at"
             ],
             relationships={
-                "account": "accounts"
+                "account": account_serializer
             }
         )
 
@@ -1,9 +1,11 @@
+from app.models import Account, Contact, Organization, User
 from app.serializers.base import ModelSerializer
 
 class AccountSerializer(ModelSerializer):
     def __init__(self):
         super().__init__(
             type_name="accounts",
+            model=Account,
             attributes=["name", "created_at", "updated_at"],
         )
 
@@ -11,6 +13,7 @@ class UserSerializer(ModelSerializer):
     def __init__(self):
         super().__init__(
             type_name="users",
+            model=User,
             attributes=[
                 "first_name", "last_name", "email", "owner",
                 "deleted_at", "created_at", "updated_at"
@@ -24,6 +27,7 @@ class OrganizationSerializer(ModelSerializer):
     def __init__(self):
         super().__init__(
             type_name="organizations",
+            model=Organization,
             attributes=[
                 "name", "email", "phone", "address", "city",
                 "region", "country", "postal_code", "deleted_at",
@@ -38,6 +42,7 @@ class ContactSerializer(ModelSerializer):
     def __init__(self):
         super().__init__(
             type_name="contacts",
+            model=Contact,
             attributes=[
                 "first_name", "last_name", "email", "phone",
                 "address", "city", "region", "country",
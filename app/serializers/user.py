@@ -1,15 +1,18 @@
+from app.models.user import User
 from app.serializers.base import ModelSerializer
+from app.serializers.account import account_serializer
 
 class UserSerializer(ModelSerializer):
     def __init__(self):
         super().__init__(
             type_name="users",
+            model=User,
             attributes=[
                 "first_name", "last_name", "email", "owner",
                 "deleted_at", "created_at", "updated_at"
             ],
             relationships={
-                "account": "accounts"
+                "account": account_serializer
             }
         )
 
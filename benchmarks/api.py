@@ -0,0 +1,319 @@
+"""Latency, throughput, queries and memory of the API hot paths.
+
+Seeds a database, then drives the ASGI app in-process (no sockets) through
+list, get, create, update and delete on accounts, users, organizations and
+contacts, and prints per operation:
+
+    p50/p99   request latency
+    req/s     throughput at the given concurrency
+    queries   SQL statements per request, from the Server-Timing header
+    peak KiB  peak Python allocations while serving one request (tracemalloc,
+              measured in a separate pass so it doesn't skew the latencies)
+
+Users, organizations and contacts are created and updated through their
+/bulk endpoints with one resource per request; the single-resource POST and
+PUT only handle accounts. Deletes remove rows created by the create step,
+so the seeded data stays the same from run to run.
+
+Results can be saved as a baseline and later runs compared against it; a
+comparison exits non-zero when any metric regresses by more than --threshold:
+
+    python benchmarks/api.py --save benchmarks/baseline.json
+    python benchmarks/api.py --compare benchmarks/baseline.json
+    python benchmarks/api.py --accounts 10000 --contacts 1000000 --requests 2000
+
+benchmarks/baseline.json holds a run with the default volumes on SQLite;
+latencies depend on the machine, so record a fresh baseline before comparing.
+
+With --account N every request carries a token for that account's owner, so
+reads are scoped to it and lists use its default order (contacts by name,
+organizations by name), as the UI sees them.
+
+SQLite in a temporary directory is used unless --database-url is given, e.g.
+a scratch PostgreSQL database; tables are created there if missing and only
+seeded while empty, so a large seed can be reused by later runs.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+RESOURCES = ("accounts", "users", "organizations", "contacts")
+OPERATIONS = ("list", "get", "create", "update", "delete")
+# Metrics where a higher value is worse, compared against a baseline.
+LOWER_IS_BETTER = ("p50_ms", "p99_ms", "queries", "peak_kib")
+WARMUP_REQUESTS = 10
+QUERIES = re.compile(r'desc="queries: (\d+)"')
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="database to seed and use; defaults to a temporary SQLite file")
+    parser.add_argument("--accounts", type=int, default=100, help="accounts to seed")
+    parser.add_argument("--users", type=int, default=1000, help="users to seed")
+    parser.add_argument("--organizations", type=int, default=10000, help="organizations to seed")
+    parser.add_argument("--contacts", type=int, default=100000, help="contacts to seed")
+    parser.add_argument("--requests", type=int, default=500, help="requests per operation")
+    parser.add_argument("--concurrency", type=int, default=1, help="requests in flight at once")
+    parser.add_argument("--page-size", type=int, default=25, help="page[size] of list requests")
+    parser.add_argument("--memory-samples", type=int, default=20, help="requests per operation traced for memory")
+    parser.add_argument("--resources", nargs="+", choices=RESOURCES, default=list(RESOURCES))
+    parser.add_argument("--operations", nargs="+", choices=OPERATIONS, default=list(OPERATIONS))
+    parser.add_argument("--account", type=int, help="send a token for this account, scoping the requests to it")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for the data and the ids requested")
+    parser.add_argument("--save", metavar="PATH", help="write the results as JSON, e.g. as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="baseline JSON to diff the results against")
+    parser.add_argument("--threshold", type=float, default=10.0, help="regression tolerance in percent")
+    return parser.parse_args()
+
+
+def seed_database(args: argparse.Namespace) -> None:
+    """Load the requested volumes with app.db.seed, unless contacts are already there"""
+    from sqlalchemy import func, select
+
+    from app.db import session
+    from app.db.base import Base
+    from app.db.seed import seed
+    from app.models import Contact
+
+    engine = session.engine
+    Base.metadata.create_all(engine)
+    with engine.connect() as conn:
+        if conn.execute(select(func.count()).select_from(Contact.__table__)).scalar():
+            print("database already seeded, reusing it")
+            return
+
+    counts = {resource: getattr(args, resource) for resource in RESOURCES}
+    started = time.perf_counter()
+    seed(engine, counts, args.seed)
+    rows = sum(counts.values())
+    elapsed = time.perf_counter() - started
+    print(f"seeded {rows} rows in {elapsed:.1f}s ({rows / elapsed:.0f} rows/s)")
+
+
+def attributes(resource: str, n: int) -> Dict[str, Any]:
+    if resource == "accounts":
+        return {"name": f"Bench account {n}"}
+    if resource == "users":
+        return {"first_name": "Bench", "last_name": f"User{n}", "email": f"bench{n}-{time.time_ns()}@example.com",
+                "password": "correct horse battery staple"}
+    if resource == "organizations":
+        return {"name": f"Bench organization {n}", "city": "Springfield"}
+    return {"first_name": "Bench", "last_name": f"Contact{n}", "city": "Springfield"}
+
+
+class Workload:
+    """Builds the request for the n-th call of each operation on a resource"""
+
+    def __init__(self, args: argparse.Namespace, resource: str):
+        self.args = args
+        self.resource = resource
+        self.rng = random.Random(f"{args.seed}-{resource}")
+        self.seeded = getattr(args, resource)
+        self.account: Optional[int] = args.account
+        self.created: List[int] = []
+
+    def request(self, operation: str, n: int) -> Tuple[str, str, Optional[Dict[str, Any]]]:
+        base = f"/api/v1/{self.resource}/"
+        if operation == "list":
+            return "GET", f"{base}?page[size]={self.args.page_size}", None
+        if operation == "get":
+            return "GET", f"{base}{self.seeded_id()}", None
+        if operation == "create":
+            if self.resource == "accounts":
+                return "POST", base, {"data": {"type": self.resource, "attributes": attributes(self.resource, n)}}
+            return "POST", f"{base}bulk", {"data": [self._resource_object(n)]}
+        if operation == "update":
+            item_id = self.seeded_id()
+            changes = {"name": f"Account {item_id}"} if self.resource == "accounts" else {"city": f"City {n}"}
+            if self.resource == "accounts":
+                return "PUT", f"{base}{item_id}", {"data": {"type": self.resource, "attributes": changes}}
+            return "PUT", f"{base}bulk", {"data": [{"type": self.resource, "id": str(item_id), "attributes": changes}]}
+        return "DELETE", f"{base}{self.created.pop()}", None
+
+    def seeded_id(self) -> int:
+        if self.account is None:
+            return self.rng.randint(1, self.seeded)
+        # The seeder puts row n in account (n - 1) % accounts + 1.
+        accounts = self.args.accounts
+        return self.account + self.rng.randint(0, (self.seeded - self.account) // accounts) * accounts
+
+    def record(self, operation: str, body: Dict[str, Any]) -> None:
+        if operation == "create":
+            data = body["data"]
+            self.created.append(int((data[0] if isinstance(data, list) else data)["id"]))
+
+    def _resource_object(self, n: int) -> Dict[str, Any]:
+        account_id = self.account or self.rng.randint(1, self.args.accounts)
+        return {
+            "type": self.resource,
+            "attributes": attributes(self.resource, n),
+            "relationships": {"account": {"data": {"type": "accounts", "id": str(account_id)}}},
+        }
+
+
+async def run_operation(
+    client: Any, workload: Workload, operation: str, total: int, concurrency: int
+) -> Tuple[List[float], List[int], float]:
+    latencies: List[float] = []
+    queries: List[int] = []
+    remaining = total
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            method, path, body = workload.request(operation, remaining)
+            start = time.perf_counter()
+            response = await client.request(method, path, json=body)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                raise RuntimeError(f"{method} {path} answered {response.status_code}: {response.text[:500]}")
+            match = QUERIES.search(response.headers.get("server-timing", ""))
+            if match:
+                queries.append(int(match.group(1)))
+            workload.record(operation, response.json())
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, queries, time.perf_counter() - started
+
+
+async def peak_memory(client: Any, workload: Workload, operation: str, samples: int) -> float:
+    """Largest peak of traced allocations while serving a single request, in KiB"""
+    peak = 0
+    for n in range(samples):
+        method, path, body = workload.request(operation, n)
+        tracemalloc.start()
+        try:
+            response = await client.request(method, path, json=body)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+        workload.record(operation, response.json())
+    return round(peak / 1024, 1)
+
+
+def percentile(ordered: List[float], share: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * share))]
+
+
+async def main(args: argparse.Namespace) -> Dict[str, Any]:
+    import httpx
+
+    from main import app
+
+    seed_database(args)
+    results: Dict[str, Any] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=auth_headers(args)) as client:
+        for resource in args.resources:
+            workload = Workload(args, resource)
+            for operation in [op for op in OPERATIONS if op in args.operations]:
+                if operation == "delete" and "create" not in args.operations:
+                    print(f"{resource}/delete skipped: it deletes what create made")
+                    continue
+                if operation == "delete":
+                    # Each delete removes a row made by create (the warm-up and memory passes included).
+                    total = min(args.requests, len(workload.created))
+                    samples = min(args.memory_samples, len(workload.created) - total)
+                else:
+                    total, samples = args.requests, args.memory_samples
+                    await run_operation(client, workload, operation, WARMUP_REQUESTS, 1)
+                latencies, queries, elapsed = await run_operation(client, workload, operation, total, args.concurrency)
+                ordered = sorted(latencies)
+                results[f"{resource}/{operation}"] = {
+                    "requests": len(ordered),
+                    "p50_ms": round(statistics.median(ordered) * 1000, 3),
+                    "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+                    "rps": round(len(ordered) / elapsed, 1),
+                    "queries": round(statistics.mean(queries), 2) if queries else None,
+                    "peak_kib": await peak_memory(client, workload, operation, samples) if samples else None,
+                }
+                print(format_result(f"{resource}/{operation}", results[f"{resource}/{operation}"]))
+    return results
+
+
+def auth_headers(args: argparse.Namespace) -> Dict[str, str]:
+    if args.account is None:
+        return {}
+    from types import SimpleNamespace
+
+    from app.core.security import create_access_token
+
+    # The seeder makes user n the owner of account n.
+    owner = SimpleNamespace(id=args.account, account_id=args.account, email="bench@example.com", owner=True)
+    return {"Authorization": f"Bearer {create_access_token(owner)}"}
+
+
+def format_result(name: str, result: Dict[str, Any]) -> str:
+    queries = f"{result['queries']:6.2f}" if result["queries"] is not None else "     -"
+    peak = f"{result['peak_kib']:8.1f}" if result["peak_kib"] is not None else "       -"
+    return (
+        f"{name:<24} p50={result['p50_ms']:8.2f}ms p99={result['p99_ms']:8.2f}ms "
+        f"{result['rps']:8.1f} req/s  queries={queries}  peak={peak} KiB"
+    )
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Print the change of every metric against `baseline`; returns the regressions"""
+    regressions = []
+    for name, result in results.items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:<24} not in the baseline")
+            continue
+        changes = []
+        for metric in (*LOWER_IS_BETTER, "rps"):
+            old, new = before.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old * 100
+            worse = change > threshold if metric in LOWER_IS_BETTER else change < -threshold
+            changes.append(f"{metric} {old:g}->{new:g} ({change:+.1f}%){' !' if worse else ''}")
+            if worse:
+                regressions.append(f"{name} {metric}")
+        print(f"{name:<24} " + ", ".join(changes))
+    return regressions
+
+
+def configure_environment(args: argparse.Namespace) -> None:
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        directory = tempfile.mkdtemp(prefix="pingcrm-bench-")
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    # Query counts come from the Server-Timing header.
+    os.environ["SERVER_TIMING"] = "true"
+    # Creating users would otherwise be dominated by bcrypt; password_hashing.py covers that.
+    os.environ["BCRYPT_ROUNDS"] = "4"
+    # --account signs its token with whatever key the app is configured with.
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    configure_environment(arguments)
+    run_results = asyncio.run(main(arguments))
+    if arguments.save:
+        with open(arguments.save, "w") as f:
+            json.dump({"config": {key: value for key, value in vars(arguments).items()
+                                  if key not in ("save", "compare")},
+                       "results": run_results}, f, indent=2)
+        print(f"results saved to {arguments.save}")
+    if arguments.compare:
+        with open(arguments.compare) as f:
+            failed = compare(run_results, json.load(f), arguments.threshold)
+        if failed:
+            print(f"regressed beyond {arguments.threshold:g}%: {', '.join(failed)}")
+            sys.exit(1)
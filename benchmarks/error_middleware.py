@@ -0,0 +1,130 @@
+"""Requests/sec on a trivial GET with each way of translating errors.
+
+Drives the ASGI app in-process (no sockets) with GET /api/v1/status/cache,
+which touches neither the database nor an error path, so the difference is
+the per-request cost of the middleware itself:
+
+    http  the old `app.middleware("http")` error handler (BaseHTTPMiddleware)
+    asgi  exception handlers plus the pure ASGI ErrorMiddleware, as in main.py
+
+    python benchmarks/error_middleware.py --requests 20000 --concurrency 50
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PATH = "/api/v1/status/cache"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000, help="requests per run")
+    parser.add_argument("--concurrency", type=int, default=50, help="requests in flight at once")
+    parser.add_argument("--runs", type=int, default=3, help="runs per variant; the best is reported")
+    parser.add_argument("--variant", choices=["http", "asgi", "both"], default="both")
+    return parser.parse_args()
+
+
+def http_middleware_app() -> Any:
+    """The app as it was wired before: CORS plus the error handler as an http middleware"""
+    from fastapi import FastAPI, Request
+    from fastapi.middleware.cors import CORSMiddleware
+
+    from app.api.middleware import app_exception_handler, batch_validation_exception_handler, error_response
+    from app.api.v1.api import build_api_router
+    from app.core.config import get_settings
+    from app.core.exceptions import AppException, BatchValidationException
+    from app.schemas.jsonapi import JsonApiError
+
+    async def error_handler(request: Request, call_next: Any) -> Any:
+        try:
+            return await call_next(request)
+        except BatchValidationException as exc:
+            return await batch_validation_exception_handler(request, exc)
+        except AppException as exc:
+            return await app_exception_handler(request, exc)
+        except Exception as exc:
+            return error_response(500, [JsonApiError(status="500", title=str(exc))])
+
+    app = FastAPI()
+    app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_credentials=True,
+                       allow_methods=["*"], allow_headers=["*"])
+    app.middleware("http")(error_handler)
+    app.include_router(build_api_router(get_settings()), prefix="/api/v1")
+    return app
+
+
+def scope() -> Dict[str, Any]:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": PATH,
+        "raw_path": PATH.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+
+
+async def request(app: Any) -> None:
+    statuses: List[int] = []
+
+    async def receive() -> Dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Dict[str, Any]) -> None:
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    await app(scope(), receive, send)
+    if statuses != [200]:
+        raise RuntimeError(f"unexpected response {statuses}")
+
+
+async def requests_per_second(app: Any, total: int, concurrency: int) -> float:
+    remaining = total
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            await request(app)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return total / (time.perf_counter() - started)
+
+
+async def main(args: argparse.Namespace) -> None:
+    from main import app as asgi_app
+
+    variants = {"http": http_middleware_app, "asgi": lambda: asgi_app}
+    names = list(variants) if args.variant == "both" else [args.variant]
+    results = {}
+    for name in names:
+        app = variants[name]()
+        await requests_per_second(app, min(1000, args.requests), args.concurrency)  # warm up
+        results[name] = max(
+            [await requests_per_second(app, args.requests, args.concurrency) for _ in range(args.runs)]
+        )
+        print(f"{name:<5} {results[name]:10.0f} req/s  (GET {PATH}, {args.requests} requests, concurrency {args.concurrency})")
+    if len(results) == 2:
+        print(f"asgi/http: {results['asgi'] / results['http']:.2f}x")
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    directory = tempfile.mkdtemp(prefix="pingcrm-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    asyncio.run(main(arguments))
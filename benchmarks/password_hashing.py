@@ -0,0 +1,129 @@
+"""Request latency while users are being provisioned.
+
+Polls GET /api/v1/contacts/{id} while concurrent POST /api/v1/users/bulk
+requests create users, and prints the poller's latency idle and under load.
+With hashing on the dedicated password pool the two should be close; run
+with --inline to see the old behaviour, where each bcrypt hash held one of
+the request threads:
+
+    python benchmarks/password_hashing.py --threads 8
+    python benchmarks/password_hashing.py --threads 8 --inline
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=160, help="users to create in total")
+    parser.add_argument("--batch", type=int, default=10, help="users per bulk request")
+    parser.add_argument("--concurrency", type=int, default=8, help="bulk requests in flight at once")
+    parser.add_argument("--threads", type=int, default=40, help="size of the request threadpool")
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost (BCRYPT_ROUNDS)")
+    parser.add_argument("--workers", type=int, default=2, help="password pool size (PASSWORD_HASH_WORKERS)")
+    parser.add_argument("--samples", type=int, default=50, help="idle latency samples")
+    parser.add_argument("--inline", action="store_true", help="hash on the request threadpool, as before")
+    return parser.parse_args()
+
+
+def summary(label: str, latencies: List[float]) -> str:
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return (
+        f"{label:<14} n={len(ordered):<5} p50={statistics.median(ordered) * 1000:8.2f}ms "
+        f"p95={p95 * 1000:8.2f}ms max={ordered[-1] * 1000:8.2f}ms"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    import anyio
+    import httpx
+    from fastapi.concurrency import run_in_threadpool
+
+    from app.api.v1.endpoints import users as users_endpoints
+    from app.core.security import get_password_hash
+    from app.db import session
+    from app.db.base import Base
+    from app.models import Account, Contact
+    from main import app
+
+    Base.metadata.create_all(session.engine)
+    with session.SessionLocal() as db:
+        account = Account(name="Benchmark")
+        db.add(account)
+        db.flush()
+        contact = Contact(account_id=account.id, first_name="Ada", last_name="Lovelace")
+        db.add(contact)
+        db.commit()
+        account_id, contact_id = account.id, contact.id
+
+    if args.inline:
+        users_endpoints.aget_password_hash = lambda password: run_in_threadpool(get_password_hash, password)
+    anyio.to_thread.current_default_thread_limiter().total_tokens = args.threads
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def get_latency() -> float:
+            start = time.perf_counter()
+            response = await client.get(f"/api/v1/contacts/{contact_id}")
+            response.raise_for_status()
+            return time.perf_counter() - start
+
+        idle = [await get_latency() for _ in range(args.samples)]
+
+        batches = [
+            [
+                {
+                    "type": "users",
+                    "attributes": {
+                        "first_name": "Bench",
+                        "last_name": f"User{n}",
+                        "email": f"bench{n}@example.com",
+                        "password": "correct horse battery staple",
+                    },
+                    "relationships": {"account": {"data": {"type": "accounts", "id": str(account_id)}}},
+                }
+                for n in range(start, min(start + args.batch, args.users))
+            ]
+            for start in range(0, args.users, args.batch)
+        ]
+        pending = asyncio.Queue()
+        for batch in batches:
+            pending.put_nowait(batch)
+
+        async def provision() -> None:
+            while not pending.empty():
+                response = await client.post("/api/v1/users/bulk", json={"data": pending.get_nowait()})
+                response.raise_for_status()
+
+        loaded: List[float] = []
+        started = time.perf_counter()
+        writers = [asyncio.create_task(provision()) for _ in range(args.concurrency)]
+        while not all(writer.done() for writer in writers):
+            loaded.append(await get_latency())
+            await asyncio.sleep(0.01)
+        await asyncio.gather(*writers)
+        elapsed = time.perf_counter() - started
+
+    mode = "inline (request threadpool)" if args.inline else f"password pool ({args.workers} workers)"
+    print(f"hashing: {mode}, bcrypt rounds={args.rounds}, request threads={args.threads}")
+    print(f"created {args.users} users in {elapsed:.2f}s ({args.users / elapsed:.1f}/s)")
+    print(summary("GET idle", idle))
+    print(summary("GET under load", loaded))
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    directory = tempfile.mkdtemp(prefix="pingcrm-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    os.environ["BCRYPT_ROUNDS"] = str(arguments.rounds)
+    os.environ["PASSWORD_HASH_WORKERS"] = str(arguments.workers)
+    asyncio.run(main(arguments))
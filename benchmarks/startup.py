@@ -0,0 +1,128 @@
+"""Cold start of a worker: import, app construction and first request.
+
+Starts fresh interpreters and reports, as the median over --runs:
+
+    import    `import main`, which should build nothing
+    create    create_app(): settings, routers and middleware
+    first     the first request, GET /api/v1/accounts/?page[size]=1, which
+              creates the engine and opens the first connection
+    ready     from spawning the interpreter to that first response
+
+    python benchmarks/startup.py --runs 10
+    python benchmarks/startup.py --importtime 15
+
+--importtime also lists the modules with the largest self import time, from
+`python -X importtime`.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CHILD = """
+import time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+app = main.create_app()
+created = time.perf_counter()
+
+import asyncio
+import json
+
+async def first_request():
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app({
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/api/v1/accounts/", "raw_path": b"/api/v1/accounts/",
+        "root_path": "", "query_string": b"page[size]=1", "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 50000), "server": ("bench", 80),
+    }, receive, send)
+    assert messages[0]["status"] == 200, messages
+
+asyncio.run(first_request())
+answered = time.perf_counter()
+print(json.dumps({
+    "import": imported - started, "create": created - imported,
+    "first": answered - created, "ready_at": time.time(),
+}))
+"""
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="fresh interpreters to start")
+    parser.add_argument("--importtime", type=int, metavar="N", help="also list the N slowest imports")
+    return parser.parse_args()
+
+
+def prepare_database() -> Dict[str, str]:
+    from sqlalchemy import create_engine
+
+    import app.models  # noqa: F401 - register every table on Base.metadata
+    from app.db.base import Base
+
+    directory = tempfile.mkdtemp(prefix="pingcrm-bench-")
+    url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    Base.metadata.create_all(create_engine(url))
+    return {**os.environ, "DATABASE_URL": url}
+
+
+def cold_start(env: Dict[str, str]) -> Dict[str, float]:
+    spawned = time.time()
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result["ready"] = result.pop("ready_at") - spawned
+    return result
+
+
+def slowest_imports(env: Dict[str, str], count: int) -> List[str]:
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main; main.create_app()"],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = [part.strip() for part in line[len("import time:"):].split("|")]
+        rows.append((int(self_us), int(cumulative_us), name))
+    rows.sort(reverse=True)
+    return [f"{self_us / 1000:8.1f}ms self {cumulative / 1000:8.1f}ms total  {name}"
+            for self_us, cumulative, name in rows[:count]]
+
+
+def main(args: argparse.Namespace) -> None:
+    env = prepare_database()
+    cold_start(env)  # warm the filesystem cache and bytecode
+    runs = [cold_start(env) for _ in range(args.runs)]
+    for phase in ("import", "create", "first", "ready"):
+        values = sorted(run[phase] for run in runs)
+        print(f"{phase:<7} median={statistics.median(values) * 1000:7.1f}ms  "
+              f"min={values[0] * 1000:7.1f}ms  max={values[-1] * 1000:7.1f}ms")
+    if args.importtime:
+        print("\nslowest imports (self time):")
+        for line in slowest_imports(env, args.importtime):
+            print(line)
+
+
+if __name__ == "__main__":
+    main(parse_args())
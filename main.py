@@ -1,10 +1,9 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from app.api.middleware import error_handler
-from app.api.v1.api import api_router
 import os
+from typing import Any, Optional
+
+from fastapi import FastAPI
 
-app = FastAPI(title="PingCRM API")
+from app.core.config import Settings, configure, get_settings
 
 # Configure CORS
 origins = [
@@ -12,18 +11,72 @@ origins = [
     "*"
 ]
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+def create_app(settings: Optional[Settings] = None) -> FastAPI:
+    """Build the ASGI app, by default from the environment.
+
+    Nothing is built when this module is imported: routers are imported here,
+    and the database engine is created by the first query. Passing `settings`
+    replaces the process-wide settings and drops any engine, signing keyring,
+    password hash pool and cache built from the old ones;
+    `uvicorn main:create_app --factory` calls this once per worker.
+    """
+    from fastapi.middleware.cors import CORSMiddleware
+
+    from app.api.middleware import (
+        MetricsMiddleware, ReadYourWritesMiddleware, ServerTimingMiddleware, register_error_handlers
+    )
+    from app.api.replicas import PRIMARY_HEADER
+    from app.api.v1.api import build_api_router
+    from app.core import cache, security
+    from app.db import session
+
+    if settings is not None:
+        configure(settings)
+        session.reset()
+        security.reset()
+        cache.reset()
+    settings = get_settings()
+
+    app = FastAPI(title="PingCRM API")
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        # Cross-site clients can only echo the read-your-writes header if they can read it.
+        expose_headers=[PRIMARY_HEADER],
+    )
+
+    register_error_handlers(app)
+    if settings.replica_urls:
+        app.add_middleware(ReadYourWritesMiddleware, window_seconds=settings.READ_YOUR_WRITES_SECONDS)
+    if settings.SERVER_TIMING:
+        app.add_middleware(ServerTimingMiddleware)
+    if settings.METRICS_ENABLED:
+        from app.api import metrics
+        from app.core.metrics import configure as configure_metrics
+
+        # Added last so it is outermost and sees the 500s ErrorMiddleware sends.
+        configure_metrics(settings.METRICS_DIR, settings.METRICS_FLUSH_SECONDS)
+        app.add_middleware(MetricsMiddleware)
+        app.include_router(metrics.router)
+    app.include_router(build_api_router(settings), prefix="/api/v1")
+    return app
+
+_app: Optional[FastAPI] = None
 
-app.middleware("http")(error_handler)
-app.include_router(api_router, prefix="/api/v1")
+def __getattr__(name: str) -> Any:
+    """`main:app` still works: the app is built on first access instead of at import"""
+    global _app
+    if name != "app":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if _app is None:
+        _app = create_app()
+    return _app
 
 if __name__ == "__main__":
     import uvicorn
     port = int(os.environ.get("PORT", 8000))
-    uvicorn.run("main:app", host="0.0.0.0", port=port, reload=True)
\ No newline at end of file
+    reload = os.environ.get("RELOAD", "").lower() in ("1", "true")
+    uvicorn.run("main:create_app", factory=True, host="0.0.0.0", port=port, reload=reload)
@@ -0,0 +1,50 @@
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    import app.models  # noqa: F401 - register every table on Base.metadata
+    from app.db.base import Base
+
+    url = f"sqlite:///{os.path.join(tmp_path, 'test.db')}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    return url
+
+
+@pytest.fixture
+def make_client(database_url):
+    """Build a client for an app created from the given settings, on a fresh SQLite database"""
+    from app.core.config import Settings
+    from app.db import session
+    from main import create_app
+
+    clients = []
+
+    def make(**overrides):
+        values = {"DATABASE_URL": database_url, "SECRET_KEY": "test", "BCRYPT_ROUNDS": 4, **overrides}
+        client = TestClient(create_app(Settings(**values)))
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.close()
+    session.reset()
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client()
+
+
+@pytest.fixture
+def account_id(client):
+    response = client.post("/api/v1/accounts/", json={"data": {"type": "accounts", "attributes": {"name": "Acme"}}})
+    assert response.status_code == 200, response.text
+    return int(response.json()["data"]["id"])
@@ -0,0 +1,15 @@
+from app import crud
+from app.core import security
+
+
+def test_create_app_reconfigures_keys_and_caches(make_client):
+    make_client(SECRET_KEY="a", CACHE_ENABLED=False)
+    assert security.get_keyring().signing_key() == ("default", "a")
+    assert crud.account.cache is None
+
+    make_client(SECRET_KEY="b", CACHE_ENABLED=True, CACHE_MAX_ENTRIES=7, BCRYPT_ROUNDS=5)
+
+    assert security.get_keyring().signing_key() == ("default", "b")
+    assert crud.account.cache is not None
+    assert crud.account.cache.backend.max_entries == 7
+    assert security.get_password_hash("secret").startswith("$2b$05$")
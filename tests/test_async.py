@@ -0,0 +1,24 @@
+import json
+
+from app.db.pool import pool_stats
+from tests.test_pagination import create_contacts
+
+
+def checkouts(pool):
+    return next((stats["checkouts"] for stats in pool_stats() if stats["name"] == pool), 0)
+
+
+def test_reads_run_on_the_async_engine(make_client, account_id):
+    ids = create_contacts(make_client(), account_id, 3)
+    client = make_client(DATABASE_ASYNC=True)
+    before = checkouts("primary-async")
+
+    page = client.get("/api/v1/contacts/?page[size]=2&include=account")
+    one = client.get(f"/api/v1/contacts/{ids[0]}")
+    export = client.get("/api/v1/contacts/export")
+
+    assert checkouts("primary-async") > before
+    assert [int(item["id"]) for item in page.json()["data"]] == ids[:2]
+    assert [item["type"] for item in page.json()["included"]] == ["accounts"]
+    assert one.json()["data"]["attributes"]["last_name"] == "Last0"
+    assert [json.loads(line)["id"] for line in export.iter_lines()] == ids
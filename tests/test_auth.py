@@ -0,0 +1,83 @@
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+from jose import jwt
+
+from app import crud
+from app.core import security
+from app.core.exceptions import UnauthorizedException
+from app.db import session
+from tests.test_scoping import sign_in
+
+
+def stored_hash(email):
+    with session.SessionLocal() as db:
+        return crud.user.get_by_email(db, email=email).encrypted_password
+
+
+def test_login_rehashes_passwords_stored_at_an_old_cost(make_client):
+    sign_in(make_client(), "Acme")
+    client = make_client(BCRYPT_ROUNDS=5)
+
+    response = client.post("/api/v1/auth/login", data={"username": "owner@acme.com", "password": "secret"})
+
+    assert response.status_code == 200, response.text
+    assert stored_hash("owner@acme.com").startswith("$2b$05$")
+
+
+def test_login_and_bearer_tokens(client):
+    account_id, headers = sign_in(client, "Acme")
+
+    def login(username, password):
+        return client.post("/api/v1/auth/login", data={"username": username, "password": password})
+
+    me = client.get("/api/v1/auth/me", headers=headers).json()["data"]
+
+    assert me["attributes"] == {"email": "owner@acme.com", "owner": False}
+    assert me["relationships"]["account"]["data"]["id"] == str(account_id)
+    assert login("owner@acme.com", "wrong").status_code == 401
+    assert login("nobody@acme.com", "secret").status_code == 401
+    assert client.get("/api/v1/auth/me").status_code == 401
+    assert client.get("/api/v1/auth/me", headers={"Authorization": "Bearer nonsense"}).status_code == 401
+
+
+def test_verified_tokens_skip_verification(client, monkeypatch):
+    token = security.create_access_token(SimpleNamespace(id=1, account_id=2, email="a@acme.com", owner=True))
+    calls = []
+    decode = jwt.decode
+    monkeypatch.setattr(jwt, "decode", lambda *args, **kwargs: calls.append(1) or decode(*args, **kwargs))
+
+    principals = [security.decode_access_token(token) for _ in range(3)]
+
+    assert principals == [security.Principal(1, 2, "a@acme.com", True)] * 3
+    assert len(calls) == 1
+
+
+def test_retiring_a_key_revokes_its_tokens(make_client, tmp_path):
+    keys_file = tmp_path / "keys.json"
+    user = SimpleNamespace(id=1, account_id=2, email="a@acme.com", owner=False)
+
+    def write(version, active, **keys):
+        keys_file.write_text(json.dumps({"active": active, "keys": keys}))
+        # Set the mtime explicitly so each rewrite is noticed whatever the clock granularity.
+        os.utime(keys_file, ns=(version, version))
+
+    write(1, "old", old="old-secret")
+    make_client(JWT_KEYS_FILE=str(keys_file))
+    security.get_keyring().check_interval = 0
+    old_token = security.create_access_token(user)
+    security.decode_access_token(old_token)
+
+    write(2, "new", old="old-secret", new="new-secret")
+    new_token = security.create_access_token(user)
+
+    assert jwt.get_unverified_header(new_token)["kid"] == "new"
+    assert security.decode_access_token(old_token).id == 1
+
+    write(3, "new", new="new-secret")
+
+    assert security.decode_access_token(new_token).id == 1
+    with pytest.raises(UnauthorizedException, match="Invalid token"):
+        security.decode_access_token(old_token)
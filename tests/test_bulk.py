@@ -0,0 +1,49 @@
+from tests.test_pagination import create_contacts
+from tests.test_scoping import sign_in
+
+
+def pointers(response):
+    assert response.status_code == 400, response.text
+    return [error["source"]["pointer"] for error in response.json()["errors"]]
+
+
+def test_bulk_update_rejects_null_for_required_attributes(client, account_id):
+    ids = create_contacts(client, account_id, 2)
+
+    response = client.put("/api/v1/contacts/bulk", json={"data": [
+        {"type": "contacts", "id": str(ids[0]), "attributes": {"city": "Oslo"}},
+        {"type": "contacts", "id": str(ids[1]), "attributes": {"first_name": None}},
+    ]})
+
+    assert pointers(response) == ["/data/1/attributes/first_name"]
+
+
+def test_bulk_writes_reject_dangling_relationships(client, account_id):
+    ids = create_contacts(client, account_id, 1)
+    organization = {"organization": {"data": {"type": "organizations", "id": "999"}}}
+
+    created = client.post("/api/v1/contacts/bulk", json={"data": [{
+        "type": "contacts",
+        "attributes": {"first_name": "Ada", "last_name": "Lovelace"},
+        "relationships": {"account": {"data": {"type": "accounts", "id": str(account_id)}}, **organization},
+    }]})
+    updated = client.put("/api/v1/contacts/bulk", json={"data": [
+        {"type": "contacts", "id": str(ids[0]), "relationships": organization},
+        {"type": "contacts", "id": "999", "attributes": {"city": "Oslo"}},
+    ]})
+
+    assert pointers(created) == ["/data/0/relationships/organization"]
+    assert sorted(pointers(updated)) == ["/data/0/relationships/organization", "/data/1/id"]
+
+
+def test_scoped_bulk_create_fills_in_the_account(client):
+    account_id, headers = sign_in(client, "Acme")
+    item = {"type": "contacts", "attributes": {"first_name": "Ada", "last_name": "Lovelace"}}
+
+    scoped = client.post("/api/v1/contacts/bulk", json={"data": [item]}, headers=headers)
+    unscoped = client.post("/api/v1/contacts/bulk", json={"data": [item]})
+
+    assert scoped.status_code == 200, scoped.text
+    account = scoped.json()["data"][0]["relationships"]["account"]["data"]
+    assert account["id"] == str(account_id)
+    assert pointers(unscoped) == ["/data/0/relationships/account"]
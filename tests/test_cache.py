@@ -0,0 +1,45 @@
+from app.core.cache import MISSING, MemoryBackend, ModelCache
+from tests.test_pagination import create_contacts
+from tests.test_writes import statements
+
+
+def test_a_read_that_raced_a_write_is_not_cached():
+    cache = ModelCache("contacts", MemoryBackend(max_entries=2, ttl_seconds=60))
+    generation = cache.generation
+    cache.invalidate(1)
+
+    cache.set(1, ("stale",), generation)
+    cache.set(2, ("fresh",), cache.generation)
+
+    assert cache.get(1) is MISSING
+    assert cache.get(2) == ("fresh",)
+
+
+def test_memory_backend_evicts_the_least_recently_used_entry():
+    backend = MemoryBackend(max_entries=2, ttl_seconds=60)
+    backend.set(1, "a")
+    backend.set(2, "b")
+    backend.get(1)
+    backend.set(3, "c")
+
+    assert (backend.get(1), backend.get(2), backend.get(3)) == ("a", MISSING, "c")
+    assert backend.evictions == 1
+    assert MemoryBackend(max_entries=2, ttl_seconds=-1).get(1) is MISSING
+
+
+def test_writes_invalidate_cached_snapshots(make_client, account_id):
+    client = make_client(CACHE_ENABLED=True)
+    contact_id = create_contacts(client, account_id, 1)[0]
+    url = f"/api/v1/contacts/{contact_id}"
+
+    client.get(url)
+    with statements() as executed:
+        cached = client.get(url)
+    client.put(url, json={"data": {"type": "contacts", "attributes": {"city": "Oslo"}}})
+    fresh = client.get(url)
+
+    assert executed == []
+    assert cached.json()["data"]["attributes"]["city"] is None
+    assert fresh.json()["data"]["attributes"]["city"] == "Oslo"
+    stats = {cache["name"]: cache for cache in client.get("/api/v1/status/cache").json()["meta"]["caches"]}
+    assert (stats["contacts"]["hits"], stats["contacts"]["invalidations"]) == (1, 1)
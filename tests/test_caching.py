@@ -0,0 +1,38 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+from starlette.requests import Request
+
+from app.api.caching import list_etag
+from app.crud.pagination import Page
+from app.serializers.contact import contact_serializer
+from tests.test_pagination import create_contacts
+
+
+def test_list_etag_follows_the_page_contents():
+    request = Request({"type": "http", "path": "/api/v1/contacts/", "query_string": b"page[size]=2", "headers": []})
+
+    def etag(*items, next_cursor=None):
+        page = Page(items=[SimpleNamespace(id=id, updated_at=datetime(2024, 1, 1, 0, 0, s)) for id, s in items])
+        page.next_cursor = next_cursor
+        return list_etag(request, contact_serializer, page, ())
+
+    assert etag((1, 0), (2, 0)) == etag((1, 0), (2, 0))
+    assert etag((1, 0), (2, 0)) != etag((1, 0), (2, 1))
+    assert etag((1, 0), (2, 0)) != etag((1, 0), (3, 0))
+    assert etag((1, 0), (2, 0)) != etag((1, 0), (2, 0), next_cursor="abc")
+
+
+def test_lists_answer_304_until_a_row_changes(client, account_id):
+    ids = create_contacts(client, account_id, 2)
+    etag = client.get("/api/v1/contacts/").headers["etag"]
+
+    unchanged = client.get("/api/v1/contacts/", headers={"If-None-Match": etag})
+    client.put("/api/v1/contacts/bulk", json={"data": [
+        {"type": "contacts", "id": str(ids[0]), "attributes": {"city": "Oslo"}},
+    ]})
+    changed = client.get("/api/v1/contacts/", headers={"If-None-Match": etag})
+
+    assert unchanged.status_code == 304
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
@@ -0,0 +1,27 @@
+import csv
+import io
+import json
+
+from app.api import export
+from tests.test_pagination import create_contacts
+
+
+def test_exports_stream_every_row_across_batches(client, account_id, monkeypatch):
+    monkeypatch.setattr(export, "EXPORT_BATCH_SIZE", 2)
+    ids = create_contacts(client, account_id, 5)
+    client.delete(f"/api/v1/contacts/{ids[-1]}")
+
+    ndjson = client.get("/api/v1/contacts/export")
+    records = client.get("/api/v1/contacts/export?format=csv")
+
+    assert ndjson.headers["content-type"] == "application/x-ndjson"
+    assert ndjson.headers["content-disposition"] == 'attachment; filename="contacts.ndjson"'
+    rows = [json.loads(line) for line in ndjson.iter_lines()]
+    assert [(row["id"], row["account_id"], row["last_name"]) for row in rows] == [
+        (contact_id, account_id, f"Last{n}") for n, contact_id in enumerate(ids[:-1])
+    ]
+
+    assert records.headers["content-type"].startswith("text/csv")
+    header, *lines = csv.reader(io.StringIO(records.text))
+    assert header[:5] == ["id", "account_id", "organization_id", "first_name", "last_name"]
+    assert [int(line[0]) for line in lines] == ids[:-1]
@@ -0,0 +1,29 @@
+from tests.test_pagination import create_contacts
+from tests.test_serializers import link_organization
+from tests.test_writes import statements
+
+
+def test_fieldsets_narrow_the_select_list(client, account_id):
+    ids = create_contacts(client, account_id, 2)
+    link_organization(client, account_id, ids)
+
+    with statements() as executed:
+        body = client.get(
+            "/api/v1/contacts/?fields[contacts]=last_name,organization&include=organization&fields[organizations]=name"
+        ).json()
+
+    contacts, organizations = executed
+    assert "contacts.last_name" in contacts and "contacts.first_name" not in contacts
+    assert "contacts.city" not in contacts
+    assert "organizations.name" in organizations and "organizations.email" not in organizations
+    assert body["data"][0]["attributes"] == {"last_name": "Last0"}
+    assert list(body["data"][0]["relationships"]) == ["organization"]
+    assert body["included"][0]["attributes"] == {"name": "Globex"}
+
+
+def test_unknown_fields_are_rejected(client, account_id):
+    create_contacts(client, account_id, 1)
+
+    response = client.get("/api/v1/contacts/?fields[contacts]=first_name,salary")
+
+    assert response.status_code == 400
@@ -0,0 +1,27 @@
+from tests.test_pagination import create_contacts
+from tests.test_serializers import link_organization
+from tests.test_writes import statements
+
+
+def test_includes_are_batch_loaded_and_deduplicated(client, account_id):
+    ids = create_contacts(client, account_id, 5)
+    organization_id = link_organization(client, account_id, ids)
+
+    with statements() as executed:
+        listed = client.get("/api/v1/contacts/?include=organization,account").json()
+    single = client.get(f"/api/v1/contacts/{ids[0]}?include=organization").json()
+
+    # One SELECT for the page and one SELECT ... IN per relationship.
+    assert len(executed) == 3
+    assert sorted((item["type"], item["id"]) for item in listed["included"]) == [
+        ("accounts", str(account_id)), ("organizations", organization_id),
+    ]
+    assert [(item["type"], item["id"]) for item in single["included"]] == [("organizations", organization_id)]
+
+
+def test_unknown_includes_are_rejected(client, account_id):
+    create_contacts(client, account_id, 1)
+
+    response = client.get("/api/v1/contacts/?include=organization,owner")
+
+    assert response.status_code == 400
@@ -0,0 +1,18 @@
+import os
+
+from tests.test_pagination import create_contacts
+
+
+def test_routes_are_labelled_by_their_template(make_client, tmp_path):
+    client = make_client(METRICS_ENABLED=True, METRICS_DIR=str(tmp_path / "metrics"), METRICS_FLUSH_SECONDS=0)
+    account = client.post("/api/v1/accounts/", json={"data": {"type": "accounts", "attributes": {"name": "Acme"}}})
+    account_id = int(account.json()["data"]["id"])
+    contact_id = create_contacts(client, account_id, 1)[0]
+    client.get(f"/api/v1/contacts/{contact_id}")
+    client.get("/no/such/path")
+
+    text = client.get("/metrics").text
+
+    assert 'http_requests_total{method="GET",route="/api/v1/contacts/{contact_id}",status="200"} 1' in text
+    assert 'http_requests_total{method="GET",route="<unmatched>",status="404"} 1' in text
+    assert os.listdir(tmp_path / "metrics") == [f"metrics-{os.getpid()}.json"]
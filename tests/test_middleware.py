@@ -0,0 +1,63 @@
+import asyncio
+import json
+
+import pytest
+from starlette.responses import StreamingResponse
+
+from app.api.middleware import ErrorMiddleware
+
+
+def call(app):
+    """Run one GET through ErrorMiddleware, returning the ASGI messages it sent"""
+    sent = []
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        # The client stays connected; StreamingResponse waits on this for a disconnect.
+        await asyncio.Event().wait()
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/", "query_string": b"", "headers": []}
+    asyncio.run(ErrorMiddleware(app)(scope, receive, send))
+    return sent
+
+
+def test_unhandled_errors_become_json_api_500s():
+    async def app(scope, receive, send):
+        raise RuntimeError("boom")
+
+    start, body = call(app)
+
+    assert start["status"] == 500
+    assert json.loads(body["body"]) == {"errors": [{"status": "500", "title": "boom"}]}
+
+
+def test_streamed_bodies_pass_through_untouched():
+    async def chunks():
+        yield b"one\n"
+        yield b"two\n"
+
+    start, *bodies = call(StreamingResponse(chunks(), media_type="application/x-ndjson"))
+
+    assert start["status"] == 200
+    assert [message["body"] for message in bodies if message["body"]] == [b"one\n", b"two\n"]
+
+
+def test_errors_after_the_response_started_are_reraised():
+    async def chunks():
+        yield b"one\n"
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        call(StreamingResponse(chunks()))
+
+
+def test_app_exceptions_keep_their_status(client):
+    response = client.get("/api/v1/contacts/999")
+
+    assert response.status_code == 404
+    assert response.json()["errors"][0]["status"] == "404"
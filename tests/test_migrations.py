@@ -0,0 +1,20 @@
+import os
+
+from alembic import command
+from alembic.config import Config
+
+from app.core.config import Settings, configure
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_migrations_match_the_models(tmp_path):
+    configure(Settings(DATABASE_URL=f"sqlite:///{tmp_path / 'migrated.db'}"))
+    # No ini file: its logging config would disable the loggers of the tests that run later.
+    config = Config()
+    config.set_main_option("script_location", os.path.join(ROOT, "alembic"))
+
+    command.upgrade(config, "head")
+
+    # Raises when autogenerate would emit any operation.
+    command.check(config)
@@ -0,0 +1,47 @@
+import pytest
+
+
+def create_contacts(client, account_id, count):
+    response = client.post("/api/v1/contacts/bulk", json={"data": [
+        {
+            "type": "contacts",
+            "attributes": {"first_name": f"First{n % 3}", "last_name": f"Last{n}"},
+            "relationships": {"account": {"data": {"type": "accounts", "id": str(account_id)}}},
+        }
+        for n in range(count)
+    ]})
+    assert response.status_code in (200, 201), response.text
+    return [int(item["id"]) for item in response.json()["data"]]
+
+
+def walk(client, url):
+    """Follow `next` links to the end, returning the ids in order"""
+    ids, seen = [], set()
+    while url:
+        assert url not in seen, f"pagination loops on {url}"
+        seen.add(url)
+        body = client.get(url).json()
+        ids += [int(item["id"]) for item in body["data"]]
+        url = body["links"].get("next")
+    return ids
+
+
+@pytest.mark.parametrize("sort", ["updated_at", "-updated_at", "-updated_at,first_name", "created_at,-first_name"])
+def test_timestamp_cursors_page_through_rows_created_by_the_api(client, account_id, sort):
+    created = create_contacts(client, account_id, 10)
+
+    ids = walk(client, f"/api/v1/contacts/?sort={sort}&page[size]=3")
+
+    assert sorted(ids) == sorted(created)
+
+
+def test_pages_follow_the_sort_order(client, account_id):
+    create_contacts(client, account_id, 10)
+    client.put("/api/v1/contacts/bulk", json={"data": [
+        {"type": "contacts", "id": "4", "attributes": {"city": "Later"}},
+    ]})
+
+    ids = walk(client, "/api/v1/contacts/?sort=-updated_at&page[size]=3")
+
+    assert ids[0] == 4
+    assert len(ids) == 10
@@ -0,0 +1,24 @@
+import shutil
+
+from app.api.replicas import PRIMARY_HEADER
+from tests.test_pagination import create_contacts
+
+
+def test_writers_read_their_writes_past_a_lagging_replica(make_client, database_url, account_id, tmp_path):
+    contact_id = create_contacts(make_client(), account_id, 1)[0]
+    # A replica that has not caught up with anything written from here on.
+    replica = tmp_path / "replica.db"
+    shutil.copy(database_url.removeprefix("sqlite:///"), replica)
+    client = make_client(DATABASE_REPLICA_URLS=f"sqlite:///{replica}", CACHE_ENABLED=True)
+
+    written = client.put("/api/v1/contacts/bulk", json={
+        "data": [{"type": "contacts", "id": str(contact_id), "attributes": {"city": "Oslo"}}],
+    })
+    # Another client reads the stale row from the replica...
+    client.cookies.clear()
+    stale = client.get(f"/api/v1/contacts/{contact_id}")
+    # ...which must not end up in the cache the writer then reads from.
+    fresh = client.get(f"/api/v1/contacts/{contact_id}", headers={PRIMARY_HEADER: written.headers[PRIMARY_HEADER]})
+
+    assert stale.json()["data"]["attributes"]["city"] is None
+    assert fresh.json()["data"]["attributes"]["city"] == "Oslo"
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, ForeignKey, Integer, MetaData, Table
+
+import app.models  # noqa: F401 - register every table on Base.metadata
+from app.db.base import Base
+from app.db.checks import missing_fk_indexes
+
+
+def test_every_foreign_key_has_a_covering_index():
+    assert missing_fk_indexes(Base.metadata) == []
+
+
+def test_an_unindexed_foreign_key_is_reported():
+    metadata = MetaData()
+    Table("parents", metadata, Column("id", Integer, primary_key=True))
+    Table("children", metadata, Column("id", Integer, primary_key=True), Column("parent_id", ForeignKey("parents.id")))
+
+    assert missing_fk_indexes(metadata) == ["children(parent_id) -> parents has no covering index"]
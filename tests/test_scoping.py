@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from tests.test_pagination import create_contacts
+
+
+def sign_in(client, name):
+    account = client.post("/api/v1/accounts/", json={"data": {"type": "accounts", "attributes": {"name": name}}})
+    account_id = int(account.json()["data"]["id"])
+    email = f"owner@{name.lower()}.com"
+    created = client.post("/api/v1/users/bulk", json={"data": [{
+        "type": "users",
+        "attributes": {"first_name": "Owner", "last_name": name, "email": email, "password": "secret"},
+        "relationships": {"account": {"data": {"type": "accounts", "id": str(account_id)}}},
+    }]})
+    assert created.status_code == 200, created.text
+    token = client.post("/api/v1/auth/login", data={"username": email, "password": "secret"}).json()["access_token"]
+    return account_id, {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def accounts(client):
+    return sign_in(client, "Acme"), sign_in(client, "Globex")
+
+
+def test_exports_only_hold_the_callers_rows(client, accounts):
+    (acme, acme_headers), (globex, _) = accounts
+    mine = create_contacts(client, acme, 2)
+    create_contacts(client, globex, 3)
+
+    rows = [json.loads(line) for line in client.get("/api/v1/contacts/export", headers=acme_headers).iter_lines()]
+
+    assert sorted(row["id"] for row in rows) == mine
+
+
+def test_bulk_writes_cannot_reach_other_accounts(client, accounts):
+    (acme, acme_headers), (globex, _) = accounts
+    theirs = create_contacts(client, globex, 1)[0]
+    organization = client.post("/api/v1/organizations/bulk", json={"data": [{
+        "type": "organizations",
+        "attributes": {"name": "Globex Corp"},
+        "relationships": {"account": {"data": {"type": "accounts", "id": str(globex)}}},
+    }]}).json()["data"][0]["id"]
+
+    deleted = client.request("DELETE", "/api/v1/contacts/bulk", headers=acme_headers, json={"data": [
+        {"type": "contacts", "id": str(theirs)},
+    ]})
+    created = client.post("/api/v1/contacts/bulk", headers=acme_headers, json={"data": [{
+        "type": "contacts",
+        "attributes": {"first_name": "Ada", "last_name": "Lovelace"},
+        "relationships": {
+            "account": {"data": {"type": "accounts", "id": str(globex)}},
+            "organization": {"data": {"type": "organizations", "id": organization}},
+        },
+    }]})
+    moved = client.post("/api/v1/contacts/bulk", headers=acme_headers, json={"data": [{
+        "type": "contacts",
+        "attributes": {"first_name": "Ada", "last_name": "Lovelace"},
+        "relationships": {"account": {"data": {"type": "accounts", "id": str(globex)}}},
+    }]})
+
+    assert deleted.status_code == 400
+    assert [error["source"]["pointer"] for error in deleted.json()["errors"]] == ["/data/0/id"]
+    assert [error["source"]["pointer"] for error in created.json()["errors"]] == ["/data/0/relationships/organization"]
+    assert moved.json()["data"][0]["relationships"]["account"]["data"]["id"] == str(acme)
+
+
+def test_restore_is_scoped_to_the_callers_account(client, accounts):
+    (_, acme_headers), (globex, globex_headers) = accounts
+    theirs = create_contacts(client, globex, 1)[0]
+    client.delete(f"/api/v1/contacts/{theirs}", headers=globex_headers)
+
+    assert client.put(f"/api/v1/contacts/{theirs}/restore", headers=acme_headers).status_code == 404
+    assert client.put(f"/api/v1/contacts/{theirs}/restore", headers=globex_headers).status_code == 200
@@ -0,0 +1,37 @@
+from sqlalchemy import create_engine, select
+
+from app.db import seed
+from app.db.base import Base
+
+ARGS = ["--create-tables", "--accounts", "3", "--users", "5", "--organizations", "10", "--contacts", "40"]
+
+
+def dump(url):
+    engine = create_engine(url)
+    with engine.connect() as conn:
+        rows = {
+            table: list(conn.execute(select(Base.metadata.tables[table]).order_by("id")))
+            for table in seed.SCALE_ROWS
+        }
+    engine.dispose()
+    return rows
+
+
+def test_the_same_seed_loads_the_same_rows(tmp_path, monkeypatch):
+    monkeypatch.setattr(seed, "CHUNK_SIZE", 7)
+    first, second = [f"sqlite:///{tmp_path / name}.db" for name in ("first", "second")]
+
+    assert seed.main([*ARGS, "--database-url", first]) == 0
+    assert seed.main([*ARGS, "--database-url", second, "--workers", "1"]) == 0
+    assert seed.main([*ARGS, "--database-url", first]) == 1
+
+    rows = dump(first)
+    assert rows == dump(second)
+    assert [len(rows[table]) for table in seed.SCALE_ROWS] == [3, 5, 10, 40]
+    organization_accounts = {row.id: row.account_id for row in rows["organizations"]}
+    assert all(
+        organization_accounts[row.organization_id] == row.account_id
+        for row in rows["contacts"] if row.organization_id is not None
+    )
+    counts = seed.volumes(1)
+    assert seed.generate("contacts", counts, 1, 1) != seed.generate("contacts", counts, 2, 1)
@@ -0,0 +1,45 @@
+from types import SimpleNamespace
+
+from app.serializers.contact import contact_serializer
+from tests.test_pagination import create_contacts
+from tests.test_writes import statements
+
+
+def link_organization(client, account_id, contact_ids):
+    """Create an organization and point the contacts at it, returning its id"""
+    account = {"account": {"data": {"type": "accounts", "id": str(account_id)}}}
+    organization = client.post("/api/v1/organizations/bulk", json={
+        "data": [{"type": "organizations", "attributes": {"name": "Globex"}, "relationships": account}],
+    }).json()["data"][0]
+    linkage = {"organization": {"data": {"type": "organizations", "id": organization["id"]}}}
+    updated = client.put("/api/v1/contacts/bulk", json={
+        "data": [{"type": "contacts", "id": str(contact_id), "relationships": linkage} for contact_id in contact_ids],
+    })
+    assert updated.status_code == 200, updated.text
+    return organization["id"]
+
+
+def test_reordered_and_repeated_fieldsets_share_one_builder():
+    contact = SimpleNamespace(id=1, first_name="Ada", last_name="Lovelace", account_id=2, organization_id=None)
+    before = len(contact_serializer._compiled)
+
+    documents = [
+        contact_serializer.to_dict(contact, {"contacts": fields})
+        for fields in (["first_name", "last_name"], ["last_name", "first_name"], ["first_name", "first_name", "last_name"])
+    ]
+
+    assert len(contact_serializer._compiled) <= before + 1
+    assert all(document == documents[0] for document in documents)
+    assert documents[0]["attributes"] == {"first_name": "Ada", "last_name": "Lovelace"}
+
+
+def test_list_pages_read_linkage_from_foreign_keys(client, account_id):
+    organization_id = link_organization(client, account_id, create_contacts(client, account_id, 5))
+
+    with statements() as executed:
+        body = client.get("/api/v1/contacts/").json()
+
+    assert len(executed) == 1
+    assert [item["relationships"]["organization"]["data"] for item in body["data"]] == [
+        {"type": "organizations", "id": organization_id}
+    ] * 5
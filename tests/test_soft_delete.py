@@ -0,0 +1,25 @@
+from tests.test_pagination import create_contacts
+
+
+def listed(client, query=""):
+    return [int(item["id"]) for item in client.get(f"/api/v1/contacts/{query}").json()["data"]]
+
+
+def test_deleted_rows_go_to_the_trash_and_can_be_restored(client, account_id):
+    ids = create_contacts(client, account_id, 3)
+
+    deleted = client.delete(f"/api/v1/contacts/{ids[0]}")
+
+    assert deleted.json()["data"]["attributes"]["deleted_at"] is not None
+    assert client.get(f"/api/v1/contacts/{ids[0]}").status_code == 404
+    assert client.delete(f"/api/v1/contacts/{ids[0]}").status_code == 404
+    assert listed(client) == ids[1:]
+    assert listed(client, "?filter[trashed]=with") == ids
+    assert listed(client, "?filter[trashed]=only") == ids[:1]
+
+    restored = client.put(f"/api/v1/contacts/{ids[0]}/restore")
+
+    assert restored.status_code == 200
+    assert restored.json()["data"]["attributes"]["deleted_at"] is None
+    assert listed(client) == ids
+    assert client.put("/api/v1/contacts/999/restore").status_code == 404
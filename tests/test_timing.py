@@ -0,0 +1,20 @@
+import re
+
+from tests.test_pagination import create_contacts
+
+
+def test_server_timing_reports_queries_and_phases(make_client, account_id, caplog):
+    create_contacts(make_client(), account_id, 3)
+    client = make_client(SERVER_TIMING=True)
+
+    with caplog.at_level("INFO", logger="app.api.middleware"):
+        header = client.get("/api/v1/contacts/").headers["server-timing"]
+
+    names = [metric.split(";")[0] for metric in header.split(", ")]
+    assert names == ["db", "serialize", "render", "app", "total"]
+    assert re.match(r'db;dur=[\d.]+;desc="queries: 1"', header)
+    assert "path=/api/v1/contacts/ status=200 queries=1" in caplog.text
+
+
+def test_server_timing_is_off_by_default(client):
+    assert "server-timing" not in client.get("/api/v1/contacts/").headers
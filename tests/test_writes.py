@@ -0,0 +1,62 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.db import session
+from tests.test_pagination import create_contacts
+from tests.test_scoping import sign_in
+
+
+@contextmanager
+def statements():
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(session.engine, "before_cursor_execute", record)
+    try:
+        yield executed
+    finally:
+        event.remove(session.engine, "before_cursor_execute", record)
+
+
+def test_single_row_writes_are_one_returning_statement(client, account_id):
+    contact_id = create_contacts(client, account_id, 1)[0]
+
+    with statements() as account_writes:
+        created = client.post("/api/v1/accounts/", json={"data": {"type": "accounts", "attributes": {"name": "Globex"}}})
+        client.put(f"/api/v1/accounts/{created.json()['data']['id']}", json={
+            "data": {"type": "accounts", "attributes": {"name": "Globex Corp"}},
+        })
+    with statements() as updated:
+        response = client.put(f"/api/v1/contacts/{contact_id}", json={
+            "data": {"type": "contacts", "id": str(contact_id), "attributes": {"city": "Oslo"}},
+        })
+    with statements() as deleted:
+        client.delete(f"/api/v1/contacts/{contact_id}")
+
+    assert response.status_code == 200, response.text
+    attributes = response.json()["data"]["attributes"]
+    # Only the attributes sent are written; the RETURNING row carries the rest.
+    assert (attributes["city"], attributes["last_name"]) == ("Oslo", "Last0")
+    assert [statement.split()[0] for statement in account_writes] == ["INSERT", "UPDATE"]
+    assert all("RETURNING" in statement for statement in account_writes + updated + deleted)
+    assert [statement.split()[0] for statement in updated + deleted] == ["UPDATE", "UPDATE"]
+
+
+def test_single_row_updates_are_scoped_and_validated(client):
+    _, acme = sign_in(client, "Acme")
+    globex_id, globex = sign_in(client, "Globex")
+    organization = client.post("/api/v1/organizations/bulk", headers=globex, json={
+        "data": [{"type": "organizations", "attributes": {"name": "Globex Corp"}}],
+    }).json()["data"][0]
+    url = f"/api/v1/organizations/{organization['id']}"
+
+    foreign = client.put(url, headers=acme, json={"data": {"type": "organizations", "attributes": {"name": "Mine"}}})
+    invalid = client.put(url, headers=globex, json={"data": {"type": "organizations", "attributes": {"name": None}}})
+
+    assert foreign.status_code == 404
+    assert invalid.status_code == 400
+    assert invalid.json()["errors"][0]["source"]["pointer"] == "/data/attributes/name"
+    assert client.get(url, headers=globex).json()["data"]["attributes"]["name"] == "Globex Corp"